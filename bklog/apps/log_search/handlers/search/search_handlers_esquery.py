@@ -22,9 +22,12 @@ the project delivered to anyone in the future.
 import copy
 import datetime
 import hashlib
+import heapq
 import json
 import operator
 import time
+from collections import defaultdict
+from itertools import islice
 from typing import Any
 
 import arrow
@@ -125,7 +128,7 @@ from apps.log_search.models import (
     UserIndexSetSearchHistory,
 )
 from apps.log_search.permission import Permission
-from apps.log_search.utils import sort_func, handle_es_query_error
+from apps.log_search.utils import get_sort_key, handle_es_query_error, sort_func
 from apps.models import model_to_dict
 from apps.utils.cache import cache_five_minute
 from apps.utils.core.cache.cmdb_host import CmdbHostCache
@@ -270,6 +273,9 @@ class SearchHandler:
         # 透传size
         self.size: int = search_dict.get("size", 30)
 
+        # 透传search_after 分页游标, 联合检索翻页时使用
+        self.search_after: list = search_dict.get("search_after") or []
+
         # 透传filter. 初始化为None,表示filter还没有被初始化
         self._filter = None
 
@@ -829,6 +835,10 @@ class SearchHandler:
             "track_total_hits": self.track_total_hits,
         }
 
+        # search_after 不能与 from、scroll 同时使用
+        if self.search_after:
+            params.update({"search_after": self.search_after, "start": 0, "scroll": None})
+
         storage_cluster_record_objs = StorageClusterRecord.objects.none()
 
         if self.start_time:
@@ -2363,6 +2373,9 @@ class SearchHandler:
                 "origin_log_list": origin_log_list,
             }
         )
+        # 联合检索需要每条日志的排序值作为索引集的分页游标
+        if self.search_dict.get("is_union_search"):
+            result["sort_values"] = [hit.get("sort", []) for hit in result_dict["hits"]["hits"]]
         # 处理聚合
         agg_dict = result_dict.get("aggregations", {})
         result.update({"aggs": agg_dict})
@@ -2756,6 +2769,57 @@ class UnionSearchHandler:
 
         return new_sort_list
 
+    @staticmethod
+    def merge_union_results(union_results: dict, union_configs: list, size: int, sort_key, reverse: bool) -> list:
+        """
+        多路归并各索引集的检索结果，取出当前页数据，并更新各索引集下次查询的 begin 及 search_after 游标
+        :param union_results: 各索引集的检索结果 {index_set_id: [(log, origin_log, sort_values), ...]}
+            保持 ES 返回的顺序，每个索引集比当前页多取一条数据
+        :param union_configs: 各索引集的分页配置，原地更新
+        :param size: 当前页数据条数
+        :param sort_key: 排序 key 函数，作用于 log
+        :param reverse: 是否降序
+        :return: 当前页数据 [(log, origin_log, sort_values), ...]
+        """
+
+        def item_sort_key(item):
+            return sort_key(item[0])
+
+        # 各索引集的数据保持 ES 返回的顺序参与归并，heapq.merge 只会按顺序消费每一路的数据，
+        # 保证每个索引集取出的数据是 ES 顺序中的前 N 条，下方 begin 与 search_after 游标指向最后一条被取出的数据。
+        # 若此处先按排序规则重排(ES 的排序与此处的排序规则不一定一致，如时间字段按字符串比较)，
+        # 取出的数据与游标位置不一致，翻页时会遗漏或重复数据
+        merged_results = list(
+            islice(
+                heapq.merge(*union_results.values(), key=item_sort_key, reverse=reverse),
+                size,
+            )
+        )
+
+        # 统计返回的数据中各个索引集分别占了多少条数据  用于下次begin查询
+        consumed_counts = defaultdict(int)
+        for log, origin_log, sort_values in merged_results:
+            consumed_counts[log["__index_set_id__"]] += 1
+
+        for union_config in union_configs:
+            consumed_count = consumed_counts.get(union_config["index_set_id"])
+            if not consumed_count:
+                continue
+            union_config["begin"] = union_config.get("begin", 0) + consumed_count
+
+            # 以最后一条被取出的数据(即 ES 顺序中第 consumed_count 条)的排序值作为游标，与 begin 偏移量指向同一位置
+            # 排序值不唯一时(如第三方ES仅按时间字段排序)，若与下一条数据的排序值相同，使用游标会漏掉排序值相同的数据
+            # 此时退回使用 begin 偏移量
+            rows = union_results.get(union_config["index_set_id"], [])
+            last_sort_values = rows[consumed_count - 1][2] if consumed_count <= len(rows) else []
+            next_sort_values = rows[consumed_count][2] if consumed_count < len(rows) else None
+            if last_sort_values and last_sort_values != next_sort_values:
+                union_config["search_after"] = last_sort_values
+            else:
+                union_config["search_after"] = []
+
+        return merged_results
+
     def union_search(self, is_export=False):
         index_set_objs = LogIndexSet.objects.filter(index_set_id__in=self.index_set_ids)
         if not index_set_objs:
@@ -2814,7 +2878,12 @@ class UnionSearchHandler:
         else:
             for union_config in self.union_configs:
                 search_dict = copy.deepcopy(params)
-                search_dict["begin"] = union_config.get("begin", 0)
+                # 翻页时使用上一页记录的游标，begin 为 0 表示重新检索，忽略游标
+                search_after = union_config.get("search_after") if union_config.get("begin") else []
+                search_dict["begin"] = 0 if search_after else union_config.get("begin", 0)
+                search_dict["search_after"] = search_after
+                # 多取一条数据，用于判断本页最后一条数据的排序值是否与后续数据相同
+                search_dict["size"] = params["size"] + 1
                 search_dict["sort_list"] = self._init_sort_list(index_set_id=union_config["index_set_id"])
                 search_dict["is_desensitize"] = union_config.get("is_desensitize", True)
                 search_dict["custom_indices"] = union_config.get("custom_indices", "")
@@ -2827,6 +2896,8 @@ class UnionSearchHandler:
         # 处理返回结果
         result_log_list = list()
         result_origin_log_list = list()
+        # 各索引集的检索结果 {index_set_id: [(log, origin_log, sort_values), ...]}，保持 ES 返回的顺序
+        union_results = dict()
         fields = dict()
         total = 0
         took = 0
@@ -2841,6 +2912,8 @@ class UnionSearchHandler:
 
             result_log_list.extend(ret["list"])
             result_origin_log_list.extend(ret["origin_log_list"])
+            sort_values = ret.get("sort_values") or [[]] * len(ret["list"])
+            union_results[index_set_id] = list(zip(ret["list"], ret["origin_log_list"], sort_values))
             total += int(ret["total"])
             took = max(took, ret["took"])
             for key, value in ret.get("fields", {}).items():
@@ -2873,41 +2946,45 @@ class UnionSearchHandler:
                     info["unionSearchTimeStamp"] = info[index_set_obj.time_field]
 
         if not self.sort_list:
-            # 默认使用时间字段排序
-            if not is_use_custom_time_field:
-                sort_field = list(time_fields)[0]
-                # 时间字段相同 直接以相同时间字段为key进行排序 默认为降序
-                result_log_list = sorted(result_log_list, key=lambda x: str(x[sort_field]), reverse=True)
-                result_origin_log_list = sorted(result_origin_log_list, key=lambda x: str(x[sort_field]), reverse=True)
-            else:
-                # 时间字段/时间字段格式/时间字段单位不同  标准化时间字段作为key进行排序 标准字段单位为 millisecond
-                result_log_list = sorted(result_log_list, key=lambda x: str(x["unionSearchTimeStamp"]), reverse=True)
-                result_origin_log_list = sorted(
-                    result_origin_log_list, key=lambda x: str(x["unionSearchTimeStamp"]), reverse=True
-                )
+            # 默认使用时间字段排序 时间字段相同 直接以相同时间字段为key进行排序 默认为降序
+            # 时间字段/时间字段格式/时间字段单位不同  标准化时间字段作为key进行排序 标准字段单位为 millisecond
+            sort_field = "unionSearchTimeStamp" if is_use_custom_time_field else list(time_fields)[0]
+
+            def sort_key(x):
+                return str(x[sort_field])
+
+            reverse = True
         else:
-            result_log_list = sort_func(data=result_log_list, sort_list=self.sort_list)
-            result_origin_log_list = sort_func(data=result_origin_log_list, sort_list=self.sort_list)
+            sort_key = get_sort_key(sort_list=self.sort_list)
+            reverse = False
+
+        if is_export:
+            result_log_list = sorted(result_log_list, key=sort_key, reverse=reverse)
+            result_origin_log_list = sorted(result_origin_log_list, key=sort_key, reverse=reverse)
+            result_log_list = result_log_list[: self.search_dict.get("size")]
+            result_origin_log_list = result_origin_log_list[: self.search_dict.get("size")]
+        else:
+            merged_results = self.merge_union_results(
+                union_results=union_results,
+                union_configs=self.union_configs,
+                size=self.search_dict.get("size"),
+                sort_key=sort_key,
+                reverse=reverse,
+            )
+            result_log_list = [log for log, origin_log, sort_values in merged_results]
+            result_origin_log_list = [origin_log for log, origin_log, sort_values in merged_results]
+
         # 在导出结果中删除查询时补充的字段
         if diff_fields:
             tmp_list = []
             for dic in result_origin_log_list:
                 tmp_list.append({k: v for k, v in dic.items() if k not in diff_fields})
             result_origin_log_list = tmp_list
-        # 处理分页
-        result_log_list = result_log_list[: self.search_dict.get("size")]
-        result_origin_log_list = result_origin_log_list[: self.search_dict.get("size")]
 
         # 日志导出提前返回
         if is_export:
             return {"origin_log_list": result_origin_log_list}
 
-        # 统计返回的数据中各个索引集分别占了多少条数据  用于下次begin查询
-        result_log_index_set_ids = [result_log["__index_set_id__"] for result_log in result_log_list]
-
-        for union_config in self.union_configs:
-            union_config["begin"] = union_config["begin"] + result_log_index_set_ids.count(union_config["index_set_id"])
-
         res = {
             "total": total,
             "took": took,
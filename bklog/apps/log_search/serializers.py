@@ -356,6 +356,7 @@ class UnionConfigSerializer(serializers.Serializer):
     begin = serializers.IntegerField(required=False, default=0)
     is_desensitize = serializers.BooleanField(label=_("是否脱敏"), required=False, default=True)
     custom_indices = serializers.CharField(required=False, allow_null=True, allow_blank=True, default="")
+    search_after = serializers.ListField(label=_("分页游标"), required=False, allow_empty=True, default=list)
 
 
 class UnionSearchAttrSerializer(SearchAttrSerializer):
@@ -40,6 +40,15 @@ def sort_func(data: list[dict[str, Any]], sort_list: list[list[str]], key_func=l
     params sort_list 排序规则 [["a.b", "desc"]]
     params key_func 排序字段值获取函数
     """
+    return sorted(data, key=get_sort_key(sort_list=sort_list, key_func=key_func))
+
+
+def get_sort_key(sort_list: list[list[str]], key_func=lambda x: x):
+    """
+    获取与 sort_func 排序规则一致的 key 函数，可用于 sorted、heapq.merge 等
+    params sort_list 排序规则 [["a.b", "desc"]]
+    params key_func 排序字段值获取函数
+    """
 
     def _sort_compare(x: dict[str, Any], y: dict[str, Any]) -> int:
         x = key_func(x)
@@ -80,7 +89,7 @@ def sort_func(data: list[dict[str, Any]], sort_list: list[list[str]], key_func=l
 
         return 0
 
-    return sorted(data, key=functools.cmp_to_key(_sort_compare))
+    return functools.cmp_to_key(_sort_compare)
 
 
 def create_context_should_query(order, body_should_data, sort_fields, sort_fields_value):
@@ -0,0 +1,240 @@
+"""
+Tencent is pleased to support the open source community by making BK-LOG 蓝鲸日志平台 available.
+Copyright (C) 2021 THL A29 Limited, a Tencent company.  All rights reserved.
+BK-LOG 蓝鲸日志平台 is licensed under the MIT License.
+License for BK-LOG 蓝鲸日志平台:
+--------------------------------------------------------------------
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the "Software"), to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN
+NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+We undertake not to change the open source license (MIT license) applicable to the current version of
+the project delivered to anyone in the future.
+"""
+
+import heapq
+from unittest.mock import Mock, patch
+
+from django.test import TestCase
+
+from apps.log_search.handlers.search.search_handlers_esquery import UnionSearchHandler
+from apps.log_search.serializers import UnionConfigSerializer
+from apps.log_search.utils import get_sort_key, sort_func
+
+TIME_FIELD = "dtEventTimeStamp"
+
+# 两个索引集的数据 (时间, 序号)，时间存在跨索引集及同索引集内相同的情况
+INDEX_SET_DATA = {
+    1: [("1700000009", 1), ("1700000007", 2), ("1700000007", 3), ("1700000007", 4), ("1700000003", 5)],
+    2: [("1700000008", 1), ("1700000007", 2), ("1700000005", 3), ("1700000002", 4), ("1700000001", 5)],
+}
+
+
+class FakeSearchHandler:
+    """
+    按 begin/search_after 模拟 ES 分页
+    """
+
+    # 是否使用序号作为排序的第二字段，保证排序值唯一
+    with_tie_breaker = True
+    search_dicts = []
+
+    def __init__(self, index_set_id, search_dict, **kwargs):
+        self.index_set_id = index_set_id
+        self.search_dict = search_dict
+        self.search_dicts.append(search_dict)
+
+    def search(self):
+        logs = [
+            {TIME_FIELD: timestamp, "seq": seq, "__index_set_id__": self.index_set_id}
+            for timestamp, seq in INDEX_SET_DATA[self.index_set_id]
+        ]
+        # ES 按排序值降序返回
+        sort_values = [[log[TIME_FIELD], -log["seq"]] if self.with_tie_breaker else [log[TIME_FIELD]] for log in logs]
+        rows = list(zip(logs, sort_values))
+
+        search_after = self.search_dict.get("search_after")
+        if search_after:
+            # 降序排列，search_after 只返回排序值严格小于游标的数据
+            rows = [row for row in rows if row[1] < search_after]
+        begin = self.search_dict.get("begin", 0)
+        rows = rows[begin : begin + self.search_dict["size"]]
+        return {
+            "list": [dict(log) for log, _sort_values in rows],
+            "origin_log_list": [dict(log) for log, _sort_values in rows],
+            "sort_values": [_sort_values for log, _sort_values in rows],
+            "total": len(INDEX_SET_DATA[self.index_set_id]),
+            "took": 1,
+            "fields": {},
+        }
+
+
+@patch("apps.log_search.handlers.search.search_handlers_esquery.SearchHandler", FakeSearchHandler)
+@patch.object(UnionSearchHandler, "_save_union_search_history", lambda self, res: None)
+@patch(
+    "apps.log_search.handlers.search.search_handlers_esquery.LogIndexSet.objects.filter",
+    lambda **kwargs: [
+        Mock(index_set_id=index_set_id, time_field=TIME_FIELD, time_field_type="date", time_field_unit="second")
+        for index_set_id in kwargs["index_set_id__in"]
+    ],
+)
+class TestUnionSearch(TestCase):
+    def setUp(self):
+        FakeSearchHandler.search_dicts = []
+
+    def search_all_pages(self, size):
+        union_configs = [{"index_set_id": 1, "begin": 0}, {"index_set_id": 2, "begin": 0}]
+        pages = []
+        for _page in range(10):
+            # 模拟前端回传分页配置
+            serializer = UnionConfigSerializer(data=union_configs, many=True)
+            serializer.is_valid(raise_exception=True)
+            handler = UnionSearchHandler(
+                {
+                    "union_configs": [dict(config) for config in serializer.validated_data],
+                    "sort_list": [],
+                    "size": size,
+                }
+            )
+            res = handler.union_search()
+            if not res["list"]:
+                break
+            pages.append([(log["__index_set_id__"], log["seq"]) for log in res["list"]])
+            union_configs = res["union_configs"]
+        return pages
+
+    def assert_all_pages(self, pages, size):
+        logs = [log for page in pages for log in page]
+        # 不丢失、不重复
+        expected = [(index_set_id, seq) for index_set_id, rows in INDEX_SET_DATA.items() for _time, seq in rows]
+        self.assertEqual(sorted(logs), sorted(expected))
+        # 跨页整体按时间降序
+        timestamps = [INDEX_SET_DATA[index_set_id][seq - 1][0] for index_set_id, seq in logs]
+        self.assertEqual(timestamps, sorted(timestamps, reverse=True))
+        self.assertTrue(all(len(page) <= size for page in pages))
+
+    def test_union_search_pages(self):
+        pages = self.search_all_pages(size=3)
+        self.assert_all_pages(pages, size=3)
+        self.assertEqual(pages[0], [(1, 1), (2, 1), (1, 2)])
+        # 每个索引集多取一条数据用于判断排序值是否唯一
+        self.assertTrue(all(search_dict["size"] == 4 for search_dict in FakeSearchHandler.search_dicts))
+        # 排序值唯一时翻页使用游标，不再使用偏移量
+        cursor_searches = [search_dict for search_dict in FakeSearchHandler.search_dicts if search_dict["search_after"]]
+        self.assertTrue(cursor_searches)
+        self.assertTrue(all(search_dict["begin"] == 0 for search_dict in cursor_searches))
+
+    @patch.object(FakeSearchHandler, "with_tie_breaker", False)
+    def test_union_search_pages__duplicate_sort_values(self):
+        # 仅按时间字段排序时，页尾数据与后续数据排序值相同，退回使用偏移量，不丢失数据
+        for size in (1, 2, 3, 4):
+            FakeSearchHandler.search_dicts = []
+            pages = self.search_all_pages(size=size)
+            self.assert_all_pages(pages, size=size)
+
+    def test_merge_union_results(self):
+        union_results = {
+            1: [({"t": "9", "__index_set_id__": 1}, {}, [9, 1]), ({"t": "10", "__index_set_id__": 1}, {}, [10, 2])],
+            2: [({"t": "8", "__index_set_id__": 2}, {}, [8, 1]), ({"t": "7", "__index_set_id__": 2}, {}, [7, 2])],
+        }
+        union_configs = [{"index_set_id": 1, "begin": 0}, {"index_set_id": 2, "begin": 0}]
+
+        merged = UnionSearchHandler.merge_union_results(
+            union_results=union_results,
+            union_configs=union_configs,
+            size=2,
+            sort_key=lambda log: log["t"],
+            reverse=True,
+        )
+        self.assertEqual([log["t"] for log, origin_log, sort_values in merged], ["9", "8"])
+        self.assertEqual(
+            union_configs,
+            [
+                {"index_set_id": 1, "begin": 1, "search_after": [9, 1]},
+                {"index_set_id": 2, "begin": 1, "search_after": [8, 1]},
+            ],
+        )
+
+    def test_merge_union_results__es_order_mismatch(self):
+        # ES 按数值降序返回 "10", "9"，此处排序规则按字符串比较("9" > "10")，两者顺序不一致
+        rows = {
+            1: [({"t": "10", "__index_set_id__": 1}, {}, [10]), ({"t": "9", "__index_set_id__": 1}, {}, [9])],
+            2: [({"t": "8", "__index_set_id__": 2}, {}, [8]), ({"t": "7", "__index_set_id__": 2}, {}, [7])],
+        }
+        union_configs = [{"index_set_id": 1, "begin": 0}, {"index_set_id": 2, "begin": 0}]
+
+        pages = []
+        while True:
+            # 模拟 ES 按 begin 偏移量取数，每个索引集多取一条
+            union_results = {
+                config["index_set_id"]: rows[config["index_set_id"]][config["begin"] : config["begin"] + 3]
+                for config in union_configs
+            }
+            merged = UnionSearchHandler.merge_union_results(
+                union_results=union_results,
+                union_configs=union_configs,
+                size=2,
+                sort_key=lambda log: log["t"],
+                reverse=True,
+            )
+            if not merged:
+                break
+            pages.extend(log["t"] for log, origin_log, sort_values in merged)
+
+            # 游标指向各索引集最后一条被取出的数据
+            for config in union_configs:
+                if config["begin"]:
+                    consumed = [item for item in rows[config["index_set_id"]] if item[0]["t"] in pages]
+                    self.assertEqual(config["search_after"], consumed[-1][2])
+
+        # 翻页不遗漏、不重复
+        self.assertEqual(sorted(pages), sorted(["10", "9", "8", "7"]))
+        self.assertEqual(len(pages), len(set(pages)))
+
+
+class TestSortKey(TestCase):
+    DATA = [
+        {"a": {"b": 3}, "c": 1, "dtEventTimeStamp": 1700000002},
+        {"a": {"b": 7}, "c": 2, "dtEventTimeStamp": "1700000001"},
+        {"a": {"b": 3}, "c": 3, "dtEventTimeStamp": 1700000003},
+        {"a": {"b": 7}, "c": 4},
+    ]
+
+    def test_get_sort_key(self):
+        sort_list = [["a.b", "desc"], ["c", "asc"]]
+        self.assertEqual(
+            [item["c"] for item in sorted(self.DATA, key=get_sort_key(sort_list))],
+            [2, 4, 1, 3],
+        )
+        # 与 sort_func 保持一致
+        self.assertEqual(sorted(self.DATA, key=get_sort_key(sort_list)), sort_func(self.DATA, sort_list))
+
+        # 时间字段转换为字符串比较，兼容数值与字符串混用
+        self.assertEqual(
+            [item["c"] for item in sort_func(self.DATA[:3], [["dtEventTimeStamp", "desc"]])],
+            [3, 1, 2],
+        )
+
+    def test_get_sort_key__key_func(self):
+        sort_list = [["a.b", "asc"], ["c", "desc"]]
+        hits = [{"_source": item} for item in self.DATA]
+        key = get_sort_key(sort_list, key_func=lambda x: x["_source"])
+        self.assertEqual([hit["_source"]["c"] for hit in sorted(hits, key=key)], [3, 1, 4, 2])
+
+    def test_get_sort_key__merge(self):
+        sort_list = [["c", "desc"]]
+        key = get_sort_key(sort_list)
+        first = sort_func([self.DATA[0], self.DATA[2]], sort_list)
+        second = sort_func([self.DATA[1], self.DATA[3]], sort_list)
+        # 可直接用于多路归并
+        self.assertEqual(
+            [item["c"] for item in heapq.merge(first, second, key=key)],
+            [4, 3, 2, 1],
+        )
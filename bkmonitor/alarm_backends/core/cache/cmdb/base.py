@@ -8,7 +8,10 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Hashable, Iterable
 from typing import Any
 
 from django.conf import settings
@@ -53,3 +56,44 @@ class CMDBCacheManager(ABC):
         :return: 缓存
         """
         raise NotImplementedError
+
+
+class LocalTTLCache:
+    """
+    进程内 TTL 缓存，用于缓存解码后的 CMDB 对象，减少重复的 redis 查询及反序列化
+    不存在的对象同样会缓存为 None，避免反复穿透到 redis
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.data: dict[Hashable, tuple[float, Any]] = {}
+        self.lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[Hashable], ttl: int) -> tuple[dict[Hashable, Any], list[Hashable]]:
+        """
+        批量获取缓存
+        :return: (命中的缓存, 未命中的key列表)
+        """
+        now = time.time()
+        found = {}
+        missing = []
+        for key in keys:
+            item = self.data.get(key)
+            if item is not None and now - item[0] < ttl:
+                found[key] = item[1]
+            else:
+                missing.append(key)
+        return found, missing
+
+    def set_many(self, mapping: dict[Hashable, Any]):
+        now = time.time()
+        with self.lock:
+            # 超过上限时整体清空，避免逐个淘汰的开销
+            if len(self.data) + len(mapping) > self.max_size:
+                self.data.clear()
+            for key, value in mapping.items():
+                self.data[key] = (now, value)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
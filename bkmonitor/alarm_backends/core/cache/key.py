@@ -402,6 +402,16 @@ CHECK_RESULT_CACHE_KEY = register_key_with_config(
     }
 )
 
+DETECT_RESULT_CLEAN_PROGRESS_KEY = register_key_with_config(
+    {
+        "label": "[detect]检测结果过期清理进度(value: 已完成清理的最大策略ID)",
+        "key_type": "string",
+        "key_tpl": "detect.result.clean.progress.{strategy_range}",
+        "ttl": CONST_ONE_HOUR,
+        "backend": "service",
+    }
+)
+
 NOTICE_VOICE_COLLECT_KEY = register_key_with_config(
     {
         "label": "[notice]电话单维度通知汇总",
@@ -586,6 +596,16 @@ ALERT_SNAPSHOT_KEY = register_key_with_config(
     }
 )
 
+ALERT_EVENT_UID_KEY = register_key_with_config(
+    {
+        "label": "[alert]已写入的事件ID，用于异步写入事件时去重",
+        "key_type": "string",
+        "key_tpl": "alert.builder.event.{strategy_id}.{event_id}",
+        "ttl": CONST_ONE_HOUR,
+        "backend": "service",
+    }
+)
+
 EVENT_PULL_LOCKS = register_key_with_config(
     {
         "label": "[alert]事件拉取锁",
@@ -606,6 +626,26 @@ ALERT_UPDATE_LOCK = register_key_with_config(
     }
 )
 
+ACTIVE_ALERT_TIMER_KEY = register_key_with_config(
+    {
+        "label": "[alert]活跃告警时间轮，分值为告警下次检测时间",
+        "key_type": "sorted_set",
+        "key_tpl": "alert.manager.active_alert.timer",
+        "ttl": CONST_ONE_DAY,
+        "backend": "service",
+    }
+)
+
+ACTIVE_ALERT_RECONCILE_LOCK = register_key_with_config(
+    {
+        "label": "[alert]活跃告警时间轮对账周期锁",
+        "key_type": "string",
+        "key_tpl": "alert.manager.active_alert.reconcile.lock",
+        "ttl": settings.ALERT_TIMER_WHEEL_RECONCILE_INTERVAL * CONST_MINUTES,
+        "backend": "service",
+    }
+)
+
 ALERT_UUID_SEQUENCE = register_key_with_config(
     {
         "label": "[alert]告警的UUID自增序列",
@@ -888,6 +928,16 @@ NOISE_REDUCE_TOTAL_KEY = register_key_with_config(
     }
 )
 
+NOISE_REDUCE_TOTAL_HLL_KEY = register_key_with_config(
+    {
+        "label": "[access]按时间分桶记录策略对应的降噪基数(HyperLogLog)",
+        "key_type": "string",
+        "key_tpl": "access.noise_reduce.total_hll.{strategy_id}.{noise_dimension_hash}.{bucket}",
+        "ttl": CONST_ONE_HOUR,
+        "backend": "service",
+    }
+)
+
 NOISE_REDUCE_ABNORMAL_KEY = register_key_with_config(
     {
         "label": "[access]记录策略对应的降噪数量",
@@ -11,8 +11,9 @@ specific language governing permissions and limitations under the License.
 import copy
 import json
 import logging
+import threading
 import time
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from collections.abc import Callable, Iterable
 from datetime import datetime, timedelta
 from itertools import chain, groupby
@@ -20,6 +21,7 @@ from operator import itemgetter
 from typing import Any
 
 import arrow
+import xxhash
 from bk_monitor_base.strategy import list_strategy, parse_metric_id
 from django.conf import settings
 
@@ -83,6 +85,14 @@ class StrategyCacheManager(CacheManager):
     STRATEGY_GROUP_CACHE_KEY = CacheManager.CACHE_KEY_PREFIX + ".strategy_group"
     # 最近增量更新时间
     LAST_UPDATED_CACHE_KEY = CacheManager.CACHE_KEY_PREFIX + ".last_updated"
+    # 策略缓存版本号，策略详情缓存变更后递增，用于失效进程内缓存
+    EPOCH_CACHE_KEY = CacheManager.CACHE_KEY_PREFIX + ".strategy_epoch"
+    # 策略详情摘要(type:hash, field: strategy_id)，用于跳过未变化策略的写入
+    CHECKSUM_CACHE_KEY = CacheManager.CACHE_KEY_PREFIX + ".strategy_checksum"
+    # 策略变更通知频道
+    CHANGES_CHANNEL = CacheManager.CACHE_KEY_PREFIX + ".strategy_changes"
+    # 单条变更通知携带的策略ID数量上限，超过时通知全量失效
+    CHANGES_MAX_STRATEGY_IDS = 1000
     # 事件型时序检测周期(默认60s)
     fake_event_agg_interval = 60
     # 实例维度
@@ -610,6 +620,41 @@ class StrategyCacheManager(CacheManager):
         strategy = json.loads(cls.cache.get(cls.CACHE_KEY_TEMPLATE.format(strategy_id=strategy_id)) or "null")
         return strategy
 
+    @classmethod
+    def get_strategy_by_id_from_local(cls, strategy_id: int) -> dict:
+        """
+        优先从进程内缓存中获取策略详情
+        """
+        return LOCAL_STRATEGY_CACHE.get(strategy_id, cls.get_strategy_by_id)
+
+    @classmethod
+    def get_epoch(cls) -> str:
+        """
+        获取策略缓存版本号
+        """
+        return cls.cache.get(cls.EPOCH_CACHE_KEY) or "0"
+
+    @classmethod
+    def incr_epoch(cls, strategy_ids: Iterable[int] | None = None):
+        """
+        递增策略缓存版本号，并发布策略变更通知，通知各进程失效进程内策略缓存
+        :param strategy_ids: 发生变更(含删除)的策略ID，为 None 时表示全部失效
+        """
+        pipeline = cls.cache.pipeline()
+        pipeline.incr(cls.EPOCH_CACHE_KEY)
+        pipeline.expire(cls.EPOCH_CACHE_KEY, cls.CACHE_TIMEOUT)
+        epoch = pipeline.execute()[0]
+
+        if strategy_ids is not None:
+            strategy_ids = sorted(set(strategy_ids))
+            if len(strategy_ids) > cls.CHANGES_MAX_STRATEGY_IDS:
+                strategy_ids = None
+
+        try:
+            cls.cache.publish(cls.CHANGES_CHANNEL, json.dumps({"epoch": str(epoch), "strategy_ids": strategy_ids}))
+        except Exception as e:  # noqa
+            logger.warning(f"publish strategy changes failed: {e}")
+
     @classmethod
     def get_all_bk_biz_ids(cls) -> list:
         """
@@ -755,12 +800,18 @@ class StrategyCacheManager(CacheManager):
         cls.cache.set(cls.IDS_CACHE_KEY, json.dumps(list(updated_strategy_ids)), cls.CACHE_TIMEOUT)
 
         # 遍历旧的策略ID列表，检查是否有不在新策略列表中的ID。
+        deleted_strategy_ids = set()
         for strategy_id in old_strategy_ids:
             # 如果旧列表中的ID在新列表中找不到，则说明该策略已被删除或更改。
             if strategy_id not in updated_strategy_ids:
                 logger.info(f"[smart_strategy_cache]: refresh_strategy_ids delete strategy: {strategy_id}")
                 # 从缓存中删除该策略的相关信息。
                 cls.cache.delete(cls.CACHE_KEY_TEMPLATE.format(strategy_id=strategy_id))
+                deleted_strategy_ids.add(strategy_id)
+
+        if deleted_strategy_ids:
+            cls.cache.hdel(cls.CHECKSUM_CACHE_KEY, *deleted_strategy_ids)
+        return deleted_strategy_ids
 
     @classmethod
     def refresh_bk_biz_ids(cls, strategies: list[dict], partial=None):
@@ -782,11 +833,34 @@ class StrategyCacheManager(CacheManager):
         logger.info(f"[smart_strategy_cache]: refresh_bk_biz_ids new_bk_biz_ids: {len(old_bk_biz_ids)}")
         return cls.cache.set(cls.BK_BIZ_IDS_CACHE_KEY, json.dumps(old_bk_biz_ids), cls.CACHE_TIMEOUT)
 
+    @staticmethod
+    def merge_biz_strategy_ids(
+        new_biz_strategy_ids: dict, old_biz_strategy_ids: dict, partial: set, to_be_deleted_strategy_ids: set
+    ):
+        """
+        增量合并按业务划分的策略ID
+        保留旧数据中不在本次刷新业务范围内、且未被删除的策略ID
+        :param new_biz_strategy_ids: 本次刷新业务的策略ID(bk_biz_id -> strategy_ids)，原地合并
+        :param old_biz_strategy_ids: 缓存中的策略ID(bk_biz_id -> strategy_ids)
+        :param partial: 本次刷新的业务ID
+        :param to_be_deleted_strategy_ids: 待删除的策略ID
+        """
+        for bk_biz_id, strategy_ids in old_biz_strategy_ids.items():
+            if bk_biz_id in partial:
+                continue
+            strategy_ids = [
+                strategy_id for strategy_id in strategy_ids if strategy_id not in to_be_deleted_strategy_ids
+            ]
+            if strategy_ids:
+                new_biz_strategy_ids.setdefault(bk_biz_id, []).extend(strategy_ids)
+
     @classmethod
-    def refresh_real_time_strategy_ids(cls, strategies: list[dict]):
+    def refresh_real_time_strategy_ids(cls, strategies: list[dict], partial=None, to_be_deleted_strategy_ids=None):
         """
         刷新实时数据的相关策略
         :param strategies: 策略列表
+        :param partial: 增量刷新的业务ID，为 None 时全量刷新
+        :param to_be_deleted_strategy_ids: 增量刷新时待删除的策略ID
         :cache data: type:dict(rt_id -> bk_biz_id -> strategy_ids)
         """
         real_time_strategys = {}
@@ -801,11 +875,21 @@ class StrategyCacheManager(CacheManager):
                     and query_config.get("agg_method") == AGG_METHOD_REAL_TIME
                 ):
                     real_time_strategys.setdefault(query_config["result_table_id"], {}).setdefault(
-                        bk_biz_id, []
+                        str(bk_biz_id), []
                     ).append(strategy["id"])
             except Exception as e:
                 logger.exception("refresh strategy error when refresh_real_time_strategy_ids: %s", e)
 
+        if partial is not None:
+            # 增量刷新，缓存中的业务ID为字符串
+            partial = {str(bk_biz_id) for bk_biz_id in partial}
+            to_be_deleted_strategy_ids = set(to_be_deleted_strategy_ids or [])
+            for rt_id, biz_strategy_ids in cls.get_real_time_data_strategy_ids().items():
+                cls.merge_biz_strategy_ids(
+                    real_time_strategys.setdefault(rt_id, {}), biz_strategy_ids, partial, to_be_deleted_strategy_ids
+                )
+            real_time_strategys = {rt_id: value for rt_id, value in real_time_strategys.items() if value}
+
         cls.cache.set(cls.REAL_TIME_CACHE_KEY, json.dumps(real_time_strategys), cls.CACHE_TIMEOUT)
 
     @classmethod
@@ -839,9 +923,11 @@ class StrategyCacheManager(CacheManager):
         cls.cache.set(cls.AIOPS_SDK_CACHE_KEY, json.dumps(aiops_sdk_strategy_ids), cls.CACHE_TIMEOUT)
 
     @classmethod
-    def refresh_gse_alarm_strategy_ids(cls, strategies: list[dict]):
+    def refresh_gse_alarm_strategy_ids(cls, strategies: list[dict], partial=None, to_be_deleted_strategy_ids=None):
         """
         刷新gse事件策略ID列表缓存
+        :param partial: 增量刷新的业务ID，为 None 时全量刷新
+        :param to_be_deleted_strategy_ids: 增量刷新时待删除的策略ID
         """
         gse_event_strategy_ids = defaultdict(list)
         for strategy in strategies:
@@ -851,16 +937,27 @@ class StrategyCacheManager(CacheManager):
                 data_source_label = query_config["data_source_label"]
                 data_type_label = query_config["data_type_label"]
                 if data_source_label == DataSourceLabel.BK_MONITOR_COLLECTOR and data_type_label == DataTypeLabel.EVENT:
-                    gse_event_strategy_ids[strategy["bk_biz_id"]].append(strategy["id"])
+                    gse_event_strategy_ids[str(strategy["bk_biz_id"])].append(strategy["id"])
             except Exception as e:
                 logger.exception("refresh strategy error when refresh_gse_alarm_strategy_ids: %s", e)
 
+        if partial is not None:
+            # 增量刷新，缓存中的业务ID为字符串
+            cls.merge_biz_strategy_ids(
+                gse_event_strategy_ids,
+                cls.get_gse_alarm_strategy_ids(),
+                {str(bk_biz_id) for bk_biz_id in partial},
+                set(to_be_deleted_strategy_ids or []),
+            )
+
         cls.cache.set(cls.GSE_ALARM_CACHE_KEY, json.dumps(gse_event_strategy_ids), cls.CACHE_TIMEOUT)
 
     @classmethod
-    def refresh_fta_alert_strategy_ids(cls, strategies: list[dict]):
+    def refresh_fta_alert_strategy_ids(cls, strategies: list[dict], partial=None, to_be_deleted_strategy_ids=None):
         """
         刷新自愈策略列表缓存
+        :param partial: 增量刷新的业务ID，为 None 时全量刷新
+        :param to_be_deleted_strategy_ids: 增量刷新时待删除的策略ID
         """
         fta_alert_strategy_ids = {}
         for strategy in strategies:
@@ -875,15 +972,28 @@ class StrategyCacheManager(CacheManager):
                         if data_source_label == DataSourceLabel.BK_MONITOR_COLLECTOR:
                             fta_alert_strategy_ids.setdefault(
                                 f"strategy|{query_config['bkmonitor_strategy_id']}", {}
-                            ).setdefault(strategy["bk_biz_id"], []).append(strategy["id"])
+                            ).setdefault(str(strategy["bk_biz_id"]), []).append(strategy["id"])
                         elif data_source_label == DataSourceLabel.BK_FTA:
                             fta_alert_strategy_ids.setdefault(f"alert|{query_config['alert_name']}", {}).setdefault(
-                                strategy["bk_biz_id"], []
+                                str(strategy["bk_biz_id"]), []
                             ).append(strategy["id"])
 
             except Exception as e:
                 logger.exception("refresh strategy error when refresh_fta_alert_strategy_ids: %s", e)
 
+        if partial is not None:
+            # 增量刷新，缓存中的业务ID为字符串
+            partial = {str(bk_biz_id) for bk_biz_id in partial}
+            to_be_deleted_strategy_ids = set(to_be_deleted_strategy_ids or [])
+            for fta_key, value in (cls.cache.hgetall(cls.FTA_ALERT_CACHE_KEY) or {}).items():
+                cls.merge_biz_strategy_ids(
+                    fta_alert_strategy_ids.setdefault(fta_key, {}),
+                    json.loads(value),
+                    partial,
+                    to_be_deleted_strategy_ids,
+                )
+            fta_alert_strategy_ids = {fta_key: value for fta_key, value in fta_alert_strategy_ids.items() if value}
+
         # 批量保存 Key
         if fta_alert_strategy_ids:
             cls.cache.hmset(
@@ -913,17 +1023,17 @@ class StrategyCacheManager(CacheManager):
 
         :param strategies: 新的策略列表，每个策略包含其详细信息
         :param old_groups: 旧的策略分组信息，如果为None，则进行全量更新。否则进行增量更新，删除不在新策略中的旧分组
+        :return: 策略详情发生变化的策略ID
         """
+        # 写入策略详情，内容未变化的策略只续期
+        changed_strategy_ids = cls.refresh_strategy_details(strategies, refresh_all=old_groups is None)
+
         # 初始化策略分组缓存结构
         strategy_groups = defaultdict(lambda: defaultdict(list))
 
         # 开启缓存pipeline以优化写入性能
         pipeline = cls.cache.pipeline()
         for strategy in strategies:
-            # 将策略信息存储到缓存中
-            pipeline.set(
-                cls.CACHE_KEY_TEMPLATE.format(strategy_id=strategy["id"]), json.dumps(strategy), cls.CACHE_TIMEOUT
-            )
             # 默认周期 50s
             for item in strategy["items"]:
                 if item.get("query_md5"):
@@ -973,6 +1083,58 @@ class StrategyCacheManager(CacheManager):
 
         # 执行pipeline中的所有操作
         pipeline.execute()
+        return changed_strategy_ids
+
+    @classmethod
+    def refresh_strategy_details(cls, strategies: list[dict], refresh_all: bool = True) -> set[int]:
+        """
+        刷新策略详情缓存
+        通过策略详情摘要比对，只写入内容发生变化的策略，未变化的策略只续期
+        :param strategies: 策略列表
+        :param refresh_all: 是否为全量刷新，全量刷新时清理不在策略列表中的摘要
+        :return: 策略详情发生变化的策略ID
+        """
+        old_checksums = cls.cache.hgetall(cls.CHECKSUM_CACHE_KEY) or {}
+
+        checksums = {}
+        changed_contents = {}
+        unchanged_contents = {}
+        for strategy in strategies:
+            content = json.dumps(strategy)
+            checksum = xxhash.xxh64_hexdigest(content.encode("utf-8"))
+            checksums[str(strategy["id"])] = checksum
+            if old_checksums.get(str(strategy["id"])) == checksum:
+                unchanged_contents[strategy["id"]] = content
+            else:
+                changed_contents[strategy["id"]] = content
+
+        # 未变化的策略续期，续期失败说明缓存已丢失，需要重新写入
+        pipeline = cls.cache.pipeline()
+        for strategy_id in unchanged_contents:
+            pipeline.expire(cls.CACHE_KEY_TEMPLATE.format(strategy_id=strategy_id), cls.CACHE_TIMEOUT)
+        for strategy_id, result in zip(list(unchanged_contents), pipeline.execute()):
+            if not result:
+                changed_contents[strategy_id] = unchanged_contents[strategy_id]
+
+        for strategy_id, content in changed_contents.items():
+            pipeline.set(cls.CACHE_KEY_TEMPLATE.format(strategy_id=strategy_id), content, cls.CACHE_TIMEOUT)
+        if changed_contents:
+            pipeline.hset(
+                cls.CHECKSUM_CACHE_KEY,
+                mapping={str(strategy_id): checksums[str(strategy_id)] for strategy_id in changed_contents},
+            )
+        if refresh_all:
+            deleted_fields = set(old_checksums) - set(checksums)
+            if deleted_fields:
+                pipeline.hdel(cls.CHECKSUM_CACHE_KEY, *deleted_fields)
+        pipeline.expire(cls.CHECKSUM_CACHE_KEY, cls.CACHE_TIMEOUT)
+        pipeline.execute()
+
+        logger.info(
+            f"[strategy_cache]: refresh strategy details, changed({len(changed_contents)}), "
+            f"unchanged({len(strategies) - len(changed_contents)})"
+        )
+        return set(changed_contents)
 
     @classmethod
     def add_enabled_cluster_condition(cls, strategy_configs: list[dict]):
@@ -1114,12 +1276,21 @@ class StrategyCacheManager(CacheManager):
                 logger.exception(f"[refresh_strategy_cache]: get data of changed_strategies_map failed: {e}")
                 exc = e
 
+        # 记录发生变更(含删除)的策略ID，用于发布变更通知
+        changed_strategy_ids = set()
+
+        def refresh_strategy_ids(_strategies):
+            changed_strategy_ids.update(cls.refresh_strategy_ids(_strategies))
+
+        def refresh_strategy(_strategies):
+            changed_strategy_ids.update(cls.refresh_strategy(_strategies))
+
         processors: list[Callable[[list[dict]], None]] = [
             cls.add_target_shield_condition,
             cls.add_enabled_cluster_condition,
-            cls.refresh_strategy_ids,  # 刷新缓存策略ID
+            refresh_strategy_ids,  # 刷新缓存策略ID
             cls.refresh_bk_biz_ids,  # 刷新缓存业务ID
-            cls.refresh_strategy,  # 刷新缓存策略详细信息和策略分组信息
+            refresh_strategy,  # 刷新缓存策略详细信息和策略分组信息
             cls.refresh_real_time_strategy_ids,  # 刷新实时数据的相关策略
             cls.refresh_gse_alarm_strategy_ids,  # 刷新gse事件策略ID列表缓存
             cls.refresh_fta_alert_strategy_ids,  # 刷新自愈策略列表缓存
@@ -1144,6 +1315,10 @@ class StrategyCacheManager(CacheManager):
             target_biz_set, to_be_deleted_strategy_ids = cls.handle_history_strategies(histories, with_group_key=False)
             for strategy_id, _ in to_be_deleted_strategy_ids:
                 cls.cache.delete(cls.CACHE_KEY_TEMPLATE.format(strategy_id=strategy_id))
+                changed_strategy_ids.add(strategy_id)
+
+        # 递增版本号并通知变更的策略，处理异常时通知全部失效
+        cls.incr_epoch(None if exc else changed_strategy_ids)
 
         duration = time.time() - start_time
         metrics.ALARM_CACHE_TASK_TIME.labels("0", "strategy", str(exc)).observe(duration)
@@ -1240,18 +1415,33 @@ class StrategyCacheManager(CacheManager):
         # 记录待处理的策略数量
         logger.info(f"[smart_strategy_cache]: {len(strategies)} strategy to be processed")
 
+        deleted_strategy_ids = {ids[0] for ids in to_be_deleted_strategy_ids}
+        # 获取策略失败时，不更新目标业务的派生索引，只处理删除的策略
+        partial_biz_set = set() if exc else target_biz_set
+        # 记录发生变更(含删除)的策略ID，用于发布变更通知
+        changed_strategy_ids = set(deleted_strategy_ids)
+
         # 定义更新策略的函数列表
         def refresh_strategy_ids(_strategies):
-            return cls.refresh_strategy_ids(_strategies, [ids[0] for ids in to_be_deleted_strategy_ids])
+            changed_strategy_ids.update(cls.refresh_strategy_ids(_strategies, list(deleted_strategy_ids)))
 
         def refresh_bk_biz_ids(_strategies):
             return cls.refresh_bk_biz_ids(_strategies, partial=target_biz_set)
 
         def refresh_strategy(_strategies):
-            return cls.refresh_strategy(
-                _strategies, old_groups=[ids[1] for ids in to_be_deleted_strategy_ids if ids[1]]
+            changed_strategy_ids.update(
+                cls.refresh_strategy(_strategies, old_groups=[ids[1] for ids in to_be_deleted_strategy_ids if ids[1]])
             )
 
+        def refresh_real_time_strategy_ids(_strategies):
+            return cls.refresh_real_time_strategy_ids(_strategies, partial_biz_set, deleted_strategy_ids)
+
+        def refresh_gse_alarm_strategy_ids(_strategies):
+            return cls.refresh_gse_alarm_strategy_ids(_strategies, partial_biz_set, deleted_strategy_ids)
+
+        def refresh_fta_alert_strategy_ids(_strategies):
+            return cls.refresh_fta_alert_strategy_ids(_strategies, partial_biz_set, deleted_strategy_ids)
+
         def refresh_aiops_sdk_strategy_ids(_strategies):
             aiops_sdk_ids, none_aiops_sdk_ids = set(), set()
             for strategy in strategies:
@@ -1298,6 +1488,9 @@ class StrategyCacheManager(CacheManager):
             refresh_nodata_strategy_ids,
             refresh_aiops_sdk_strategy_ids,
             refresh_strategy,
+            refresh_real_time_strategy_ids,
+            refresh_gse_alarm_strategy_ids,
+            refresh_fta_alert_strategy_ids,
         ]
 
         for processor in processors:
@@ -1307,6 +1500,9 @@ class StrategyCacheManager(CacheManager):
                 # 若执行过程中出现异常，则记录日志
                 logger.exception(f"[smart_strategy_cache]: refresh strategy error when {processor.__name__}")
                 exc = e
+        # 递增版本号并通知变更的策略，处理异常时通知全部失效
+        cls.incr_epoch(None if exc else changed_strategy_ids)
+
         # 记录执行时间并更新最后更新时间的缓存
         duration = time.time() - start_time
         logger.info(f"[smart_strategy_cache]: cache strategy done, cost: {duration}")
@@ -1330,6 +1526,127 @@ class StrategyCacheManager(CacheManager):
                     sync_aiops_strategy_signal("modify", change_record["strategy_id"], changed_time)
 
 
+class LocalStrategyCache:
+    """
+    进程内策略详情缓存(LRU)
+
+    避免同一进程内反复创建 Strategy 对象时，每次都从 redis 获取并反序列化完整的策略详情。
+    缓存失效方式：
+    1. 订阅策略变更通知，按变更的策略ID失效，通知不连续时清空缓存
+    2. 按固定间隔检查策略缓存版本号，发生变化时清空缓存，作为通知丢失时的兜底
+    缓存的策略详情在同一进程的策略对象及线程间共享，使用方只读，
+    需要修改时先复制要修改的部分(如 Item 中的 query_config)。
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.configs = OrderedDict()
+        self.epoch = None
+        self.epoch_checked_at = 0
+        self.pubsub = None
+
+    def subscribe(self):
+        """
+        订阅策略变更通知
+        """
+        if self.pubsub is not None or not settings.STRATEGY_LOCAL_CACHE_SUBSCRIBE_ENABLED:
+            return
+
+        try:
+            pubsub = StrategyCacheManager.cache.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(StrategyCacheManager.CHANGES_CHANNEL)
+        except Exception as e:  # noqa
+            logger.warning(f"subscribe strategy changes failed: {e}")
+            return
+        self.pubsub = pubsub
+
+    def handle_changes(self):
+        """
+        处理已收到的策略变更通知(非阻塞)
+        """
+        if self.pubsub is None:
+            return
+
+        try:
+            while True:
+                message = self.pubsub.get_message(timeout=0)
+                if not message:
+                    break
+                if message["type"] == "message":
+                    self.apply_changes(json.loads(message["data"]))
+        except Exception as e:  # noqa
+            # 连接异常时可能丢失通知，清空缓存并重新订阅
+            logger.warning(f"handle strategy changes failed: {e}")
+            self.pubsub = None
+            self.configs.clear()
+            self.epoch = None
+
+    def apply_changes(self, changes: dict):
+        """
+        根据变更通知失效缓存
+        :param changes: {"epoch": 版本号, "strategy_ids": 变更的策略ID，为 None 时表示全部失效}
+        """
+        epoch = int(changes["epoch"])
+        strategy_ids = changes.get("strategy_ids")
+        current_epoch = int(self.epoch) if self.epoch is not None else None
+
+        # 版本号不连续说明有通知丢失，清空缓存
+        if strategy_ids is None or current_epoch is None or epoch > current_epoch + 1:
+            self.configs.clear()
+        else:
+            for strategy_id in strategy_ids:
+                self.configs.pop(str(strategy_id), None)
+
+        if current_epoch is None or epoch > current_epoch:
+            self.epoch = str(epoch)
+
+    def check_epoch(self):
+        with self.lock:
+            self.subscribe()
+            self.handle_changes()
+
+        now = time.time()
+        if now - self.epoch_checked_at < settings.STRATEGY_LOCAL_CACHE_EPOCH_CHECK_INTERVAL:
+            return
+
+        epoch = StrategyCacheManager.get_epoch()
+        with self.lock:
+            self.epoch_checked_at = now
+            if epoch != self.epoch:
+                self.epoch = epoch
+                self.configs.clear()
+
+    def get(self, strategy_id, loader: Callable[[int], dict]) -> dict:
+        self.check_epoch()
+
+        # 策略ID可能是字符串
+        cache_key = str(strategy_id)
+        with self.lock:
+            if cache_key in self.configs:
+                self.configs.move_to_end(cache_key)
+                return self.configs[cache_key]
+            epoch = self.epoch
+
+        config = loader(strategy_id)
+
+        with self.lock:
+            # 加载期间版本号发生变化，则不写入缓存，避免缓存旧数据
+            if epoch == self.epoch:
+                self.configs[cache_key] = config
+                while len(self.configs) > settings.STRATEGY_LOCAL_CACHE_MAX_SIZE:
+                    self.configs.popitem(last=False)
+        return config
+
+    def clear(self):
+        with self.lock:
+            self.configs.clear()
+            self.epoch = None
+            self.epoch_checked_at = 0
+
+
+LOCAL_STRATEGY_CACHE = LocalStrategyCache()
+
+
 class TargetShieldProcessor:
     """
     策略目标抑制处理器
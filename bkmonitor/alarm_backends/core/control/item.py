@@ -10,6 +10,7 @@ specific language governing permissions and limitations under the License.
 
 import logging
 from collections import defaultdict
+from collections.abc import Iterator
 
 from bk_monitor_base.strategy import get_metric_id
 from django.conf import settings
@@ -69,16 +70,18 @@ class Item(DetectMixin, CheckMixin, DoubleCheckMixin):
             lambda: "and",
             {detect["level"]: detect["connector"] or "and" for detect in strategy.config.get("detects", [])},
         )
-        self.query_configs = item_config.get("query_configs", [])
         self.no_data_config = item_config.get("no_data_config", {})
         self.target = item_config.get("target", [[]])
+        # 策略详情可能来自进程内共享缓存，复制后再补充监控目标，使用方可以修改当前监控项的查询配置
+        self.query_configs = [
+            {**query_config, "target": self.target} for query_config in item_config.get("query_configs", [])
+        ]
 
         self.item_config = item_config
         self.strategy: Strategy = strategy
         self.bk_tenant_id: str = self.strategy.bk_tenant_id
 
         for query_config in self.query_configs:
-            query_config["target"] = self.target
             self.data_source_labels.add(query_config["data_source_label"])
             self.data_type_labels.add(query_config["data_type_label"])
             self.data_source_types.add((query_config["data_source_label"], query_config["data_type_label"]))
@@ -114,6 +117,20 @@ class Item(DetectMixin, CheckMixin, DoubleCheckMixin):
             record["_time_"] //= 1000
         return records
 
+    def query_record_chunks(self, start_time: int, end_time: int, chunk_size: int) -> Iterator[list]:
+        """
+        按 series 分块查询数据，每块至少包含 chunk_size 个数据点
+        查询在调用时立即执行，数据点在迭代时按块展开
+        """
+        chunks = self.query.query_data_chunks(start_time * 1000, end_time * 1000, chunk_size=chunk_size)
+        return (self._convert_record_time(records) for records in chunks)
+
+    @staticmethod
+    def _convert_record_time(records: list) -> list:
+        for record in records:
+            record["_time_"] //= 1000
+        return records
+
     @cached_property
     def target_condition_obj(self):
         if not self.target or not self.target[0]:
@@ -25,7 +25,7 @@ from alarm_backends.constants import (
 from alarm_backends.core.cache import key
 from alarm_backends.core.cache.cmdb.host import HostManager
 from alarm_backends.core.detect_result import ANOMALY_LABEL, CheckResult
-from bkmonitor.utils.common_utils import count_md5
+from bkmonitor.utils.common_utils import chunks, count_md5, dimension_fingerprint
 from bkmonitor.utils.tenant import bk_biz_id_to_bk_tenant_id
 
 logger = logging.getLogger("core.control")
@@ -38,6 +38,9 @@ logger = logging.getLogger("core.control")
 # 同时设置上限避免极端小周期（如 ≤5s）一次性写入过多 tag。
 NODATA_TAG_FILL_LIMIT = 6
 
+# 批量获取最后上报点及批量恢复时，单次请求的维度数量
+NODATA_CHECKPOINT_BATCH_SIZE = 5000
+
 
 class CheckMixin:
     @property
@@ -97,29 +100,23 @@ class CheckMixin:
 
         else:
             # 4.2 有历史维度范围 或者 当前上报数据不为空，尝试恢复整体维度告警（有则恢复）
-            self.recover(total_no_data_md5[0])
+            recover_dimensions_md5 = [total_no_data_md5[0]]
 
             # 5. 生成异常记录，生成规则：1）当前监测点无数据 or 2）当前监测点有数据，但是数据上报时间晚于 last_check_point
             anomaly_data = []
-            target_dimensions_md5 = []
-            last_check_cache_key = key.LAST_CHECKPOINTS_CACHE_KEY.get_key(strategy_id=self.strategy.id, item_id=self.id)
-            for target_inst_dms in target_instance_dimensions:
-                target_dms_md5 = count_md5(target_inst_dms)
-                target_dimensions_md5.append(target_dms_md5)
-                # 之前检测的数据最后上报点
-                last_checkpoint_cache_field = key.LAST_CHECKPOINTS_CACHE_KEY.get_field(
-                    dimensions_md5=target_dms_md5,
-                    level=self.no_data_level,
-                )
-                last_point = key.LAST_CHECKPOINTS_CACHE_KEY.client.hget(
-                    last_check_cache_key, last_checkpoint_cache_field
-                )
+            target_dimensions_md5 = [
+                dimension_fingerprint(target_inst_dms) for target_inst_dms in target_instance_dimensions
+            ]
+            # 批量获取之前检测的数据最后上报点
+            last_points = self._get_last_checkpoints(target_dimensions_md5)
+            for target_inst_dms, target_dms_md5 in zip(target_instance_dimensions, target_dimensions_md5):
+                last_point = last_points.get(target_dms_md5)
                 if target_dms_md5 not in dimensions_md5_timestamp or (
                     last_point and dimensions_md5_timestamp[target_dms_md5] < int(last_point)
                 ):
                     # 如果存在主机维度，判断其是否存在于业务中
                     if not self._is_host_dimension_in_business(target_inst_dms):
-                        self.recover(target_dms_md5)
+                        recover_dimensions_md5.append(target_dms_md5)
                         continue
 
                     anomaly_data.append(self._produce_anomaly_info(check_timestamp, target_inst_dms, target_dms_md5))
@@ -130,7 +127,9 @@ class CheckMixin:
                     )
                 else:
                     # recovery 历史告警事件
-                    self.recover(target_dms_md5)
+                    recover_dimensions_md5.append(target_dms_md5)
+
+            self.recover_many(recover_dimensions_md5)
 
             # 6. 如果有不存在的目标实例，生成异常记录
             for missing_target_inst in missing_target_instances:
@@ -175,7 +174,7 @@ class CheckMixin:
                     dimensions.pop(k)
 
             dimensions.update({NO_DATA_TAG_DIMENSION: True})
-            dimensions_md5 = count_md5(dimensions)
+            dimensions_md5 = dimension_fingerprint(dimensions)
             if dimensions_md5 not in dimensions_md5_timestamp:
                 data_dimensions.append(dimensions)
                 data_dimensions_mds.append(dimensions_md5)
@@ -370,6 +369,44 @@ class CheckMixin:
         )
         CheckResult.expire_last_checkpoint_cache(strategy_id=self.strategy.id, item_id=self.id)
 
+    def _get_last_checkpoints(self, dimensions_md5_list: list[str]) -> dict[str, str]:
+        """
+        批量获取维度的最后上报点
+        :param dimensions_md5_list: 维度 md5 列表
+        :return: {dimensions_md5: last_point}
+        """
+        if not dimensions_md5_list:
+            return {}
+
+        last_check_cache_key = key.LAST_CHECKPOINTS_CACHE_KEY.get_key(strategy_id=self.strategy.id, item_id=self.id)
+        md5_chunks = list(chunks(dimensions_md5_list, NODATA_CHECKPOINT_BATCH_SIZE))
+        pipeline = key.LAST_CHECKPOINTS_CACHE_KEY.client.pipeline()
+        for md5_chunk in md5_chunks:
+            fields = [
+                key.LAST_CHECKPOINTS_CACHE_KEY.get_field(dimensions_md5=dimensions_md5, level=self.no_data_level)
+                for dimensions_md5 in md5_chunk
+            ]
+            pipeline.hmget(last_check_cache_key, fields)
+
+        last_points = {}
+        for md5_chunk, values in zip(md5_chunks, pipeline.execute()):
+            last_points.update(zip(md5_chunk, values))
+        return last_points
+
+    def recover_many(self, dimensions_md5_list: list[str]):
+        """
+        批量恢复无数据异常记录
+        """
+        cache_key = key.NO_DATA_LAST_ANOMALY_CHECKPOINTS_CACHE_KEY.get_key()
+        for md5_chunk in chunks(dimensions_md5_list, NODATA_CHECKPOINT_BATCH_SIZE):
+            fields = [
+                key.NO_DATA_LAST_ANOMALY_CHECKPOINTS_CACHE_KEY.get_field(
+                    strategy_id=self.strategy.id, item_id=self.id, dimensions_md5=dimensions_md5
+                )
+                for dimensions_md5 in md5_chunk
+            ]
+            key.NO_DATA_LAST_ANOMALY_CHECKPOINTS_CACHE_KEY.client.hdel(cache_key, *fields)
+
     def recover(self, dimensions_md5):
         key.NO_DATA_LAST_ANOMALY_CHECKPOINTS_CACHE_KEY.client.hdel(
             key.NO_DATA_LAST_ANOMALY_CHECKPOINTS_CACHE_KEY.get_key(),
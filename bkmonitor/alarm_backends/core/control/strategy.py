@@ -13,6 +13,7 @@ import logging
 from datetime import datetime
 
 import arrow
+from django.conf import settings
 from django.utils.functional import cached_property
 from django.utils.translation import gettext as _
 
@@ -38,7 +39,10 @@ class Strategy:
     @property
     def config(self) -> dict:
         if self._config is None:
-            self._config = StrategyCacheManager.get_strategy_by_id(self.strategy_id) or {}
+            if settings.STRATEGY_LOCAL_CACHE_ENABLED:
+                self._config = StrategyCacheManager.get_strategy_by_id_from_local(self.strategy_id) or {}
+            else:
+                self._config = StrategyCacheManager.get_strategy_by_id(self.strategy_id) or {}
         return self._config
 
     @property
@@ -8,7 +8,12 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
+import hashlib
 import logging
+import time
+
+from django.conf import settings
+from redis.exceptions import NoScriptError
 
 from alarm_backends.constants import LATEST_NO_DATA_CHECK_POINT
 from alarm_backends.core.cache import key
@@ -18,6 +23,7 @@ from alarm_backends.core.cache.key import (
 )
 from alarm_backends.core.control.item import detect_result_point_required
 from alarm_backends.core.control.strategy import StrategyCacheManager
+from alarm_backends.core.storage.redis_cluster import get_node_by_strategy_id
 
 DUMMY_DIMENSIONS_MD5 = "dummy_dimensions_md5"
 CLEAN_EXPIRED_ARROW_REPLACE_TIME = {"hours": -5}
@@ -25,76 +31,184 @@ CLEAN_EXPIRED_ARROW_REPLACE_TIME = {"hours": -5}
 logger = logging.getLogger("core.detect_result")
 
 
+# 按最后检测时间点 hash 分批清理检测结果，python 侧 HSCAN 取得一批维度后，由脚本在服务端完成裁剪、判空与删除
+# 脚本访问的 key 全部通过 KEYS 传入，检测结果 key 与最后检测时间点 hash 由同一个策略ID路由，位于同一个 redis 节点
+# KEYS[1]: 最后检测时间点 hash, KEYS[2..n]: 各维度的检测结果 key
+# ARGV[1]: 保留点数, ARGV[2]: 无数据检测点维度, ARGV[3..n]: 与检测结果 key 一一对应的 hash field 及维度
+# 返回: 删除维度数
+CLEAN_DETECT_RESULT_SCRIPT = """
+if redis.replicate_commands then
+    redis.replicate_commands()
+end
+local stop = -tonumber(ARGV[1])
+local deleted = 0
+for i = 2, #KEYS do
+    local field = ARGV[2 * i - 1]
+    local dimensions_md5 = ARGV[2 * i]
+    redis.call("ZREMRANGEBYRANK", KEYS[i], 0, stop)
+    if dimensions_md5 ~= ARGV[2] and redis.call("ZCARD", KEYS[i]) == 0 then
+        redis.call("HDEL", KEYS[1], field)
+        deleted = deleted + 1
+    end
+end
+return deleted
+"""
+CLEAN_DETECT_RESULT_SCRIPT_SHA = hashlib.sha1(CLEAN_DETECT_RESULT_SCRIPT.encode("utf-8")).hexdigest()
+
+
+class CleanRateLimiter:
+    """
+    按每秒扫描维度数量限速，避免清理任务占满 redis CPU
+    """
+
+    def __init__(self, max_per_second: int):
+        self.max_per_second = max_per_second
+        self.start_time = time.time()
+        self.count = 0
+
+    def acquire(self, count: int):
+        if self.max_per_second <= 0:
+            return
+
+        self.count += count
+        wait = self.count / self.max_per_second - (time.time() - self.start_time)
+        if wait > 0:
+            time.sleep(wait)
+
+
 class CleanResult:
     @staticmethod
     def clean_expired_detect_result(strategy_range=None):
         """
         清理检测结果及最近拉取结果的缓存
+        按策略ID顺序处理并记录进度，任务重试时从上次完成的策略之后继续
         """
         strategy_ids = StrategyCacheManager.get_strategy_ids()
         # 分片处理
         if strategy_range is not None:
             strategy_ids = [s_id for s_id in strategy_ids if s_id in range(*strategy_range)]
 
+        progress_key = key.DETECT_RESULT_CLEAN_PROGRESS_KEY.get_key(
+            strategy_range="-".join(str(i) for i in strategy_range) if strategy_range else "all"
+        )
+        progress_client = key.DETECT_RESULT_CLEAN_PROGRESS_KEY.client
+        last_strategy_id = progress_client.get(progress_key)
+        if last_strategy_id:
+            strategy_ids = [s_id for s_id in strategy_ids if s_id > int(last_strategy_id)]
+        strategy_ids.sort()
+
         strategies = StrategyCacheManager.get_strategy_by_ids(strategy_ids)
+        strategies.sort(key=lambda s: s["id"])
 
-        client = key.LAST_CHECKPOINTS_CACHE_KEY.client
-        pipeline = client.pipeline()
+        rate_limiter = CleanRateLimiter(settings.DETECT_RESULT_CLEAN_MAX_FIELDS_PER_SECOND)
         for strategy in strategies:
             # 按照策略的检测与恢复周期配置，决定保留多少个周期的检测结果
             point_remain = detect_result_point_required(strategy)
 
             for item in strategy["items"]:
-                # 获取监控项下所有的维度与级别组合
-                last_checkpoints_cache_key = key.LAST_CHECKPOINTS_CACHE_KEY.get_key(
-                    strategy_id=strategy["id"], item_id=item["id"]
-                )
-                all_hkeys = client.hkeys(last_checkpoints_cache_key)
-                if not all_hkeys:
-                    continue
+                if settings.DETECT_RESULT_CLEAN_SCRIPT_ENABLED:
+                    CleanResult.clean_item_detect_result_by_script(
+                        strategy["id"], item["id"], point_remain, rate_limiter
+                    )
+                else:
+                    CleanResult.clean_item_detect_result(strategy["id"], item["id"], point_remain)
+
+            progress_client.set(progress_key, strategy["id"], ex=key.DETECT_RESULT_CLEAN_PROGRESS_KEY.ttl)
 
-                # 计算所有的检测结果缓存key
-                check_result_cache_keys = []
-                for index, hkey in enumerate(all_hkeys):
-                    *_, dimension_md5, level = hkey.split(".")
-                    check_result_cache_keys.append(
-                        key.CHECK_RESULT_CACHE_KEY.get_key(
-                            strategy_id=strategy["id"], item_id=item["id"], dimensions_md5=dimension_md5, level=level
-                        )
+        progress_client.delete(progress_key)
+
+    @staticmethod
+    def clean_item_detect_result_by_script(strategy_id, item_id, point_remain, rate_limiter: CleanRateLimiter):
+        """
+        使用 lua 脚本在 redis 服务端分批清理监控项的检测结果
+        """
+        last_checkpoints_cache_key = key.LAST_CHECKPOINTS_CACHE_KEY.get_key(strategy_id=strategy_id, item_id=item_id)
+        # 脚本需要在策略所在的节点上执行，代理默认按第一个参数路由，这里直接获取节点客户端
+        proxy = key.LAST_CHECKPOINTS_CACHE_KEY.client
+        client = proxy.get_client(get_node_by_strategy_id(strategy_id))
+
+        cursor = 0
+        while True:
+            cursor, fields = client.hscan(
+                last_checkpoints_cache_key, cursor=cursor, count=settings.DETECT_RESULT_CLEAN_SCAN_COUNT
+            )
+            keys = [last_checkpoints_cache_key]
+            args = [point_remain, LATEST_NO_DATA_CHECK_POINT]
+            for field in fields:
+                *_, dimensions_md5, level = field.split(".")
+                keys.append(
+                    key.CHECK_RESULT_CACHE_KEY.get_key(
+                        strategy_id=strategy_id, item_id=item_id, dimensions_md5=dimensions_md5, level=level
                     )
+                )
+                args.extend([field, dimensions_md5])
+
+            if len(keys) > 1:
+                try:
+                    client.evalsha(CLEAN_DETECT_RESULT_SCRIPT_SHA, len(keys), *keys, *args)
+                except NoScriptError:
+                    client.eval(CLEAN_DETECT_RESULT_SCRIPT, len(keys), *keys, *args)
+
+            rate_limiter.acquire(len(fields))
+            if int(cursor) == 0:
+                break
 
-                # 按保留点数清理检测结果缓存
-                for index, check_result_cache_key in enumerate(check_result_cache_keys):
-                    pipeline.zremrangebyrank(check_result_cache_key, 0, -point_remain)
-                    # 一次最多清理5000个维度的检测结果
-                    if index % 5000 == 4999:
-                        pipeline.execute()
+    @staticmethod
+    def clean_item_detect_result(strategy_id, item_id, point_remain):
+        """
+        在 python 侧通过 pipeline 清理监控项的检测结果，用于不支持 lua 脚本的 redis
+        """
+        client = key.LAST_CHECKPOINTS_CACHE_KEY.client
+        pipeline = client.pipeline()
+
+        # 获取监控项下所有的维度与级别组合
+        last_checkpoints_cache_key = key.LAST_CHECKPOINTS_CACHE_KEY.get_key(strategy_id=strategy_id, item_id=item_id)
+        all_hkeys = client.hkeys(last_checkpoints_cache_key)
+        if not all_hkeys:
+            return
+
+        # 计算所有的检测结果缓存key
+        check_result_cache_keys = []
+        for index, hkey in enumerate(all_hkeys):
+            *_, dimension_md5, level = hkey.split(".")
+            check_result_cache_keys.append(
+                key.CHECK_RESULT_CACHE_KEY.get_key(
+                    strategy_id=strategy_id, item_id=item_id, dimensions_md5=dimension_md5, level=level
+                )
+            )
+
+        # 按保留点数清理检测结果缓存
+        for index, check_result_cache_key in enumerate(check_result_cache_keys):
+            pipeline.zremrangebyrank(check_result_cache_key, 0, -point_remain)
+            # 一次最多清理5000个维度的检测结果
+            if index % 5000 == 4999:
                 pipeline.execute()
+        pipeline.execute()
 
-                # 批量获取检测结果缓存是否被清理
-                check_result_lengths = []
-                for index, check_result_cache_key in enumerate(check_result_cache_keys):
-                    pipeline.zcard(check_result_cache_key)
-                    if index % 5000 == 4999:
-                        check_result_lengths.extend(pipeline.execute())
+        # 批量获取检测结果缓存是否被清理
+        check_result_lengths = []
+        for index, check_result_cache_key in enumerate(check_result_cache_keys):
+            pipeline.zcard(check_result_cache_key)
+            if index % 5000 == 4999:
                 check_result_lengths.extend(pipeline.execute())
+        check_result_lengths.extend(pipeline.execute())
 
-                # 如果检测结果缓存被清理，同步清理last checkpoint
-                index = 0
-                for check_result_cache_key, check_result_length in zip(check_result_cache_keys, check_result_lengths):
-                    if check_result_length > 0:
-                        continue
-                    *_, dimension_md5, level = check_result_cache_key.split(".")
-                    if dimension_md5 == LATEST_NO_DATA_CHECK_POINT:
-                        continue
-                    last_checkpoints_cache_field = key.LAST_CHECKPOINTS_CACHE_KEY.get_field(
-                        dimensions_md5=dimension_md5, level=level
-                    )
-                    pipeline.hdel(last_checkpoints_cache_key, last_checkpoints_cache_field)
-                    if index % 5000 == 4999:
-                        pipeline.execute()
-                    index += 1
+        # 如果检测结果缓存被清理，同步清理last checkpoint
+        index = 0
+        for check_result_cache_key, check_result_length in zip(check_result_cache_keys, check_result_lengths):
+            if check_result_length > 0:
+                continue
+            *_, dimension_md5, level = check_result_cache_key.split(".")
+            if dimension_md5 == LATEST_NO_DATA_CHECK_POINT:
+                continue
+            last_checkpoints_cache_field = key.LAST_CHECKPOINTS_CACHE_KEY.get_field(
+                dimensions_md5=dimension_md5, level=level
+            )
+            pipeline.hdel(last_checkpoints_cache_key, last_checkpoints_cache_field)
+            if index % 5000 == 4999:
                 pipeline.execute()
+            index += 1
+        pipeline.execute()
 
     @staticmethod
     def clean_md5_to_dimension_cache():
@@ -8,9 +8,20 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
 from alarm_backends.core.cluster import get_cluster
 from alarm_backends.core.storage.redis import CACHE_BACKEND_CONF_MAP, Cache
 from bkmonitor.models import CacheNode, CacheRouter
+from core.prometheus import metrics
+
+logger = logging.getLogger("core.storage")
 
 
 class RedisNode(object):
@@ -116,6 +127,20 @@ class RedisProxy(KeyRouterMixin):
             self._pipeline = PipelineProxy(self, *args, **kwargs)
         return self._pipeline
 
+    @contextmanager
+    def batch(self, max_size=None, max_delay=None):
+        """
+        自动批量模式，上下文内的命令不会立即执行，而是按物理节点合并后统一提交
+        with client.batch() as batch:
+            result = batch.lpush(key, value)
+        # 退出上下文后，result.get() 返回命令结果
+        """
+        batch = BatchPipelineProxy(self, max_size=max_size, max_delay=max_delay)
+        try:
+            yield batch
+        finally:
+            batch.flush()
+
     def get_client(self, node):
         if node.id not in self._client_pool:
             self._client_pool[node.id] = setup_client(node, self.backend)
@@ -160,10 +185,26 @@ class PipelineProxy(KeyRouterMixin):
         return self._pipeline_pool[node.id]
 
     def execute(self):
+        return self.execute_node_pipelines()
+
+    def execute_node_pipelines(self, raise_on_error=True):
+        """
+        逐个节点提交 pipeline，并按命令下发顺序返回结果，同时记录各节点的往返耗时及批量大小
+        """
         p_result = {}
         result = []
         for node_id, pipeline_instance in self._pipeline_pool.items():
-            p_result[node_id] = list(reversed(getattr(pipeline_instance, "execute")()))
+            batch_size = len(pipeline_instance)
+            start_time = time.time()
+            if raise_on_error:
+                node_result = pipeline_instance.execute()
+            else:
+                node_result = pipeline_instance.execute(raise_on_error=False)
+            p_result[node_id] = list(reversed(node_result))
+            if batch_size:
+                labels = {"backend": self.node_proxy.backend, "node_id": node_id}
+                metrics.REDIS_PIPELINE_ROUND_TRIP_TIME.labels(**labels).observe(time.time() - start_time)
+                metrics.REDIS_PIPELINE_BATCH_SIZE.labels(**labels).observe(batch_size)
         for cmd in self.command_stack:
             resp = p_result[cmd].pop() if p_result[cmd] else None
             result.append(resp)
@@ -187,6 +228,119 @@ class PipelineProxy(KeyRouterMixin):
         return handle
 
 
+class BatchCommandResult:
+    """
+    批量模式下的命令结果，所在批次提交后可用
+    """
+
+    __slots__ = ("batch", "value", "done")
+
+    def __init__(self, batch):
+        self.batch = batch
+        self.value = None
+        self.done = False
+
+    def get(self):
+        if not self.done:
+            self.batch.flush()
+        if isinstance(self.value, Exception):
+            raise self.value
+        return self.value
+
+
+class BatchPipelineProxy(PipelineProxy):
+    """
+    自动批量提交的 pipeline
+
+    不同策略的命令按策略路由到物理节点，同一节点的命令合并到同一个 pipeline 中。
+    累计命令数达到 max_size、距首条命令超过 max_delay 秒、读取未提交的结果或退出上下文时统一提交，每个节点一次往返。
+    单条命令执行失败不影响同批次的其他命令，错误在读取该命令结果时抛出。
+    """
+
+    def __init__(self, node_proxy, max_size=None, max_delay=None):
+        super().__init__(node_proxy, transaction=False)
+        self.max_size = max_size or settings.REDIS_PIPELINE_BATCH_MAX_SIZE
+        self.max_delay = settings.REDIS_PIPELINE_BATCH_MAX_DELAY if max_delay is None else max_delay
+        self.pending = []
+        self.callbacks = []
+        self.first_command_time = None
+        self.lock = threading.RLock()
+
+    def add_callback(self, callback):
+        """
+        注册批次提交后的回调，用于处理依赖命令结果的逻辑
+        """
+        with self.lock:
+            self.callbacks.append(callback)
+
+    def execute(self):
+        return self.flush()
+
+    def flush(self):
+        """
+        提交当前批次，返回批次内各命令的结果
+        提交过程中出现连接异常时，本批次所有命令的结果均为该异常，异常在回调执行后抛出
+        """
+        error = None
+        with self.lock:
+            pending, self.pending = self.pending, []
+            callbacks, self.callbacks = self.callbacks, []
+            self.first_command_time = None
+            try:
+                results = self.execute_node_pipelines(raise_on_error=False) if self.command_stack else []
+            except Exception as e:  # noqa
+                error = e
+                results = [e] * len(pending)
+            finally:
+                # 无论是否提交成功都需要清空命令，避免复用时结果错位
+                self.command_stack = []
+                for pipeline_instance in self._pipeline_pool.values():
+                    pipeline_instance.reset()
+
+        failed_count = 0
+        for command_result, value in zip(pending, results):
+            command_result.value = value
+            command_result.done = True
+            if isinstance(value, Exception):
+                failed_count += 1
+        if failed_count and error is None:
+            logger.warning(
+                "[redis batch] %s/%s commands failed, first error: %s",
+                failed_count,
+                len(pending),
+                next(value for value in results if isinstance(value, Exception)),
+            )
+
+        for callback in callbacks:
+            callback()
+        if error is not None:
+            raise error
+        return results
+
+    def __getattr__(self, name):
+        def handle(*args, **kwargs):
+            key = self.key_from_command(*args, **kwargs)
+            cache_node = get_node_by_strategy_id(self.strategy_id_from_key(key))
+
+            with self.lock:
+                getattr(self.pipeline_instance(cache_node), name)(*args, **kwargs)
+                self.command_stack.append(cache_node.id)
+                command_result = BatchCommandResult(self)
+                self.pending.append(command_result)
+
+                if self.first_command_time is None:
+                    self.first_command_time = time.time()
+                need_flush = (
+                    len(self.command_stack) >= self.max_size or time.time() - self.first_command_time >= self.max_delay
+                )
+
+            if need_flush:
+                self.flush()
+            return command_result
+
+        return handle
+
+
 STRATEGY_ROUTER_CACHE = None
 STRATEGY_NODE_MAP = {}
 DEFAULT_NODE = None
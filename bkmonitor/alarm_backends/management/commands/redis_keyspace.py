@@ -0,0 +1,48 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from django.core.management.base import BaseCommand
+
+from alarm_backends.service.selfmonitor.collect.redis_keyspace import (
+    RedisKeyspaceProfiler,
+)
+
+
+class Command(BaseCommand):
+    help = "分析告警缓存 redis 各 key 族的 key 数量、内存占用、TTL 分布及 key 数量最多的策略"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sample-ratio", type=float, help="获取内存占用及 TTL 的 key 抽样比例")
+        parser.add_argument("--max-keys", type=int, help="单个 db 最多扫描的 key 数量")
+        parser.add_argument("--top", type=int, default=5, help="展示 key 数量最多的策略个数")
+
+    def handle(self, *args, **options):
+        profiler = RedisKeyspaceProfiler(
+            sample_ratio=options.get("sample_ratio"),
+            max_scan_keys=options.get("max_keys"),
+            top_n=options["top"],
+        )
+        print(f"profile redis keyspace, sample ratio({profiler.sample_ratio}), max keys({profiler.max_scan_keys})")
+        result = profiler.profile()
+        for node, db_stats in result.items():
+            for db, family_stats in db_stats.items():
+                print(f"\nnode({node}) db({db})")
+                print(f"{'family':<48}{'keys':>12}{'memory(MB)':>14}  ttl distribution / top strategies")
+                for family_name, stats in sorted(family_stats.items(), key=lambda item: item[1].count, reverse=True):
+                    ttl_distribution = ", ".join(
+                        f"{ttl_range}:{count}" for ttl_range, count in sorted(stats.get_ttl_distribution().items())
+                    )
+                    strategies = ", ".join(
+                        f"{strategy_id}:{count}" for strategy_id, count in stats.strategies.most_common(profiler.top_n)
+                    )
+                    print(
+                        f"{family_name:<48}{stats.count:>12}{stats.memory / 1024 / 1024:>14.2f}"
+                        f"  [{ttl_distribution}] [{strategies}]"
+                    )
@@ -53,6 +53,12 @@ class Filterer(object):
 #           Base Fuller            #
 ####################################
 class Fuller(object):
+    def prefetch(self, records):
+        """
+        Prefetch what full() needs for a batch of records, (default: do nothing)
+        """
+        pass
+
     def full(self, record):
         """
         Supplement some dimension information.
@@ -73,6 +79,10 @@ class Fullerer(object):
         if f in self.fullers:
             self.fullers.remove(f)
 
+    def prefetch(self, records):
+        for f in self.fullers:
+            f.prefetch(records)
+
     def full(self, record):
         for f in self.fullers:
             f.full(record)
@@ -158,6 +168,9 @@ class BaseAccessProcess(Filterer, Fullerer):
         raise NotImplementedError("push must be implemented " "by BaseAccessProcess subclasses")
 
     def handle(self):
+        # 批量预取维度补充所需的数据
+        self.prefetch(self.record_list)
+
         record_list = []
         for r in self.record_list:
             # 补充维度：比如：业务、集群、模块等信息
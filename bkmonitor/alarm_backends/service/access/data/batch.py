@@ -0,0 +1,79 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import base64
+import gzip
+import json
+from collections.abc import Iterator
+
+# 单个数据帧包含的数据点数量
+FRAME_SIZE = 5000
+
+# 逐点变化的字段，按列存储，其余字段作为维度字典共享
+COLUMN_FIELDS = ("_time_", "time", "_result_")
+
+
+def encode_frame(points: list[dict]) -> bytes:
+    """
+    将数据点编码为列式数据帧
+
+    帧结构：
+    - dimensions: 去重后的维度字典
+    - index: 每个数据点对应的维度字典下标
+    - columns: 逐点变化的字段，如时间和值
+
+    同一 series 的多个时间点共享一份维度，相比逐点序列化大幅减少数据量。
+    redis 客户端开启了 decode_responses，因此压缩后仍需 base64 编码。
+    """
+    columns = [field for field in COLUMN_FIELDS if all(field in point for point in points)]
+
+    dimensions = []
+    dimension_index = {}
+    index = []
+    for point in points:
+        dimension = {k: v for k, v in point.items() if k not in columns}
+        try:
+            dimension_key = tuple(dimension.items())
+            hash(dimension_key)
+        except TypeError:
+            dimension_key = json.dumps(dimension)
+
+        if dimension_key not in dimension_index:
+            dimension_index[dimension_key] = len(dimensions)
+            dimensions.append(dimension)
+        index.append(dimension_index[dimension_key])
+
+    frame = {
+        "dimensions": dimensions,
+        "index": index,
+        "columns": {field: [point[field] for point in points] for field in columns},
+    }
+    return base64.b64encode(gzip.compress(json.dumps(frame, separators=(",", ":")).encode("utf-8")))
+
+
+def encode_frames(points: list[dict], frame_size: int = FRAME_SIZE) -> list[bytes]:
+    """
+    将数据点按 frame_size 拆分并编码为多个数据帧
+    """
+    return [encode_frame(points[i : i + frame_size]) for i in range(0, len(points), frame_size)]
+
+
+def decode_frame(data: str | bytes) -> Iterator[dict]:
+    """
+    解码列式数据帧，逐个返回数据点
+    """
+    frame = json.loads(gzip.decompress(base64.b64decode(data)).decode("utf-8"))
+    dimensions = frame["dimensions"]
+    columns = list(frame["columns"].items())
+    for position, dimension_index in enumerate(frame["index"]):
+        point = dict(dimensions[dimension_index])
+        for field, values in columns:
+            point[field] = values[position]
+        yield point
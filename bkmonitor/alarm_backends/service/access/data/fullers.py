@@ -8,15 +8,34 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
+from collections import defaultdict
+from collections.abc import Callable
 from itertools import chain
 
+from django.conf import settings
+
 from alarm_backends.core.cache.cmdb import HostManager, ServiceInstanceManager
+from alarm_backends.core.cache.cmdb.base import LocalTTLCache
 from alarm_backends.service.access.base import Fuller
 from alarm_backends.service.access.data.records import DataRecord
+from api.cmdb.define import Host, ServiceInstance
+from bkmonitor.utils.common_utils import chunks
 from constants.data_source import DataSourceLabel, DataTypeLabel
 
+# 进程内缓存的主机及服务实例，key 为 (租户ID, 主机key/主机ID/服务实例ID)
+HOST_LOCAL_CACHE = LocalTTLCache(max_size=settings.ACCESS_CMDB_LOCAL_CACHE_MAX_SIZE)
+SERVICE_INSTANCE_LOCAL_CACHE = LocalTTLCache(max_size=settings.ACCESS_CMDB_LOCAL_CACHE_MAX_SIZE)
+
+# 单次 HMGET 的字段数量
+PREFETCH_CHUNK_SIZE = 1000
+
 
 class TopoNodeFuller(Fuller):
+    def __init__(self):
+        # 当前批次预取的主机及服务实例
+        self.hosts: dict[tuple[str, str], Host | None] = {}
+        self.service_instances: dict[tuple[str, str], ServiceInstance | None] = {}
+
     @classmethod
     def is_service_target(cls, scenario):
         """
@@ -31,6 +50,115 @@ class TopoNodeFuller(Fuller):
         """
         return scenario in ("os", "host_process")
 
+    @staticmethod
+    def resolve(
+        local_cache: LocalTTLCache,
+        result: dict[tuple[str, str], object],
+        fields_by_tenant: dict[str, set[str]],
+        loader: Callable[[str, list[str]], dict],
+    ):
+        """
+        批量解析 CMDB 对象，优先使用进程内缓存，未命中的分批 HMGET 后写回缓存
+        """
+        ttl = settings.ACCESS_CMDB_LOCAL_CACHE_TTL
+        for bk_tenant_id, fields in fields_by_tenant.items():
+            keys = [(bk_tenant_id, field) for field in fields if (bk_tenant_id, field) not in result]
+            if ttl > 0:
+                found, missing = local_cache.get_many(keys, ttl)
+                result.update(found)
+            else:
+                missing = keys
+
+            loaded = {}
+            for sub_keys in chunks(missing, PREFETCH_CHUNK_SIZE):
+                objs = loader(bk_tenant_id, [field for _, field in sub_keys])
+                loaded.update({key: objs.get(key[1]) for key in sub_keys})
+            if ttl > 0 and loaded:
+                local_cache.set_many(loaded)
+            result.update(loaded)
+
+    def prefetch(self, records: list[DataRecord]):
+        """
+        批量预取维度补充所需的主机及服务实例
+        1. 按主机ID及服务实例ID批量获取
+        2. 结合上一步得到的IP及云区域，按主机key批量获取主机
+        预取是尽力而为的，未预取到的数据在补充维度时会单独查询
+        """
+        self.hosts = {}
+        self.service_instances = {}
+
+        host_ids = defaultdict(set)
+        service_instance_ids = defaultdict(set)
+        host_keys = defaultdict(set)
+        for record in records:
+            bk_tenant_id = record.bk_tenant_id
+            dimensions = record.dimensions
+
+            if dimensions.get("bk_host_id"):
+                host_ids[bk_tenant_id].add(str(dimensions["bk_host_id"]))
+
+            for field in ("bk_target_service_instance_id", "service_instance_id", "bk_service_instance_id"):
+                if dimensions.get(field):
+                    service_instance_ids[bk_tenant_id].add(str(dimensions[field]))
+
+            bk_target_ip = dimensions.get("bk_target_ip") or dimensions.get("ip")
+            if bk_target_ip:
+                bk_target_cloud_id = dimensions.get("bk_target_cloud_id", "0") or dimensions.get("bk_cloud_id", "0")
+                host_keys[bk_tenant_id].add(HostManager.get_host_key(bk_target_ip, bk_target_cloud_id))
+                # 自愈事件使用 ip, bk_cloud_id 作为标准字段
+                if "ip" in dimensions and "bk_cloud_id" in dimensions:
+                    host_keys[bk_tenant_id].add(HostManager.get_host_key(dimensions["ip"], dimensions["bk_cloud_id"]))
+
+        if not (host_ids or service_instance_ids or host_keys):
+            return
+
+        self.resolve(
+            HOST_LOCAL_CACHE,
+            self.hosts,
+            host_ids,
+            lambda bk_tenant_id, fields: HostManager.mget(bk_tenant_id=bk_tenant_id, host_keys=fields),
+        )
+        self.resolve(
+            SERVICE_INSTANCE_LOCAL_CACHE,
+            self.service_instances,
+            service_instance_ids,
+            lambda bk_tenant_id, fields: ServiceInstanceManager.mget(
+                bk_tenant_id=bk_tenant_id, service_instance_ids=fields
+            ),
+        )
+
+        # 主机ID及服务实例补全的IP，会继续用于按主机key获取主机
+        for (bk_tenant_id, _), obj in chain(self.hosts.items(), self.service_instances.items()):
+            if obj is not None and getattr(obj, "ip", None):
+                host_keys[bk_tenant_id].add(HostManager.get_host_key(obj.ip, obj.bk_cloud_id))
+
+        self.resolve(
+            HOST_LOCAL_CACHE,
+            self.hosts,
+            host_keys,
+            lambda bk_tenant_id, fields: HostManager.mget(bk_tenant_id=bk_tenant_id, host_keys=fields),
+        )
+
+    def get_host_by_id(self, bk_tenant_id: str, bk_host_id) -> Host | None:
+        key = (bk_tenant_id, str(bk_host_id))
+        if key in self.hosts:
+            return self.hosts[key]
+        return HostManager.get_by_id(bk_tenant_id=bk_tenant_id, bk_host_id=bk_host_id)
+
+    def get_host(self, bk_tenant_id: str, ip: str, bk_cloud_id) -> Host | None:
+        key = (bk_tenant_id, HostManager.get_host_key(ip, bk_cloud_id))
+        if key in self.hosts:
+            return self.hosts[key]
+        return HostManager.get(bk_tenant_id=bk_tenant_id, ip=ip, bk_cloud_id=bk_cloud_id, using_mem=True)
+
+    def get_service_instance(self, bk_tenant_id: str, service_instance_id) -> ServiceInstance | None:
+        key = (bk_tenant_id, str(service_instance_id))
+        if key in self.service_instances:
+            return self.service_instances[key]
+        return ServiceInstanceManager.get(
+            bk_tenant_id=bk_tenant_id, service_instance_id=service_instance_id, using_mem=True
+        )
+
     def full(self, record: DataRecord):
         """
         维度补充(当策略目标是CMDB节点时，需要在数据的维度中补充CMDB节点的信息)
@@ -55,7 +183,7 @@ class TopoNodeFuller(Fuller):
         # 按主机ID补全维度
         bk_host_id = dimensions.get("bk_host_id")
         if bk_host_id:
-            host = HostManager.get_by_id(bk_tenant_id=bk_tenant_id, bk_host_id=bk_host_id)
+            host = self.get_host_by_id(bk_tenant_id, bk_host_id)
             if host:
                 dimensions["bk_target_ip"] = host.ip
                 dimensions["bk_target_cloud_id"] = str(host.bk_cloud_id)
@@ -63,9 +191,7 @@ class TopoNodeFuller(Fuller):
         # 按服务实例补全维度
         service_instance_id = dimensions.get("bk_target_service_instance_id") or dimensions.get("service_instance_id")
         if service_instance_id:
-            service_instance = ServiceInstanceManager.get(
-                bk_tenant_id=bk_tenant_id, service_instance_id=service_instance_id, using_mem=True
-            )
+            service_instance = self.get_service_instance(bk_tenant_id, service_instance_id)
             if service_instance:
                 bk_topo_node = []
                 if service_instance.topo_link:
@@ -81,9 +207,7 @@ class TopoNodeFuller(Fuller):
             return
 
         bk_target_cloud_id = dimensions.get("bk_target_cloud_id", "0") or dimensions.get("bk_cloud_id", "0")
-        host = HostManager.get(
-            bk_tenant_id=bk_tenant_id, ip=bk_target_ip, bk_cloud_id=bk_target_cloud_id, using_mem=True
-        )
+        host = self.get_host(bk_tenant_id, bk_target_ip, bk_target_cloud_id)
         if not host:
             return
 
@@ -17,6 +17,7 @@ import signal
 import threading
 import time
 from collections import defaultdict
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 
 import arrow
@@ -36,9 +37,14 @@ from alarm_backends.core.control.checkpoint import Checkpoint
 from alarm_backends.core.control.item import Item
 from alarm_backends.core.control.strategy import Strategy
 from alarm_backends.core.storage.redis import Cache
-from alarm_backends.core.storage.redis_cluster import get_node_by_strategy_id
+from alarm_backends.core.storage.redis_cluster import (
+    BatchPipelineProxy,
+    RedisProxy,
+    get_node_by_strategy_id,
+)
 from alarm_backends.management.hashring import HashRing
 from alarm_backends.service.access import base
+from alarm_backends.service.access.data import batch
 from alarm_backends.service.access.data.duplicate import Duplicate
 from alarm_backends.service.access.data.filters import (
     ExpireFilter,
@@ -46,13 +52,19 @@ from alarm_backends.service.access.data.filters import (
     RangeFilter,
 )
 from alarm_backends.service.access.data.fullers import TopoNodeFuller
-from alarm_backends.service.access.data.records import DataRecord, calculate_record_id, get_value_from_raw_data
+from alarm_backends.service.access.data.records import (
+    DataRecord,
+    calculate_record_id,
+    encode_record_data,
+    get_value_from_raw_data,
+)
 from alarm_backends.service.access.priority import PriorityChecker
 from alarm_backends.core.circuit_breaking.manager import AccessDataCircuitBreakingManager
-from bkmonitor.utils.common_utils import count_md5, get_local_ip
+from bkmonitor.utils.common_utils import count_md5, dimension_fingerprint, get_local_ip
 from bkmonitor.utils.consul import BKConsul
 from bkmonitor.utils.local import local
 from bkmonitor.utils.thread_backend import InheritParentThread
+from constants.action import NoiseReduceCardinalityMode
 from constants.data_source import DataSourceLabel, DataTypeLabel
 from constants.strategy import MULTI_METRIC_DATA_SOURCES
 from core.drf_resource import api
@@ -167,10 +179,14 @@ class BaseAccessDataProcess(base.BaseAccessProcess):
                 dimension_key: dimensions.get(dimension_key) for dimension_key in noise_reduce_config["dimensions"]
             }
             logger.debug("strategy(%s) noise reduce dimension_value(%s)", item.strategy.strategy_id, dimension_value)
-            dimension_value_hash = count_md5(dimension_value)
+            dimension_value_hash = dimension_fingerprint(dimension_value)
             noise_data[dimension_value_hash] = record.data["time"]
-        client.zadd(record_key, noise_data)
-        client.expire(record_key, key.NOISE_REDUCE_TOTAL_KEY.ttl)
+
+        if noise_reduce_config.get("cardinality_mode") == NoiseReduceCardinalityMode.APPROXIMATE:
+            record_key = self._push_noise_data_hll(item, dimension_hash, noise_data)
+        elif noise_data:
+            client.zadd(record_key, noise_data)
+            client.expire(record_key, key.NOISE_REDUCE_TOTAL_KEY.ttl)
 
         # 非批量任务，记录日志
         if not self.sub_task_id:
@@ -194,40 +210,87 @@ class BaseAccessDataProcess(base.BaseAccessProcess):
                 "count": len(noise_data.keys()),
             }
 
-    def _push(self, item, record_list, output_client=None, data_list_key=None):
+    @staticmethod
+    def _push_noise_data_hll(item, dimension_hash: str, noise_data: dict) -> str:
+        """
+        按数据时间分桶，将维度组合写入 HyperLogLog，单个分桶的内存占用固定，不随维度基数增长
+        :return: 最新分桶的 key，用于日志记录
+        """
+        bucket_size = settings.NOISE_REDUCE_HLL_BUCKET_SIZE
+        bucket_hashes = defaultdict(list)
+        for dimension_value_hash, data_time in noise_data.items():
+            bucket_hashes[int(data_time) // bucket_size].append(dimension_value_hash)
+
+        record_key = ""
+        pipeline = key.NOISE_REDUCE_TOTAL_HLL_KEY.client.pipeline()
+        for bucket, hashes in sorted(bucket_hashes.items()):
+            record_key = key.NOISE_REDUCE_TOTAL_HLL_KEY.get_key(
+                strategy_id=item.strategy.strategy_id, noise_dimension_hash=dimension_hash, bucket=bucket
+            )
+            pipeline.pfadd(record_key, *hashes)
+            pipeline.expire(record_key, key.NOISE_REDUCE_TOTAL_HLL_KEY.ttl)
+        if bucket_hashes:
+            pipeline.execute()
+        return record_key
+
+    def _push(
+        self,
+        item,
+        record_list,
+        output_client=None,
+        data_list_key=None,
+        payloads: dict = None,
+        batch: BatchPipelineProxy = None,
+    ):
         """
         :summary: 推送单个item的数据到检测队列或无数据待检测队列
         :param item
         :param record_list
         :param output_client
         :param data_list_key：数据队列，默认为 key.DATA_LIST_KEY
+        :param payloads: 记录编码结果缓存，同一批次的记录在多个队列间只编码一次
+        :param batch: 跨策略的批量 pipeline，命令在批次提交时执行，队列长度检查延后到批次提交之后
         """
         data_list_key = data_list_key or key.DATA_LIST_KEY
         client = output_client or data_list_key.client
         output_key = data_list_key.get_key(strategy_id=item.strategy.strategy_id, item_id=item.id)
-        queue_length = client.llen(output_key)
-        # 超过最大检测长度10倍(50w)说明detect模块处理能力不足,数据将被丢弃。
-        if queue_length > settings.SQL_MAX_LIMIT * 10:
-            msg = (
-                f"Critical: strategy({item.strategy.strategy_id}), item({item.id})"
-                f"The number of ({output_key}) records to be detected has "
-                f"exceeded {queue_length}/{settings.SQL_MAX_LIMIT * 10}. "
-                f"Please check if the detect process is running normally."
-            )
-            raise Exception(msg)
-
-        pipeline = client.pipeline(transaction=False)
+        max_length = settings.SQL_MAX_LIMIT * 10
+        if payloads is None:
+            payloads = {}
+
+        # 批量 pipeline 需要与目标队列使用同一个 redis 实例
+        if batch is not None and getattr(client, "backend", None) != batch.node_proxy.backend:
+            batch = None
+        pipeline = batch or client.pipeline(transaction=False)
+        # 批量模式下各命令的延迟结果，批次提交后统一检查
+        command_results = []
         _offset = 0
         while _offset < len(record_list):
             chunk_records = record_list[_offset : _offset + 10000]
-            pipeline.lpush(output_key, *[json.dumps(record.data) for record in chunk_records])
+            chunk_payloads = []
+            for record in chunk_records:
+                payload = payloads.get(id(record))
+                if payload is None:
+                    payload = payloads[id(record)] = encode_record_data(record.data)
+                chunk_payloads.append(payload)
+            command_results.append(pipeline.lpush(output_key, *chunk_payloads))
             _offset += 10000
+        # 队列长度由 redis 端截断，超过最大检测长度10倍(50w)时丢弃最旧的数据，无需额外查询队列长度
+        command_results.append(pipeline.ltrim(output_key, 0, max_length - 1))
         # 避免监控周期大于默认key过期时间，引起数据丢失
         agg_interval = min(query_config["agg_interval"] for query_config in item.query_configs)
-        pipeline.expire(output_key, max([data_list_key.ttl, agg_interval * 5]))
-        pipeline.execute()
+        command_results.append(pipeline.expire(output_key, max([data_list_key.ttl, agg_interval * 5])))
         metrics.ACCESS_PROCESS_PUSH_DATA_COUNT.labels(strategy_id=metrics.TOTAL_TAG, type="data").inc(len(record_list))
 
+        if batch is None:
+            self._check_push_results(item, output_key, pipeline.execute(), max_length)
+        else:
+            batch.add_callback(
+                lambda: self._check_push_results(
+                    item, output_key, [command_result.value for command_result in command_results], max_length
+                )
+            )
+
         # 非批量任务，记录日志
         if not self.sub_task_id:
             logger.info(
@@ -242,6 +305,29 @@ class BaseAccessDataProcess(base.BaseAccessProcess):
                 "count": len(record_list),
             }
 
+    @staticmethod
+    def _check_push_results(item, output_key, results, max_length):
+        """
+        检查推送命令的执行结果
+        :param results: 各命令的结果 [lpush..., ltrim, expire]，批量模式下执行失败的命令结果为异常对象
+        """
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("push records to (%s) failed: %s", output_key, result)
+
+        # 最后一次 lpush 返回推送后的队列长度
+        queue_length = results[-3] if len(results) >= 3 else 0
+        if isinstance(queue_length, Exception):
+            return
+        if queue_length > max_length:
+            # 超过最大检测长度说明detect模块处理能力不足,数据将被丢弃。
+            logger.error(
+                f"Critical: strategy({item.strategy.strategy_id}), item({item.id})"
+                f"The number of ({output_key}) records to be detected has "
+                f"exceeded {queue_length}/{max_length}, {queue_length - max_length} oldest records dropped. "
+                f"Please check if the detect process is running normally."
+            )
+
     def push(self, records: list | None = None, output_client=None):
         """
         推送格式化后的数据到 detect 和 nodata 中(按单个策略，单个item项，写入不同的队列)
@@ -268,29 +354,38 @@ class BaseAccessDataProcess(base.BaseAccessProcess):
                     pending_to_push[item_id].append(record)
 
         strategy_ids = set()
-        for item_id, record_list in list(pending_to_push.items()):
-            item = item_id_to_item[item_id]
-            if record_list:
-                strategy_ids.add(item.strategy.id)
+        # 记录编码结果，检测队列及无数据队列共用
+        payloads = {}
+        # 各监控项的推送命令按 redis 节点合并提交，数据处理信号需要在数据全部写入后推送
+        client = output_client or key.DATA_LIST_KEY.client
+        if settings.ACCESS_PUSH_BATCH_ENABLED and isinstance(client, RedisProxy):
+            batch_context = client.batch()
+        else:
+            batch_context = nullcontext()
+        with batch_context as batch:
+            for item_id, record_list in list(pending_to_push.items()):
+                item = item_id_to_item[item_id]
+                if record_list:
+                    strategy_ids.add(item.strategy.id)
 
-                # 推送到检测队列
-                self._push(item, record_list, output_client)
+                    # 推送到检测队列
+                    self._push(item, record_list, output_client, payloads=payloads, batch=batch)
 
-                # 推送降噪基数至redis队列
-                try:
-                    self._push_noise_data(item, record_list)
-                except BaseException as e:
-                    logger.exception("push noise data of strategy(%s) error, %s", item.strategy.id, str(e))
+                    # 推送降噪基数至redis队列
+                    try:
+                        self._push_noise_data(item, record_list)
+                    except BaseException as e:
+                        logger.exception("push noise data of strategy(%s) error, %s", item.strategy.id, str(e))
 
-            logger.info(
-                "strategy_group_key(%s) strategy(%s) item(%s) push records to detect done",
-                item.strategy.strategy_group_key,
-                item.strategy.id,
-                item.id,
-            )
-            # 推送无数据处理
-            if item.no_data_config["is_enabled"]:
-                self._push(item, records, output_client, key.NO_DATA_LIST_KEY)
+                logger.info(
+                    "strategy_group_key(%s) strategy(%s) item(%s) push records to detect done",
+                    item.strategy.strategy_group_key,
+                    item.strategy.id,
+                    item.id,
+                )
+                # 推送无数据处理
+                if item.no_data_config["is_enabled"]:
+                    self._push(item, records, output_client, key.NO_DATA_LIST_KEY, payloads=payloads, batch=batch)
 
         # 推送数据处理信号
         if records:
@@ -392,8 +487,13 @@ class AccessDataProcess(BaseAccessDataProcess):
 
         # 数据查询
         local.strategy_id = ",".join([str(item.strategy.id) for item in self.items])
+        streaming = self.use_streaming_query()
         try:
-            points = self.query_data(now_timestamp)
+            if streaming:
+                points, point_total = self.query_data_streaming(now_timestamp)
+            else:
+                points = self.query_data(now_timestamp)
+                point_total = len(points)
             if getattr(local, "strategy_id", None):
                 delattr(local, "strategy_id")
         except Exception as e:
@@ -401,8 +501,7 @@ class AccessDataProcess(BaseAccessDataProcess):
                 delattr(local, "strategy_id")
             raise e
 
-        # 当点数大于阈值时，将数据拆分为多个批量任务
-        point_total = len(points)
+        # 当点数大于阈值时，将数据拆分为多个批量任务（流式查询时已在查询过程中完成拆分）
         if point_total > (settings.ACCESS_DATA_BATCH_PROCESS_THRESHOLD or 500000):
             # 为分组中的每个策略分别记录指标（修复指标漏报问题）
             # Access 数据拉取基于分组，一个分组可能包含多个策略，且可能使用不同的 Redis 节点
@@ -419,12 +518,97 @@ class AccessDataProcess(BaseAccessDataProcess):
                     strategy_name=item.strategy.name,
                     redis_node=redis_node,
                 ).inc(point_total)
-            if settings.ACCESS_DATA_BATCH_PROCESS_THRESHOLD > 0:
+            if settings.ACCESS_DATA_BATCH_PROCESS_THRESHOLD > 0 and not streaming:
                 points = self.send_batch_data(points, settings.ACCESS_DATA_BATCH_PROCESS_SIZE)
 
         # 过滤重复数据并实例化
         self.filter_duplicates(points)
 
+    def use_streaming_query(self) -> bool:
+        """
+        是否使用流式查询
+
+        流式查询按 series 分块拉取数据，超过分批阈值后逐块下发分批任务，无需先加载全部数据点。
+        计算平台数据源需要基于全量数据判断 localTime，不支持流式查询。
+        """
+        if not settings.ACCESS_DATA_STREAMING_QUERY_ENABLED or settings.ACCESS_DATA_BATCH_PROCESS_THRESHOLD <= 0:
+            return False
+        return DataSourceLabel.BK_DATA not in self.items[0].data_source_labels
+
+    def query_data_streaming(self, now_timestamp: int) -> tuple[list[dict], int]:
+        """
+        流式数据源查询
+
+        数据点总量未超过分批阈值时，与 query_data 一致，返回全部数据点；
+        超过阈值后，已缓存的分块及后续分块逐个作为分批任务下发，只返回第一批数据用于原地处理。
+        :return: (原地处理的数据点, 数据点总数)
+        """
+        first_item = self.items[0]
+
+        # 由于某些数据源需要进行策略分组，因此需要将条件置为空
+        if not (first_item.data_source_types & MULTI_METRIC_DATA_SOURCES):
+            first_item.data_sources[0]._advance_where = []
+
+        try:
+            chunks = first_item.query_record_chunks(
+                self.from_timestamp, self.until_timestamp, settings.ACCESS_DATA_BATCH_PROCESS_SIZE
+            )
+            # 判定is_partial
+            if first_item.query.is_partial:
+                logger.info(
+                    f"strategy_group_key({self.strategy_group_key}) strategy({first_item.strategy.id}) "
+                    f"query records is partial"
+                )
+                if first_item.strategy.id in settings.DOUBLE_CHECK_SUM_STRATEGY_IDS:
+                    logger.warning(f"double_check strategy({first_item.strategy.id}) is partial: skip query results")
+                    return [], 0
+        except BKAPIError as e:
+            logger.error(e)
+            return [], 0
+        except Exception as e:  # noqa
+            logger.exception(f"strategy_group_key({self.strategy_group_key}) query records error, {e}")
+            return [], 0
+
+        buffered_chunks = []
+        first_batch_points = None
+        point_total = batch_count = 0
+        try:
+            for records in chunks:
+                point_total += len(records)
+
+                # 未超过分批阈值前，先缓存分块
+                if point_total <= settings.ACCESS_DATA_BATCH_PROCESS_THRESHOLD:
+                    buffered_chunks.append(records)
+                    continue
+
+                if first_batch_points is None:
+                    # batch_timestamp: 批量处理时间戳，用于生成子任务ID
+                    self.batch_timestamp = int(time.time())
+
+                buffered_chunks.append(records)
+                for batch_points in buffered_chunks:
+                    batch_count += 1
+                    # 第一批数据原地处理，其余批次通过异步任务处理
+                    if first_batch_points is None:
+                        first_batch_points = batch_points
+                    else:
+                        self.dispatch_batch_data(batch_points, batch_count)
+                buffered_chunks = []
+        except Exception as e:  # noqa
+            logger.exception(f"strategy_group_key({self.strategy_group_key}) stream query records error, {e}")
+
+        if first_batch_points is None:
+            return [point for records in buffered_chunks for point in records], point_total
+
+        if batch_count > 1:
+            self.sub_task_id = f"{self.batch_timestamp}.1"
+            self.batch_count = batch_count
+            logger.info(
+                f"strategy_group_key({self.strategy_group_key}), split {point_total} access data into {batch_count} "
+                f"batch tasks while streaming"
+            )
+        return first_batch_points, point_total
+
     def query_data(self, now_timestamp: int) -> list[dict]:
         """
         数据源查询
@@ -567,13 +751,10 @@ class AccessDataProcess(BaseAccessDataProcess):
             - 第一批：Series_1-3846 的完整 T1-T13 数据（50000 条）→ 原地处理
             - 第二批：Series_3847-7692 的完整 T1-T13 数据（50000 条）→ 异步处理
         """
-        from alarm_backends.service.access.tasks import run_access_batch_data
-
         # 初始化批量处理
         # batch_timestamp: 批量处理时间戳，用于生成子任务ID
         self.batch_timestamp = int(time.time())
 
-        client = key.ACCESS_BATCH_DATA_KEY.client
         first_batch_points = []  # 第一批数据，原地处理
         latest_record_timestamp = None  # 上一个记录的时间戳，用于判断是否遇到新时间点
         last_batch_index, batch_count = 0, 0  # last_batch_index: 上一批次的结束位置，batch_count: 批次计数
@@ -611,20 +792,7 @@ class AccessDataProcess(BaseAccessDataProcess):
                 first_batch_points = batch_points
             else:
                 # 其余批次：后续 series 的完整时间范围，通过异步任务处理
-                # 生成子任务ID：格式为 {batch_timestamp}.{batch_count}
-                sub_task_id = f"{self.batch_timestamp}.{batch_count}"
-                data_key = key.ACCESS_BATCH_DATA_KEY.get_key(
-                    strategy_group_key=self.strategy_group_key, sub_task_id=sub_task_id
-                )
-                data_key.strategy_id = self.items[0].strategy.id
-
-                # 数据压缩：使用 gzip + base64 压缩数据，减少 Redis 存储空间
-                compress_batch_points = base64.b64encode(gzip.compress(json.dumps(batch_points).encode("utf-8")))
-                client.set(data_key, compress_batch_points, ex=key.ACCESS_BATCH_DATA_KEY.ttl)
-
-                # 发起异步任务：将批量数据写入 Redis 后，发起异步处理任务
-                # 任务队列：celery_service_batch（批量数据处理任务队列）
-                run_access_batch_data.delay(self.strategy_group_key, sub_task_id)
+                self.dispatch_batch_data(batch_points, batch_count)
 
             # 记录下一轮的起始位置
             last_batch_index = index
@@ -638,6 +806,36 @@ class AccessDataProcess(BaseAccessDataProcess):
 
         return first_batch_points
 
+    def dispatch_batch_data(self, batch_points: list[dict], batch_index: int):
+        """
+        将一批数据写入 Redis，并发起异步任务处理
+        :param batch_points: 批次数据
+        :param batch_index: 批次序号，从 2 开始（第一批原地处理）
+        """
+        from alarm_backends.service.access.tasks import run_access_batch_data
+
+        client = key.ACCESS_BATCH_DATA_KEY.client
+
+        # 生成子任务ID：格式为 {batch_timestamp}.{batch_index}
+        sub_task_id = f"{self.batch_timestamp}.{batch_index}"
+        data_key = key.ACCESS_BATCH_DATA_KEY.get_key(
+            strategy_group_key=self.strategy_group_key, sub_task_id=sub_task_id
+        )
+        data_key.strategy_id = self.items[0].strategy.id
+
+        if settings.ACCESS_BATCH_DATA_COLUMNAR_ENABLED:
+            # 列式数据帧：共享维度字典，按帧写入列表，便于消费端逐帧解码
+            client.rpush(data_key, *batch.encode_frames(batch_points))
+            client.expire(data_key, key.ACCESS_BATCH_DATA_KEY.ttl)
+        else:
+            # 数据压缩：使用 gzip + base64 压缩数据，减少 Redis 存储空间
+            compress_batch_points = base64.b64encode(gzip.compress(json.dumps(batch_points).encode("utf-8")))
+            client.set(data_key, compress_batch_points, ex=key.ACCESS_BATCH_DATA_KEY.ttl)
+
+        # 发起异步任务：将批量数据写入 Redis 后，发起异步处理任务
+        # 任务队列：celery_service_batch（批量数据处理任务队列）
+        run_access_batch_data.delay(self.strategy_group_key, sub_task_id)
+
     def filter_duplicates(self, points: list[dict]):
         """
         过滤重复数据并实例化
@@ -899,6 +1097,8 @@ class AccessDataProcess(BaseAccessDataProcess):
 
         # 优先级检查（复用原有逻辑）
         PriorityChecker.check_records(records)
+        # 记录编码结果，多个 item 的无数据队列共用
+        payloads = {}
         for item in self.items:
             strategy_id = item.strategy.id
             # 创建 DetectProcess 实例，复用成熟的检测逻辑
@@ -936,7 +1136,7 @@ class AccessDataProcess(BaseAccessDataProcess):
             # 推送无数据检测数据（如果启用）
             # 无数据检测需要知道有哪些维度有数据上报，用于判断哪些维度无数据
             if item.no_data_config.get("is_enabled"):
-                self._push(item, records, output_client, key.NO_DATA_LIST_KEY)
+                self._push(item, records, output_client, key.NO_DATA_LIST_KEY, payloads=payloads)
 
             # 推送降噪数据
             if valid_records:
@@ -1278,7 +1478,7 @@ class AccessBatchDataProcess(AccessDataProcess):
 
         流程：
         1. 从 Redis 读取压缩的批量数据
-        2. 解压数据（base64 解码 → gzip 解压 → JSON 解析）
+        2. 解压数据（列式数据帧逐帧弹出并解码；兼容 base64 解码 → gzip 解压 → JSON 解析的旧格式）
         3. 删除 Redis 缓存（避免数据残留）
         4. 调用 filter_duplicates() 去重处理
         """
@@ -1288,12 +1488,19 @@ class AccessBatchDataProcess(AccessDataProcess):
             strategy_group_key=self.strategy_group_key, sub_task_id=self.sub_task_id
         )
         cache_key.strategy_id = self.items[0].strategy.id
-        data = client.get(cache_key)
-        if data:
-            # 解压数据：base64 解码 → gzip 解压 → JSON 解析
-            points = json.loads(gzip.decompress(base64.b64decode(data)).decode("utf-8"))
+        points = []
+        if client.type(cache_key) == "list":
+            # 列式数据帧：逐帧弹出并解码，避免整批数据的多份中间副本同时驻留内存
+            while True:
+                frame = client.lpop(cache_key)
+                if frame is None:
+                    break
+                points.extend(batch.decode_frame(frame))
         else:
-            points = []
+            data = client.get(cache_key)
+            if data:
+                # 解压数据：base64 解码 → gzip 解压 → JSON 解析
+                points = json.loads(gzip.decompress(base64.b64decode(data)).decode("utf-8"))
         # 删除缓存数据（避免数据残留）
         client.delete(cache_key)
         # 去重处理：使用 reversed(points) 从新到旧遍历，优先处理最新数据
@@ -1700,6 +1907,9 @@ class AccessRealTimeDataProcess(BaseAccessDataProcess):
                     except Exception as e:
                         logger.warning("%s loads alarm(%s) failed: %s", record.topic, record.value, e)
 
+                # 批量预取维度补充所需的数据
+                self.prefetch(records)
+
                 record_list = []
                 for r in records:
                     # 补充维度：比如：业务、集群、模块等信息
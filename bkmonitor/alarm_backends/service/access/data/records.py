@@ -8,6 +8,7 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
+import json
 import logging
 import time
 from collections import defaultdict
@@ -18,18 +19,48 @@ from django.utils.functional import cached_property
 
 from alarm_backends import constants
 from alarm_backends.service.access import base
-from bkmonitor.utils.common_utils import count_md5, number_format
+from bkmonitor.utils.common_utils import dimension_fingerprint, number_format
 from constants.strategy import (
     SYSTEM_PROC_PORT_DYNAMIC_DIMENSIONS,
     SYSTEM_PROC_PORT_METRIC_ID,
 )
 
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
 if TYPE_CHECKING:
     from alarm_backends.core.control.item import Item
 
 logger = logging.getLogger("access.data")
 
 
+def encode_record_data(data: dict) -> str:
+    """
+    编码待检测数据，检测队列及无数据队列共用同一份编码结果
+    优先使用 ujson 编码，结果与 json.dumps 兼容，无法编码时回退到 json.dumps
+    """
+    if ujson is not None:
+        try:
+            return ujson.dumps(data, escape_forward_slashes=False)
+        except (OverflowError, TypeError):
+            pass
+    return json.dumps(data)
+
+
+def decode_record_data(payload: str | bytes) -> dict:
+    """
+    解码待检测数据，格式错误时抛出 ValueError
+    """
+    if ujson is not None:
+        try:
+            return ujson.loads(payload)
+        except ValueError:
+            pass
+    return json.loads(payload)
+
+
 def _is_proc_port_value_exist(value) -> bool:
     """
     判断进程端口值是否存在
@@ -77,7 +108,7 @@ def calculate_record_id(raw_data: dict, item: "Item") -> tuple[str, int]:
         }
 
     # 计算 MD5
-    md5_dimension = count_md5(dimensions)
+    md5_dimension = dimension_fingerprint(dimensions)
     record_id = f"{md5_dimension}.{record_time}"
 
     return record_id, record_time
@@ -11,6 +11,7 @@ specific language governing permissions and limitations under the License.
 import logging
 import time
 
+from django.conf import settings
 from django.utils.translation import gettext as _
 from elasticsearch.helpers import BulkIndexError
 
@@ -21,8 +22,10 @@ from alarm_backends.core.cache.assign import AssignCacheManager
 from alarm_backends.core.cache.key import ALERT_UPDATE_LOCK
 from alarm_backends.core.circuit_breaking.manager import AlertBuilderCircuitBreakingManager
 from alarm_backends.core.lock.service_lock import multi_service_lock
+from alarm_backends.service.alert.builder.writer import EVENT_WRITER
 from alarm_backends.service.alert.enricher import AlertEnrichFactory, EventEnrichFactory
 from alarm_backends.service.alert.manager.tasks import send_check_task
+from alarm_backends.service.alert.manager.timer_wheel import ActiveAlertTimerWheel
 from alarm_backends.service.alert.processor import BaseAlertProcessor
 from bkmonitor.documents import AlertLog, EventDocument
 from bkmonitor.documents.base import BulkActionType
@@ -196,6 +199,8 @@ class AlertBuilder(BaseAlertProcessor):
         ]
         # 利用send_check_task 创建[alert.manager]延时任务
         send_check_task(alerts=alerts_params, run_immediately=False)
+        # 新告警加入活跃告警时间轮，由周期检测任务持续检测
+        ActiveAlertTimerWheel.add_alerts([alert for alert in alerts if alert.is_new()])
         self.logger.info("[alert.builder -> alert.manager] alerts: %s", ", ".join([str(alert.id) for alert in alerts]))
 
     def enrich_alerts(self, alerts: list[Alert]):
@@ -242,6 +247,9 @@ class AlertBuilder(BaseAlertProcessor):
     def save_events(self, events: list[Event]) -> list[Event]:
         if not events:
             return []
+        if settings.ALERT_EVENT_ASYNC_WRITE_ENABLED:
+            return self.save_events_async(events)
+
         dedupe_events = []
         # 先对相同uid的事件进行去重
         exist_uids = set()
@@ -291,6 +299,35 @@ class AlertBuilder(BaseAlertProcessor):
         # 过滤出保存成功的事件
         return [event for event in dedupe_events if event.id not in error_uids]
 
+    def save_events_async(self, events: list[Event]) -> list[Event]:
+        """
+        通过异步批量写入器保存事件，与其他调用方的事件合并为更大的 bulk 请求写入，不等待 ES 写入结果
+        已写入或正在写入的事件视为重复事件，不再构建告警，写入冲突和失败由写入器在后台处理
+        """
+        dedupe_events = []
+        exist_uids = set()
+        for event in events:
+            if event.is_dropped() or event.id in exist_uids:
+                continue
+            dedupe_events.append(event)
+            exist_uids.add(event.id)
+
+        start_time = time.time()
+        documents = [event.to_document() for event in dedupe_events]
+        duplicate_ids = EVENT_WRITER.get_duplicate_ids(documents)
+        new_events = [event for event in dedupe_events if event.id not in duplicate_ids]
+        sync_count = EVENT_WRITER.put([document for document in documents if document.id not in duplicate_ids])
+
+        self.logger.info(
+            "[alert.builder save event to ES] async: total(%d), queued(%d), duplicate(%d), sync(%d), cost: %.3f",
+            len(events),
+            len(new_events) - sync_count,
+            len(events) - len(new_events),
+            sync_count,
+            time.time() - start_time,
+        )
+        return new_events
+
     def alert_qos_handle(self, alert: Alert):
         if not alert.is_blocked:
             # 对于未被流控的告警，只检查熔断规则
@@ -0,0 +1,270 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from elasticsearch.helpers import BulkIndexError
+
+from alarm_backends.core.cache.key import ALERT_EVENT_UID_KEY
+from bkmonitor.documents import EventDocument
+from core.prometheus import metrics
+
+logger = logging.getLogger("alert.builder")
+
+
+class EventBulkWriter:
+    """
+    事件异步批量写入器
+
+    告警构建将事件文档放入有界队列后直接返回，由后台线程把多个调用方的文档合并为 bulk 请求并发写入 ES。
+    - 有空闲的写入并发时立即提交队列中已有的文档，写入并发已满时队列积压，下一次提交的批次随之变大
+    - 队列已满时 put 会等待一段时间，仍无法放入的文档由调用方同步写入，以此向消费端施加背压
+    - 非 409 (uid 重复) 的写入失败会按批重试
+
+    去重：写入成功(或 409 冲突)的事件会在 redis 中记录事件ID，写入中的事件ID记录在进程内，
+    告警构建前通过 get_duplicate_ids 过滤重复事件。最终写入失败的事件不记录，重新拉取到时会再次写入。
+    """
+
+    def __init__(self, queue_size=None, batch_size=None, concurrency=None, max_retries=None):
+        # 未指定的参数在启动时从配置中读取
+        self.options = {
+            "queue_size": queue_size,
+            "batch_size": batch_size,
+            "concurrency": concurrency,
+            "max_retries": max_retries,
+        }
+        self.queue_size = self.batch_size = self.concurrency = self.max_retries = None
+
+        self.lock = threading.Lock()
+        self.pid = None
+        self.queue = None
+        self.executor = None
+        self.semaphore = None
+        self.flush_thread = None
+        # 已放入队列但尚未写入完成的事件ID
+        self.pending_ids = set()
+
+    def load_options(self):
+        for name, value in self.options.items():
+            if value is None:
+                value = getattr(settings, f"ALERT_EVENT_WRITER_{name.upper()}")
+            setattr(self, name, value)
+
+    def start(self):
+        """
+        启动后台攒批线程，fork 出的子进程不会继承线程，需要在当前进程内重新启动
+        """
+        if self.pid == os.getpid() and self.flush_thread.is_alive():
+            return
+
+        with self.lock:
+            if self.pid == os.getpid() and self.flush_thread.is_alive():
+                return
+
+            if self.pid != os.getpid():
+                self.load_options()
+                self.queue = queue.Queue(maxsize=self.queue_size)
+                self.executor = ThreadPoolExecutor(max_workers=self.concurrency)
+                self.semaphore = threading.BoundedSemaphore(self.concurrency)
+                self.pending_ids = set()
+                self.pid = os.getpid()
+                atexit.register(self.flush)
+
+            self.flush_thread = threading.Thread(target=self.run, name="alert-event-writer", daemon=True)
+            self.flush_thread.start()
+
+    def get_duplicate_ids(self, documents: list[EventDocument]) -> set:
+        """
+        获取已写入或正在写入的事件ID
+        redis 异常时只使用进程内记录，重复的文档仍会被 ES 以 409 拒绝
+        """
+        with self.lock:
+            duplicate_ids = {document.id for document in documents if document.id in self.pending_ids}
+
+        documents = [document for document in documents if document.id not in duplicate_ids]
+        if not documents:
+            return duplicate_ids
+        try:
+            pipeline = ALERT_EVENT_UID_KEY.client.pipeline(transaction=False)
+            for document in documents:
+                pipeline.exists(self.get_uid_key(document))
+            for document, exists in zip(documents, pipeline.execute()):
+                if exists:
+                    duplicate_ids.add(document.id)
+        except Exception as e:  # noqa
+            logger.warning("[alert.builder event writer] get written event ids failed: %s", e)
+        return duplicate_ids
+
+    @staticmethod
+    def get_uid_key(document: EventDocument):
+        return ALERT_EVENT_UID_KEY.get_key(strategy_id=document.strategy_id or 0, event_id=document.id)
+
+    def mark_written(self, documents: list[EventDocument]):
+        """
+        记录已写入的事件ID，用于去重
+        """
+        if not documents:
+            return
+        try:
+            pipeline = ALERT_EVENT_UID_KEY.client.pipeline(transaction=False)
+            for document in documents:
+                pipeline.set(self.get_uid_key(document), 1, ex=ALERT_EVENT_UID_KEY.ttl)
+            pipeline.execute()
+        except Exception as e:  # noqa
+            logger.warning("[alert.builder event writer] mark written events failed: %s", e)
+
+    def put(self, documents: list[EventDocument], timeout: float = 1):
+        """
+        将事件文档放入写入队列，不等待写入结果，队列已满未能放入的文档同步写入
+        :return: 同步写入的文档数量
+        """
+        self.start()
+
+        with self.lock:
+            self.pending_ids.update(document.id for document in documents)
+
+        deadline = time.time() + timeout
+        for index, document in enumerate(documents):
+            try:
+                self.queue.put(document, timeout=max(deadline - time.time(), 0))
+            except queue.Full:
+                rejected = documents[index:]
+                metrics.ALERT_EVENT_WRITER_BACKPRESSURE_COUNT.inc(len(rejected))
+                logger.warning(
+                    "[alert.builder event writer] queue is full(%d), %d events will be saved synchronously",
+                    self.queue_size,
+                    len(rejected),
+                )
+                self.write(rejected)
+                return len(rejected)
+        return 0
+
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+
+            # 写入并发数达到上限时阻塞，使队列积压从而触发背压
+            self.semaphore.acquire()
+
+            # 不等待凑满批次，有空闲写入并发时立即提交队列中已有的文档
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self.executor.submit(self.run_write, batch)
+            except Exception as e:  # noqa
+                logger.exception("[alert.builder event writer] submit bulk task failed: %s", e)
+                self.semaphore.release()
+                self.finish(batch, set(), {document.id for document in batch})
+                for _ in batch:
+                    self.queue.task_done()
+
+    def run_write(self, batch: list[EventDocument]):
+        try:
+            self.write(batch)
+        finally:
+            self.semaphore.release()
+            for _ in batch:
+                self.queue.task_done()
+
+    def write(self, documents: list[EventDocument]):
+        conflict_ids, failed_ids = set(), {document.id for document in documents}
+        try:
+            conflict_ids, failed_ids = self.bulk_create(documents)
+        except Exception as e:  # noqa
+            logger.exception("[alert.builder event writer] bulk create failed: %s", e)
+        finally:
+            self.finish(documents, conflict_ids, failed_ids)
+
+    def finish(self, documents: list[EventDocument], conflict_ids: set, failed_ids: set):
+        """
+        记录写入结果，写入成功及 409 冲突的事件记录到 redis 用于去重，最终失败的事件不记录
+        """
+        self.mark_written([document for document in documents if document.id not in failed_ids])
+        if conflict_ids or failed_ids:
+            logger.warning(
+                "[alert.builder event writer] events duplicate(%d): %s, failed(%d): %s",
+                len(conflict_ids),
+                ",".join(sorted(conflict_ids)[:10]),
+                len(failed_ids),
+                ",".join(sorted(failed_ids)[:10]),
+            )
+        with self.lock:
+            self.pending_ids.difference_update(document.id for document in documents)
+
+    def bulk_create(self, documents: list[EventDocument]) -> tuple[set, set]:
+        """
+        批量写入事件，非 409 的失败进行重试
+        :return: uid 冲突的事件ID集合，最终写入失败的事件ID集合
+        """
+        if self.max_retries is None:
+            self.load_options()
+
+        total = len(documents)
+        start_time = time.time()
+        conflict_ids = set()
+        for retry in range(self.max_retries + 1):
+            try:
+                EventDocument.bulk_create(documents)
+                documents = []
+            except BulkIndexError as e:
+                failed_ids = set()
+                for err in e.errors:
+                    if err["create"]["status"] == 409:
+                        conflict_ids.add(err["create"]["_id"])
+                        continue
+                    failed_ids.add(err["create"]["_id"])
+                    if retry == self.max_retries:
+                        logger.error("[alert.builder event writer ERROR] detail: %s", err)
+                documents = [document for document in documents if document.id in failed_ids]
+            except Exception as e:  # noqa
+                logger.warning("[alert.builder event writer] bulk create failed(retry: %d): %s", retry, e)
+
+            if not documents:
+                break
+            if retry < self.max_retries:
+                time.sleep(min(2**retry, 10))
+
+        failed_ids = {document.id for document in documents}
+        metrics.ALERT_EVENT_WRITE_COUNT.labels(status="created").inc(total - len(conflict_ids) - len(failed_ids))
+        metrics.ALERT_EVENT_WRITE_COUNT.labels(status="duplicate").inc(len(conflict_ids))
+        metrics.ALERT_EVENT_WRITE_COUNT.labels(status="failed").inc(len(failed_ids))
+        logger.info(
+            "[alert.builder event writer] finished: total(%d), duplicate(%d), failed(%d), cost: %.3f",
+            total,
+            len(conflict_ids),
+            len(failed_ids),
+            time.time() - start_time,
+        )
+        return conflict_ids, failed_ids
+
+    def flush(self, timeout: float = 30):
+        """
+        等待队列中的事件写入完成
+        """
+        if self.pid != os.getpid():
+            return
+
+        deadline = time.time() + timeout
+        while self.queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.1)
+
+
+EVENT_WRITER = EventBulkWriter()
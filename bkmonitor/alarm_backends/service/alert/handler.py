@@ -10,6 +10,7 @@ specific language governing permissions and limitations under the License.
 
 import json
 import logging
+import queue
 import signal
 import threading
 import time
@@ -31,6 +32,7 @@ from bkmonitor.models import EventPluginInstance
 from bkmonitor.utils.consul import BKConsul
 from bkmonitor.utils.thread_backend import InheritParentThread
 from core.drf_resource import api
+from core.prometheus import metrics
 
 logger = logging.getLogger("alert.poller")
 
@@ -362,6 +364,9 @@ class AlertHandler(base.BaseHandler):
         """
         if self.consumers_lock.locked():
             self.consumers_lock.release()
+        if settings.ALERT_POLLER_CONCURRENT_ENABLED and not self.run_once:
+            self.run_concurrent_poller()
+            return
         while True:
             # 仅在持锁期间对 self.consumers 取快照，立即释放锁。
             # 避免 consumer.poll() 在持锁状态下因 broker 过载而永久阻塞，
@@ -411,6 +416,163 @@ class AlertHandler(base.BaseHandler):
                 logger.info("[run_poller] sleep(5 seconds) because of no consumer")
                 continue
 
+    def run_concurrent_poller(self):
+        """
+        按 kafka 集群并发拉取数据
+        每个集群的 consumer 由独立线程拉取，拉取结果放入共享的有界队列，当前线程按集群攒批后推送，
+        避免空闲集群的 poll 等待时间累加到其他集群的事件上
+        """
+        event_queue = queue.Queue(maxsize=settings.ALERT_POLLER_QUEUE_SIZE)
+        batch_window = settings.ALERT_POLLER_BATCH_WINDOW / 1000
+        pollers: dict[str, tuple[KafkaConsumer, threading.Event, threading.Thread]] = {}
+        # 已停止但可能仍在等待写入队列的拉取线程
+        stopped_threads: list[threading.Thread] = []
+        buffers: dict[str, list] = {}
+        buffer_start_times: dict[str, float] = {}
+        last_report_time = time.time()
+
+        try:
+            while not self._stop_signal:
+                with self.consumers_lock:
+                    current_consumers = dict(self.consumers)
+                stopped_threads.extend(self.sync_consumer_pollers(pollers, current_consumers, event_queue))
+                stopped_threads = [thread for thread in stopped_threads if thread.is_alive()]
+
+                if not current_consumers:
+                    # 没有consumer的情况下，沉睡5秒钟，减少调度
+                    time.sleep(5)
+                    logger.info("[run_poller] sleep(5 seconds) because of no consumer")
+                    continue
+
+                try:
+                    bootstrap_server, events = event_queue.get(timeout=batch_window)
+                except queue.Empty:
+                    pass
+                else:
+                    if bootstrap_server not in buffers:
+                        buffers[bootstrap_server] = []
+                        buffer_start_times[bootstrap_server] = time.time()
+                    buffers[bootstrap_server].extend(events)
+
+                # 按数量或时间窗口推送
+                now = time.time()
+                for bootstrap_server in list(buffers):
+                    if (
+                        len(buffers[bootstrap_server]) >= self.max_event_number
+                        or now - buffer_start_times[bootstrap_server] >= batch_window
+                    ):
+                        self.flush_poller_buffer(bootstrap_server, buffers.pop(bootstrap_server))
+
+                if now - last_report_time >= 60:
+                    metrics.report_all()
+                    last_report_time = now
+        finally:
+            for _, stop_event, _ in pollers.values():
+                stop_event.set()
+            stopped_threads.extend(thread for _, _, thread in pollers.values())
+
+            # 拉取线程可能阻塞在队列写入上，需要边取出事件边等待线程退出，已拉取的事件推送完成后再退出
+            while any(thread.is_alive() for thread in stopped_threads) or not event_queue.empty():
+                try:
+                    bootstrap_server, events = event_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                buffers.setdefault(bootstrap_server, []).extend(events)
+            for bootstrap_server, events in buffers.items():
+                self.flush_poller_buffer(bootstrap_server, events)
+            logger.info("[run_poller] alert event concurrent poller stopped")
+
+    def sync_consumer_pollers(
+        self, pollers: dict, consumers: dict[str, KafkaConsumer], event_queue: queue.Queue
+    ) -> list[threading.Thread]:
+        """
+        根据当前的 consumer 启停拉取线程，consumer 被替换、删除或线程退出时停止旧线程
+        :return: 本次停止的拉取线程
+        """
+        stopped_threads = []
+        for bootstrap_server in list(pollers):
+            consumer, stop_event, thread = pollers[bootstrap_server]
+            if consumers.get(bootstrap_server) is not consumer or not thread.is_alive():
+                stop_event.set()
+                del pollers[bootstrap_server]
+                stopped_threads.append(thread)
+
+        for bootstrap_server, consumer in consumers.items():
+            if bootstrap_server in pollers:
+                continue
+            stop_event = threading.Event()
+            thread = InheritParentThread(
+                target=self.run_consumer_poller,
+                args=(bootstrap_server, consumer, stop_event, event_queue),
+                daemon=True,
+            )
+            thread.start()
+            pollers[bootstrap_server] = (consumer, stop_event, thread)
+            logger.info("[run_poller] start poller thread for %s", bootstrap_server)
+        return stopped_threads
+
+    def run_consumer_poller(
+        self, bootstrap_server: str, consumer: KafkaConsumer, stop_event: threading.Event, event_queue: queue.Queue
+    ):
+        """
+        单个 kafka 集群的拉取线程
+        """
+        while not stop_event.is_set() and not self._stop_signal:
+            try:
+                # 设置timeout时间500ms
+                data = consumer.poll(500, max_records=self.MAX_RETRIEVE_NUMBER)
+            except Exception as e:
+                # consumer 可能已被 run_consumer_manager 关闭（发布/配置变更时）
+                logger.warning("[run_poller] poll error for %s, retry later: %s", bootstrap_server, e)
+                stop_event.wait(1)
+                continue
+
+            self.report_consumer_lag(bootstrap_server, consumer)
+            if not data:
+                continue
+
+            events = []
+            for records in list(data.values()):
+                events.extend(records)
+            metrics.ALERT_POLLER_POLL_EVENT_COUNT.labels(bootstrap_server=bootstrap_server).inc(len(events))
+
+            # 队列已满时暂停拉取，直到推送线程处理完积压的事件
+            # 拉取后消费位移即会被自动提交，即使线程已被停止也必须等待事件放入队列，由推送线程在退出前推送完成
+            while True:
+                try:
+                    event_queue.put((bootstrap_server, events), timeout=1)
+                    break
+                except queue.Full:
+                    if stop_event.is_set():
+                        logger.info(
+                            "[run_poller] poller of %s stopped, waiting to push %s events",
+                            bootstrap_server,
+                            len(events),
+                        )
+
+    def flush_poller_buffer(self, bootstrap_server: str, events: list):
+        if not events:
+            return
+        self.push_handle_task(bootstrap_server, events)
+        logger.info("[run_poller]  alert event poller poll %s: count(%s)", bootstrap_server, len(events))
+
+    @staticmethod
+    def report_consumer_lag(bootstrap_server: str, consumer: KafkaConsumer):
+        """
+        上报各分区的消费积压条数
+        """
+        try:
+            for tp in consumer.assignment():
+                highwater = consumer.highwater(tp)
+                if highwater is None:
+                    continue
+                lag = max(highwater - consumer.position(tp), 0)
+                metrics.ALERT_POLLER_CONSUMER_LAG.labels(
+                    bootstrap_server=bootstrap_server, topic=tp.topic, partition=tp.partition
+                ).set(lag)
+        except Exception as e:  # noqa
+            logger.debug("[run_poller] report consumer lag of %s failed: %s", bootstrap_server, e)
+
     def get_kafka_redis_offset(self, data_id, topic):
         """
         获取redis记录的offset
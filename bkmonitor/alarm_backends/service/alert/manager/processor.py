@@ -23,6 +23,7 @@ from alarm_backends.service.alert.manager.checker.next import NextStatusChecker
 from alarm_backends.service.alert.manager.checker.recover import RecoverStatusChecker
 from alarm_backends.service.alert.manager.checker.shield import ShieldStatusChecker
 from alarm_backends.service.alert.manager.checker.upgrade import UpgradeChecker
+from alarm_backends.service.alert.manager.timer_wheel import ActiveAlertTimerWheel
 from alarm_backends.service.alert.processor import BaseAlertProcessor
 from bkmonitor.documents import AlertDocument
 from bkmonitor.documents.base import BulkActionType
@@ -133,6 +134,11 @@ class AlertManager(BaseAlertProcessor):
         处理入口
         """
         alerts = self.fetch_alerts()
+        # 已不存在的告警无需继续检测，从活跃告警时间轮中移除
+        fetched_alert_ids = {str(alert.id) for alert in alerts}
+        ActiveAlertTimerWheel.remove(
+            [alert_key for alert_key in self.alert_keys if str(alert_key.alert_id) not in fetched_alert_ids]
+        )
         if not alerts:
             return
 
@@ -169,6 +175,15 @@ class AlertManager(BaseAlertProcessor):
             # 4. 保存告警到ES
             saved_alerts = self.save_alerts(alerts_to_check, action=BulkActionType.UPSERT, force_save=True)
 
+        # 处理后不再异常或已被流控的告警，从活跃告警时间轮中移除
+        ActiveAlertTimerWheel.remove(
+            [
+                AlertKey(alert_id=alert.id, strategy_id=alert.strategy_id)
+                for alert in alerts_to_check + alerts_to_update_directly
+                if not alert.is_abnormal() or alert.is_blocked
+            ]
+        )
+
         # 5. 保存流水日志
         self.save_alert_logs(saved_alerts)
 
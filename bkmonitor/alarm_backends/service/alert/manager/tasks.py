@@ -19,6 +19,7 @@ from alarm_backends.core.alert.alert import Alert, AlertCache, AlertKey
 from alarm_backends.core.cache.strategy import StrategyCacheManager
 from alarm_backends.core.cluster import get_cluster_bk_biz_ids
 from alarm_backends.service.alert.manager.processor import AlertManager
+from alarm_backends.service.alert.manager.timer_wheel import ActiveAlertTimerWheel
 from alarm_backends.service.scheduler.app import app
 from bkmonitor.documents import AlertDocument, AlertLog
 from bkmonitor.documents.base import BulkActionType
@@ -83,6 +84,30 @@ def _search_after_hits(search, page_size: int):
 def check_abnormal_alert():
     """
     拉取异常告警，对这些告警进行状态管理
+    开启活跃告警时间轮后，仅在对账周期内全量扫描一次 ES，其余周期从时间轮中取出到期的告警
+    """
+    if ActiveAlertTimerWheel.is_enabled() and not ActiveAlertTimerWheel.need_reconcile():
+        alerts = ActiveAlertTimerWheel.pop_due()
+        logger.info("[check_abnormal_alert] pop due alerts(%s) from timer wheel", len(alerts))
+        if alerts:
+            send_check_task(alerts)
+        return
+
+    alerts = scan_abnormal_alerts()
+    if ActiveAlertTimerWheel.is_enabled():
+        # 对账：补齐时间轮中缺失的告警，已存在的告警保持原有的下次检测时间
+        ActiveAlertTimerWheel.add(
+            [AlertKey(alert_id=alert["id"], strategy_id=alert.get("strategy_id")) for alert in alerts], only_new=True
+        )
+        logger.info("[check_abnormal_alert] reconcile timer wheel with abnormal alerts(%s)", len(alerts))
+
+    if alerts:
+        send_check_task(alerts)
+
+
+def scan_abnormal_alerts() -> list[dict]:
+    """
+    从 ES 全量扫描集群内未被流控的异常告警
     """
     search = (
         AlertDocument.search(all_indices=True)
@@ -105,9 +130,7 @@ def check_abnormal_alert():
         if bk_biz_id not in cluster_bk_biz_ids:
             continue
         alerts.append({"id": alert_id, "strategy_id": src.get("strategy_id")})
-
-    if alerts:
-        send_check_task(alerts)
+    return alerts
 
 
 def check_blocked_alert():
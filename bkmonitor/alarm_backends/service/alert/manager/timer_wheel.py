@@ -0,0 +1,129 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+活跃告警时间轮
+
+以集群维度的有序集合记录未恢复的告警，分值为下次检测时间。
+alert.builder 产生新告警时加入，alert.manager 处理后将不再异常的告警移除，周期检测任务只需取出到期的告警，
+无需每分钟全量扫描 ES。ES 全量扫描保留为周期对账，补齐时间轮中缺失的告警。
+"""
+
+import logging
+import time
+
+from django.conf import settings
+
+from alarm_backends.core.alert.alert import Alert, AlertKey
+from alarm_backends.core.cache.key import ACTIVE_ALERT_RECONCILE_LOCK, ACTIVE_ALERT_TIMER_KEY
+
+logger = logging.getLogger("alert.manager")
+
+
+class ActiveAlertTimerWheel:
+    # 单次读取的到期告警数量
+    PAGE_SIZE = 5000
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return settings.ALERT_TIMER_WHEEL_ENABLED
+
+    @staticmethod
+    def get_next_check_time(now: int = None, interval: int = 60) -> int:
+        """
+        下次检测时间对齐到周期边界，保证下一轮周期任务执行时已到期
+        """
+        now = int(now or time.time())
+        return (now // interval + 1) * interval
+
+    @staticmethod
+    def to_member(alert_key: AlertKey) -> str:
+        return str(alert_key)
+
+    @staticmethod
+    def from_member(member: str) -> dict:
+        alert_id, _, strategy_id = member.partition("|")
+        return {"id": alert_id, "strategy_id": int(strategy_id) if strategy_id and strategy_id != "0" else None}
+
+    @classmethod
+    def add(cls, alert_keys: list[AlertKey], only_new: bool = False):
+        """
+        加入时间轮
+        :param only_new: 仅加入时间轮中不存在的告警，不修改已有告警的下次检测时间
+        """
+        if not cls.is_enabled() or not alert_keys:
+            return
+        next_check_time = cls.get_next_check_time()
+        timer_key = ACTIVE_ALERT_TIMER_KEY.get_key()
+        client = ACTIVE_ALERT_TIMER_KEY.client
+        for index in range(0, len(alert_keys), cls.PAGE_SIZE):
+            mapping = {
+                cls.to_member(alert_key): next_check_time for alert_key in alert_keys[index : index + cls.PAGE_SIZE]
+            }
+            client.zadd(timer_key, mapping, nx=only_new)
+        client.expire(timer_key, ACTIVE_ALERT_TIMER_KEY.ttl)
+
+    @classmethod
+    def add_alerts(cls, alerts: list[Alert]):
+        """
+        加入未被流控的异常告警
+        """
+        cls.add(
+            [
+                AlertKey(alert_id=alert.id, strategy_id=alert.strategy_id)
+                for alert in alerts
+                if alert.is_abnormal() and not alert.is_blocked
+            ]
+        )
+
+    @classmethod
+    def remove(cls, alert_keys: list[AlertKey]):
+        if not cls.is_enabled() or not alert_keys:
+            return
+        ACTIVE_ALERT_TIMER_KEY.client.zrem(
+            ACTIVE_ALERT_TIMER_KEY.get_key(), *[cls.to_member(alert_key) for alert_key in alert_keys]
+        )
+
+    @classmethod
+    def pop_due(cls, now: int = None) -> list[dict]:
+        """
+        取出到期的告警，并顺延其下次检测时间
+        告警在恢复或关闭前始终保留在时间轮中，由 alert.manager 处理时移除
+        """
+        now = int(now or time.time())
+        next_check_time = cls.get_next_check_time(now)
+        timer_key = ACTIVE_ALERT_TIMER_KEY.get_key()
+        client = ACTIVE_ALERT_TIMER_KEY.client
+
+        alerts = []
+        while True:
+            # 顺延后的告警分值大于 now，不会被重复读取，因此每次都从头读取
+            members = client.zrangebyscore(timer_key, "-inf", now, start=0, num=cls.PAGE_SIZE)
+            if not members:
+                break
+            # 仅更新仍存在的成员，避免把处理过程中刚被移除的告警重新加入
+            client.zadd(timer_key, {member: next_check_time for member in members}, xx=True)
+            alerts.extend(cls.from_member(member) for member in members)
+            if len(members) < cls.PAGE_SIZE:
+                break
+        client.expire(timer_key, ACTIVE_ALERT_TIMER_KEY.ttl)
+        return alerts
+
+    @classmethod
+    def need_reconcile(cls) -> bool:
+        """
+        是否需要通过 ES 全量扫描进行对账，对账周期内只会返回一次 True
+        """
+        return bool(
+            ACTIVE_ALERT_RECONCILE_LOCK.client.set(
+                ACTIVE_ALERT_RECONCILE_LOCK.get_key(),
+                int(time.time()),
+                nx=True,
+                ex=ACTIVE_ALERT_RECONCILE_LOCK.ttl,
+            )
+        )
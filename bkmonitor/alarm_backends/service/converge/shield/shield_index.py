@@ -0,0 +1,186 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+告警屏蔽索引
+
+按业务将屏蔽配置预先解析为 AlertShieldObj，
+并按屏蔽配置中必须满足的等值条件（策略ID、维度、目标IP、拓扑节点等）建立倒排索引。
+告警匹配时只需对索引命中的少量候选屏蔽配置执行完整匹配，无需遍历业务下的全部屏蔽配置。
+索引按屏蔽配置版本在进程内缓存，配置变化或超过最长复用时间后重建，缓存的业务数超过上限时淘汰最久未使用的索引。
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+
+from alarm_backends.core.cache.shield import ShieldCacheManager
+from alarm_backends.service.converge.shield.shield_obj import AlertShieldObj
+from bkmonitor.utils.range.conditions import AndCondition, EqualCondition, OrCondition
+
+logger = logging.getLogger("fta_action.shield")
+
+# 选择索引条件时优先使用的维度，越靠前区分度越高
+INDEX_FIELD_PRIORITY = [
+    "strategy_id",
+    "bk_host_id",
+    "bk_target_ip",
+    "ip",
+    "bk_target_service_instance_id",
+    "service_instance_id",
+    "bk_topo_node",
+]
+
+
+def get_required_conditions(shield_obj: AlertShieldObj) -> list[EqualCondition]:
+    """
+    获取屏蔽配置匹配时必须满足的等值条件
+    维度条件为 AND 关系，其中的等值条件必须满足；仅包含一组 AND 条件的 OR 条件，其等值条件同样必须满足
+    """
+    conditions = []
+    for condition in shield_obj.dimension_check.conditions:
+        if type(condition) is EqualCondition:
+            conditions.append(condition)
+        elif isinstance(condition, OrCondition) and len(condition.conditions) == 1:
+            and_condition = condition.conditions[0]
+            if isinstance(and_condition, AndCondition):
+                conditions.extend(c for c in and_condition.conditions if type(c) is EqualCondition)
+    return conditions
+
+
+def get_index_signature(condition: EqualCondition) -> tuple:
+    """
+    获取等值条件的索引签名
+    IP 等字段从告警维度中取值的方式依赖于屏蔽配置的值格式，因此签名需要包含字段类型及值格式
+    """
+    cond_field = condition.cond_field
+    first_value = cond_field.value
+    if first_value and isinstance(first_value, list | tuple):
+        first_value = first_value[0]
+    return cond_field.name, cond_field.__class__, isinstance(first_value, dict)
+
+
+class ShieldIndex:
+    """
+    单个业务的屏蔽配置索引
+    """
+
+    def __init__(self, configs: list[dict], version: str = None):
+        self.configs = configs
+        self.version = version
+        self.create_time = time.time()
+
+        self.shield_objs: dict[str, AlertShieldObj] = {}
+        # 没有可用索引条件的屏蔽配置，每个告警都需要进行匹配
+        self.unindexed: list[AlertShieldObj] = []
+        # 索引签名 -> 用于从告警维度中取值的条件
+        self.signatures: dict[tuple, EqualCondition] = {}
+        # 索引签名 -> 条件值 -> 屏蔽配置列表
+        self.buckets: dict[tuple, dict[str, list[AlertShieldObj]]] = defaultdict(lambda: defaultdict(list))
+
+        for config in configs:
+            shield_obj = AlertShieldObj(config)
+            self.shield_objs[str(shield_obj.id)] = shield_obj
+            self.add(shield_obj)
+
+    def add(self, shield_obj: AlertShieldObj):
+        conditions = get_required_conditions(shield_obj)
+        if not conditions:
+            self.unindexed.append(shield_obj)
+            return
+
+        def priority(condition):
+            name = condition.cond_field.name
+            return INDEX_FIELD_PRIORITY.index(name) if name in INDEX_FIELD_PRIORITY else len(INDEX_FIELD_PRIORITY)
+
+        condition = min(conditions, key=priority)
+        signature = get_index_signature(condition)
+        self.signatures.setdefault(signature, condition)
+        bucket = self.buckets[signature]
+        for value in set(condition.cond_field.to_str_list()):
+            bucket[value].append(shield_obj)
+
+    def get_candidates(self, dimension: dict) -> list[AlertShieldObj]:
+        """
+        根据告警维度获取候选屏蔽配置，候选配置仍需执行完整匹配
+        """
+        candidates = {id(shield_obj): shield_obj for shield_obj in self.unindexed}
+        for signature, condition in self.signatures.items():
+            existed, data_field = condition.get_field(dimension)
+            if not existed:
+                continue
+            bucket = self.buckets[signature]
+            for value in set(data_field.to_str_list()):
+                for shield_obj in bucket.get(value, []):
+                    candidates[id(shield_obj)] = shield_obj
+        return list(candidates.values())
+
+    def match(self, alert) -> list[AlertShieldObj]:
+        """
+        获取告警命中的屏蔽配置，结果按屏蔽配置顺序返回
+        """
+        if not self.shield_objs:
+            return []
+        try:
+            dimension = AlertShieldObj._get_cached_alert_dimension(alert)
+        except Exception:  # noqa
+            # 告警维度获取失败时，回退为逐条匹配，与未使用索引时的行为保持一致
+            candidates = list(self.shield_objs.values())
+        else:
+            candidates = self.get_candidates(dimension)
+        matched = {id(shield_obj) for shield_obj in candidates if shield_obj.is_match(alert)}
+        return [shield_obj for shield_obj in self.shield_objs.values() if id(shield_obj) in matched]
+
+
+class ShieldIndexManager:
+    """
+    进程内屏蔽索引缓存，按最近使用顺序保存，超过最长复用时间或缓存上限的索引会被淘汰
+    """
+
+    indexes: OrderedDict[int, ShieldIndex] = OrderedDict()
+    lock = threading.Lock()
+
+    @classmethod
+    def get(cls, bk_biz_id) -> ShieldIndex:
+        version = ShieldCacheManager.get_shield_version(bk_biz_id)
+        with cls.lock:
+            index = cls.indexes.get(bk_biz_id)
+            if (
+                index is not None
+                and index.version == version
+                and time.time() - index.create_time < settings.SHIELD_INDEX_TTL
+            ):
+                cls.indexes.move_to_end(bk_biz_id)
+                return index
+
+        index = ShieldIndex(ShieldCacheManager.get_shields_by_biz_id(bk_biz_id), version)
+        cls.set(bk_biz_id, index)
+        logger.debug(
+            "[shield index] biz(%s) version(%s) rebuild: total(%d), unindexed(%d)",
+            bk_biz_id,
+            version,
+            len(index.shield_objs),
+            len(index.unindexed),
+        )
+        return index
+
+    @classmethod
+    def set(cls, bk_biz_id, index: ShieldIndex):
+        with cls.lock:
+            cls.indexes[bk_biz_id] = index
+            cls.indexes.move_to_end(bk_biz_id)
+
+            # 清理过期的索引，仍然超出上限时淘汰最久未使用的索引
+            expire_time = time.time() - settings.SHIELD_INDEX_TTL
+            for key in [key for key, value in cls.indexes.items() if value.create_time < expire_time]:
+                del cls.indexes[key]
+            while len(cls.indexes) > settings.SHIELD_INDEX_MAX_SIZE:
+                cls.indexes.popitem(last=False)
@@ -22,6 +22,7 @@ from alarm_backends.core.cache.shield import ShieldCacheManager
 from alarm_backends.core.control.strategy import Strategy
 from alarm_backends.core.i18n import i18n
 from alarm_backends.service.alert.qos.influence import get_failure_scope_config
+from alarm_backends.service.converge.shield.shield_index import ShieldIndexManager
 from alarm_backends.service.converge.shield.shield_obj import AlertShieldObj
 from bkmonitor.documents.alert import AlertDocument
 from bkmonitor.models import ActionInstance, time_tools
@@ -52,6 +53,12 @@ class AlertShieldConfigShielder(BaseShielder):
         if config_ids:
             # 已经进行过屏蔽匹配了， 这里直接返回
             config_ids: list[str] = json.loads(config_ids)
+            if self.shield_index is not None:
+                return [
+                    self.shield_index.shield_objs[config_id]
+                    for config_id in config_ids
+                    if config_id in self.shield_index.shield_objs
+                ]
             return [AlertShieldObj(config) for config in self.configs if str(config["id"]) in config_ids]
         return None
 
@@ -67,8 +74,14 @@ class AlertShieldConfigShielder(BaseShielder):
 
     def __init__(self, alert: AlertDocument):
         self.alert = alert
+        self.shield_index = None
         try:
-            self.configs = ShieldCacheManager.get_shields_by_biz_id(self.alert.event.bk_biz_id)
+            if settings.SHIELD_INDEX_ENABLED:
+                # 使用进程内按版本缓存的屏蔽索引，避免每个告警都重新加载并解析全部屏蔽配置
+                self.shield_index = ShieldIndexManager.get(self.alert.event.bk_biz_id)
+                self.configs = self.shield_index.configs
+            else:
+                self.configs = ShieldCacheManager.get_shields_by_biz_id(self.alert.event.bk_biz_id)
             config_ids: list[str] = ",".join([str(config["id"]) for config in self.configs])
             logger.debug(
                 "[load shield] alert(%s) strategy(%s) ids:(%s)",
@@ -86,10 +99,13 @@ class AlertShieldConfigShielder(BaseShielder):
         from_cache = True
         if shield_objs_cache is None:
             self.shield_objs = []
-            for config in self.configs:
-                shield_obj = AlertShieldObj(config)
-                if shield_obj.is_match(alert):
-                    self.shield_objs.append(shield_obj)
+            if self.shield_index is not None:
+                self.shield_objs = self.shield_index.match(alert)
+            else:
+                for config in self.configs:
+                    shield_obj = AlertShieldObj(config)
+                    if shield_obj.is_match(alert):
+                        self.shield_objs.append(shield_obj)
             self.set_shield_objs_cache()
             from_cache = False
         else:
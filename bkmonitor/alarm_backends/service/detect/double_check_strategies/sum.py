@@ -8,7 +8,6 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
-import json
 import logging
 from copy import deepcopy
 from dataclasses import dataclass, field
@@ -24,7 +23,7 @@ from alarm_backends.core.cache.key import CHECK_RESULT_CACHE_KEY
 from alarm_backends.core.control.mixins.detect import load_detector_cls
 from alarm_backends.core.control.mixins.double_check import DoubleCheckStrategy
 from alarm_backends.core.detect_result import ANOMALY_LABEL
-from alarm_backends.service.access.data.records import DataRecord
+from alarm_backends.service.access.data.records import DataRecord, encode_record_data
 from alarm_backends.service.detect.strategy import (
     BasicAlgorithmsCollection,
     HistoryPointFetcher,
@@ -371,7 +370,7 @@ class DoubleCheckSumStrategy(DoubleCheckStrategy):
         if "__debug__" in point.data:
             logger.info(f"[二次检测] dummy push {point.data}")
         else:
-            data_list_key.client.lpush(output_key, *[json.dumps(point.data) for point in points])
+            data_list_key.client.lpush(output_key, *[encode_record_data(point.data) for point in points])
             key.DATA_SIGNAL_KEY.client.lpush(key.DATA_SIGNAL_KEY.get_key(), *[self.item.strategy.strategy_id])
 
         logger.info(
@@ -8,7 +8,6 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
-import json
 import logging
 import time
 
@@ -20,6 +19,7 @@ from alarm_backends.core.i18n import i18n
 from alarm_backends.core.lock.service_lock import service_lock
 from alarm_backends.core.processor.base import BaseAbnormalPushProcessor
 from alarm_backends.core.storage.redis_cluster import get_node_by_strategy_id
+from alarm_backends.service.access.data.records import decode_record_data
 from alarm_backends.service.detect import DataPoint
 from core.prometheus import metrics
 
@@ -85,7 +85,7 @@ class DetectProcess(BaseAbnormalPushProcessor):
             # 队列左进右出，lrange 取出时需要做一次倒序才能保证先进先出
             for record in reversed(records):
                 try:
-                    data_point = DataPoint(json.loads(record), item)
+                    data_point = DataPoint(decode_record_data(record), item)
                     # fill data point into inputs list
                     self.inputs[item.id].append(data_point)
                 except ValueError:
@@ -15,15 +15,38 @@ specific language governing permissions and limitations under the License.
 
 import ast
 import logging
+import operator
 
 from bk_monitor_base.strategy import THRESHOLD_ALLOWED_METHODS, ThresholdSerializer
+from django.conf import settings
 from django.utils.safestring import mark_safe
 
+from alarm_backends.service.detect import DataPoint
 from alarm_backends.service.detect.strategy import BasicAlgorithmsCollection, ExprDetectAlgorithms
+from alarm_backends.templatetags.unit import unit_convert_min
 from core.errors.alarm_backends.detect import InvalidThresholdConfig
+from core.unit import load_unit
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 logger = logging.getLogger("detect")
 
+# 表达式比较符与向量化比较函数的映射
+VECTORIZED_COMPARATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# float64 可精确表示的最大整数，超过该值的整数交由逐点检测处理
+MAX_SAFE_INTEGER = 2**53
+
 
 class AlgorithmsAST(ast.NodeTransformer):
     """
@@ -66,3 +89,69 @@ class Threshold(AndThreshold):
     def gen_expr(self):
         for t_config in self.validated_config:
             yield AndThreshold(t_config, self.unit)
+
+    def detect_records(self, data_points, level):
+        """
+        数据点数量较多时，先基于 numpy 对整批数据做一次向量化阈值比较，
+        只有命中阈值（或处于精度边界、无法向量化）的数据点才进入逐点检测生成异常点。
+        """
+        if isinstance(data_points, DataPoint):
+            data_points = [data_points]
+
+        min_points = settings.THRESHOLD_VECTORIZED_DETECT_MIN_POINTS
+        if np is None or not min_points or len(data_points) < min_points:
+            return super().detect_records(data_points, level)
+
+        try:
+            candidates = self.filter_candidates(data_points)
+        except Exception as e:  # noqa
+            logger.warning(f"[detect] vectorized threshold detect failed, fallback to expr detect: {e}")
+            return super().detect_records(data_points, level)
+
+        logger.debug(f"[detect] vectorized threshold detect: {len(candidates)}/{len(data_points)} points selected")
+        return super().detect_records(candidates, level)
+
+    def filter_candidates(self, data_points):
+        """
+        向量化筛选可能异常的数据点
+        与表达式 `unit_convert_min(value, unit) {comp} unit_convert_min(threshold, unit, algorithm_unit)` 语义一致：
+        1. 非数值、调试数据点及非同一监控项的数据点直接交由逐点检测
+        2. 与阈值的差值在精度范围内的数据点交由逐点检测，避免 numpy 与 python 舍入差异导致结果不一致
+        """
+        item = data_points[0].item
+        unit = data_points[0].unit
+        decimal = settings.POINT_PRECISION
+
+        values = np.empty(len(data_points), dtype=np.float64)
+        fallback = np.zeros(len(data_points), dtype=bool)
+        for index, data_point in enumerate(data_points):
+            value = getattr(data_point, "value", None)
+            if (
+                type(value) not in (int, float)
+                or (type(value) is int and abs(value) > MAX_SAFE_INTEGER)
+                or data_point.item is not item
+                or "__debug__" in data_point.as_dict()
+            ):
+                values[index] = np.nan
+                fallback[index] = True
+            else:
+                values[index] = value
+
+        # 单位换算与 unit_convert_min 保持一致：ScaledUnits.convert 支持 ndarray 运算，仅舍入需要使用 numpy 实现
+        unit_obj = load_unit(unit)
+        converted_values = unit_obj.convert_to_max(values, decimal=None)[0]
+        if unit_obj.suffix_list:
+            converted_values = np.round(converted_values, decimal)
+        tolerance = 10**-decimal
+
+        candidates = fallback.copy()
+        for and_config in self.validated_config:
+            matched = np.ones(len(data_points), dtype=bool)
+            for t_config in and_config:
+                comparator = VECTORIZED_COMPARATORS[THRESHOLD_ALLOWED_METHODS[t_config["method"]]]
+                threshold = unit_convert_min(t_config["threshold"], unit, self.unit)
+                matched &= comparator(converted_values, threshold)
+                candidates |= np.abs(converted_values - threshold) <= tolerance
+            candidates |= matched
+
+        return [data_points[index] for index in np.flatnonzero(candidates)]
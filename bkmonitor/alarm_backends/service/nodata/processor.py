@@ -10,7 +10,6 @@ specific language governing permissions and limitations under the License.
 """
 
 
-import json
 import logging
 
 import arrow
@@ -21,6 +20,7 @@ from alarm_backends.core.control.strategy import Strategy
 from alarm_backends.core.i18n import i18n
 from alarm_backends.core.lock.service_lock import service_lock
 from alarm_backends.core.processor.base import BaseAbnormalPushProcessor
+from alarm_backends.service.access.data.records import decode_record_data
 from alarm_backends.service.access.data.token import TokenBucket
 from alarm_backends.service.detect import DataPoint
 from core.prometheus import metrics
@@ -86,7 +86,7 @@ class CheckProcessor(BaseAbnormalPushProcessor):
             future_records = []
             for record in records:
                 try:
-                    data_point = DataPoint(json.loads(record), item)
+                    data_point = DataPoint(decode_record_data(record), item)
                     if data_point.timestamp <= check_timestamp:
                         self.inputs[item.id].append(data_point)
                     else:
@@ -98,12 +98,12 @@ class CheckProcessor(BaseAbnormalPushProcessor):
             # 如果当前监测点之前无数据，但是未来有数据，那么取未来一个周期的数据
             if not self.inputs[item.id] and future_records:
                 record = future_records[0]
-                data_point = DataPoint(json.loads(record), item)
+                data_point = DataPoint(decode_record_data(record), item)
                 earliest_future_timestamp = data_point.timestamp
                 earliest_future_points = [data_point]
                 earliest_future_records_idx = [0]
                 for index, record in enumerate(future_records[1:]):
-                    data_point = DataPoint(json.loads(record), item)
+                    data_point = DataPoint(decode_record_data(record), item)
                     # 遇到更早时间数据，重置 earliest_future_points 和 earliest_future_records_idx
                     if data_point.timestamp < earliest_future_timestamp:
                         earliest_future_timestamp = data_point.timestamp
@@ -64,10 +64,14 @@ class TsDependPreparationProcess(BasePreparationProcess):
                 # 历史依赖准备就绪才开始检测
                 if force or query_config["intelligent_detect"]["status"] == SDKDetectStatus.PREPARING:
                     self.refresh_strategy_depend_data(strategy, processed_dimensions, update_time)
-                    query_config["intelligent_detect"]["status"] = SDKDetectStatus.READY
                     update_strategy_query_config(
                         strategy_id=strategy_id,
-                        config={"intelligent_detect": query_config["intelligent_detect"]},
+                        config={
+                            "intelligent_detect": {
+                                **query_config["intelligent_detect"],
+                                "status": SDKDetectStatus.READY,
+                            }
+                        },
                     )
                     logger.info(
                         f"Finish to refresh depend data for strategy({strategy_id}),"
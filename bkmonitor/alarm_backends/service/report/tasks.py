@@ -24,6 +24,9 @@ from alarm_backends.service.report.render.dashboard import (
 )
 from alarm_backends.service.scheduler.app import app
 from alarm_backends.service.selfmonitor.collect.redis import RedisMetricCollectReport
+from alarm_backends.service.selfmonitor.collect.redis_keyspace import (
+    RedisKeyspaceProfiler,
+)
 from alarm_backends.service.selfmonitor.collect.transfer import TransferMetricHelper
 from bkmonitor.browser import get_or_create_eventloop
 from bkmonitor.iam import ActionEnum, Permission
@@ -315,6 +318,15 @@ def run_collect_redis_metric(seq):
     RedisMetricCollectReport().collect_redis_metric_data()
 
 
+def collect_redis_keyspace_metric():
+    """
+    redis key 空间分析，SCAN 开销较大，默认关闭
+    """
+    if not settings.REDIS_KEYSPACE_PROFILE_ENABLED:
+        return
+    RedisKeyspaceProfiler().collect_keyspace_metric_data()
+
+
 @app.task(ignore_result=True, queue="celery_report_cron")
 def render_image_task(task: RenderImageTask):
     """
@@ -24,6 +24,7 @@ from alarm_backends.core.lock.service_lock import share_lock
 from alarm_backends.core.storage.redis import cache_conf_with_router
 from alarm_backends.service.new_report.tasks import new_report_detect
 from alarm_backends.service.report.tasks import (
+    collect_redis_keyspace_metric,
     collect_redis_metric,
     operation_data_custom_report_v2,
     report_mail_detect,
@@ -178,6 +179,8 @@ REPORT_CRONTAB = [
     (register_report_task_cron, "* * * * *", "cluster"),
     # redis 指标采集
     (collect_redis_metric, "* * * * *", "cluster"),
+    # redis key 空间分析
+    (collect_redis_keyspace_metric, "*/30 * * * *", "cluster"),
     # 注册告警缓存刷新任务
     (register_alarm_cache_bmw_task, "* * * * *", "global"),
 ]
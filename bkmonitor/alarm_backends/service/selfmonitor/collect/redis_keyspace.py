@@ -0,0 +1,268 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+redis key 空间分析
+
+按 alarm_backends.core.cache.key 中注册的 key 模板，将各缓存节点中的 key 归类到对应的 key 族，
+统计每个 key 族的 key 数量、内存占用、TTL 分布及 key 数量最多的策略，用于定位 redis 内存增长的来源。
+key 数量通过 SCAN 统计，内存占用及 TTL 通过抽样估算。
+"""
+
+import logging
+import random
+import re
+import string
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+
+from alarm_backends.core.cache import key as cache_key
+from alarm_backends.core.cluster import get_cluster
+from alarm_backends.core.storage.redis import CACHE_BACKEND_CONF_MAP
+from alarm_backends.core.storage.redis_cluster import RedisProxy
+from bkmonitor.models import CacheNode
+from core.prometheus import metrics
+
+logger = logging.getLogger("self_monitor")
+
+# 无法匹配到 key 模板的 key 族名称
+UNKNOWN_FAMILY = "unknown"
+
+# TTL 分布区间，按区间上限(秒)划分，未设置过期时间的 key 归为 persist
+TTL_RANGES = [("1m", 60), ("10m", 600), ("1h", 3600), ("1d", 86400), ("+Inf", float("inf"))]
+TTL_PERSIST = "persist"
+
+
+def get_ttl_range(ttl: int) -> str:
+    if ttl is None or ttl < 0:
+        return TTL_PERSIST
+    for name, upper in TTL_RANGES:
+        if ttl <= upper:
+            return name
+    return TTL_RANGES[-1][0]
+
+
+class KeyFamily:
+    """
+    key 族，对应 key.py 中注册的一个 key 模板
+    """
+
+    def __init__(self, name: str, data_key: cache_key.RedisDataKey):
+        self.name = name
+        self.backend = data_key.backend
+        self.key_tpl = data_key.key_tpl
+
+        key_prefix = cache_key.PUBLIC_KEY_PREFIX if data_key.is_global else cache_key.KEY_PREFIX
+        pattern = ""
+        strategy_pattern = ""
+        # 模板中的固定字符数，越多说明模板越具体，匹配时优先使用
+        self.literal_length = 0
+        for literal, field_name, _, _ in string.Formatter().parse(self.key_tpl):
+            pattern += re.escape(literal)
+            strategy_pattern += re.escape(literal)
+            self.literal_length += len(literal)
+            if field_name is None:
+                continue
+            pattern += ".+?"
+            if field_name == "strategy_id" and "(?P<strategy_id>" not in strategy_pattern:
+                strategy_pattern += r"(?P<strategy_id>\d+)"
+            else:
+                strategy_pattern += ".+?"
+
+        if not self.key_tpl.startswith(key_prefix):
+            pattern = re.escape(f"{key_prefix}.") + pattern
+            strategy_pattern = re.escape(f"{key_prefix}.") + strategy_pattern
+        self.pattern = pattern
+        self.strategy_regex = re.compile(f"^{strategy_pattern}$") if "(?P<strategy_id>" in strategy_pattern else None
+
+    def get_strategy_id(self, key: str) -> str | None:
+        if self.strategy_regex is None:
+            return None
+        match = self.strategy_regex.match(key)
+        return match.group("strategy_id") if match else None
+
+
+class KeyFamilyMatcher:
+    """
+    将 key 映射到 key 族，所有模板合并为一个正则，按模板的具体程度依次匹配
+    """
+
+    def __init__(self, families: list[KeyFamily]):
+        self.families = sorted(families, key=lambda family: family.literal_length, reverse=True)
+        self.regex = re.compile(
+            "|".join(f"(?P<f{index}>^{family.pattern}$)" for index, family in enumerate(self.families))
+        )
+
+    def match(self, key: str) -> KeyFamily | None:
+        match = self.regex.match(key)
+        if not match:
+            return None
+        return self.families[int(match.lastgroup[1:])]
+
+
+class KeyFamilyStats:
+    """
+    单个 key 族的统计结果
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.sampled = 0
+        self.sampled_memory = 0
+        self.ttl_distribution = Counter()
+        self.strategies = Counter()
+
+    @property
+    def memory(self) -> int:
+        """按抽样结果估算的内存占用"""
+        if not self.sampled:
+            return 0
+        return int(self.sampled_memory / self.sampled * self.count)
+
+    def get_ttl_distribution(self) -> dict[str, int]:
+        """按抽样结果估算的 TTL 分布"""
+        if not self.sampled:
+            return {}
+        return {ttl_range: int(count / self.sampled * self.count) for ttl_range, count in self.ttl_distribution.items()}
+
+
+def get_key_families() -> list[KeyFamily]:
+    return [
+        KeyFamily(name, data_key)
+        for name, data_key in vars(cache_key).items()
+        if isinstance(data_key, cache_key.RedisDataKey)
+    ]
+
+
+class RedisKeyspaceProfiler:
+    """
+    redis key 空间分析
+
+    按 db 分组 key 族，每个节点的每个 db 只 SCAN 一次；抽样的 key 通过 pipeline 批量获取 MEMORY USAGE 及 TTL
+    """
+
+    SAMPLE_BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        sample_ratio: float = None,
+        max_scan_keys: int = None,
+        scan_count: int = 1000,
+        top_n: int = 5,
+    ):
+        self.sample_ratio = settings.REDIS_KEYSPACE_SAMPLE_RATIO if sample_ratio is None else sample_ratio
+        self.max_scan_keys = settings.REDIS_KEYSPACE_MAX_SCAN_KEYS if max_scan_keys is None else max_scan_keys
+        self.scan_count = scan_count
+        self.top_n = top_n
+        self.cluster_name = get_cluster().name
+
+        # db -> (用于获取连接的 backend, key 族匹配器)
+        families_by_db = defaultdict(list)
+        backend_by_db = {}
+        for family in get_key_families():
+            db = CACHE_BACKEND_CONF_MAP.get(family.backend, {}).get("db", 0)
+            families_by_db[db].append(family)
+            backend_by_db.setdefault(db, family.backend)
+        self.db_matchers = {
+            db: (backend_by_db[db], KeyFamilyMatcher(families)) for db, families in families_by_db.items()
+        }
+
+    def get_nodes(self):
+        return CacheNode.objects.filter(is_enable=True, cluster_name=self.cluster_name)
+
+    def profile(self) -> dict[str, dict[int, dict[str, KeyFamilyStats]]]:
+        """
+        分析当前集群所有节点
+        :return: {节点: {db: {key 族: 统计结果}}}
+        """
+        result = {}
+        for node in self.get_nodes():
+            try:
+                result[str(node)] = self.profile_node(node)
+            except Exception as e:  # noqa
+                logger.exception("[redis keyspace] profile node(%s) failed: %s", node, e)
+        return result
+
+    def profile_node(self, node) -> dict[int, dict[str, KeyFamilyStats]]:
+        result = {}
+        for db, (backend, matcher) in self.db_matchers.items():
+            client = RedisProxy(backend).get_client(node)
+            start_time = time.time()
+            result[db] = self.profile_db(client, matcher)
+            logger.info(
+                "[redis keyspace] node(%s) db(%s) scanned keys(%s) in %.2fs",
+                node,
+                db,
+                sum(stats.count for stats in result[db].values()),
+                time.time() - start_time,
+            )
+        return result
+
+    def profile_db(self, client, matcher: KeyFamilyMatcher) -> dict[str, KeyFamilyStats]:
+        stats: dict[str, KeyFamilyStats] = defaultdict(KeyFamilyStats)
+        samples = []
+        scanned = 0
+        for key in client.scan_iter(match=f"{cache_key.PUBLIC_KEY_PREFIX}*", count=self.scan_count):
+            scanned += 1
+            if self.max_scan_keys and scanned > self.max_scan_keys:
+                logger.warning("[redis keyspace] scanned keys exceed %s, stop scanning", self.max_scan_keys)
+                break
+
+            family = matcher.match(key)
+            family_name = family.name if family else UNKNOWN_FAMILY
+            family_stats = stats[family_name]
+            family_stats.count += 1
+            if family:
+                strategy_id = family.get_strategy_id(key)
+                if strategy_id:
+                    family_stats.strategies[strategy_id] += 1
+
+            if random.random() < self.sample_ratio:
+                samples.append((family_name, key))
+                if len(samples) >= self.SAMPLE_BATCH_SIZE:
+                    self.sample_keys(client, samples, stats)
+                    samples = []
+        if samples:
+            self.sample_keys(client, samples, stats)
+        return stats
+
+    def sample_keys(self, client, samples: list[tuple[str, str]], stats: dict[str, KeyFamilyStats]):
+        """批量获取抽样 key 的内存占用及 TTL"""
+        pipeline = client.pipeline(transaction=False)
+        for _, key in samples:
+            pipeline.memory_usage(key)
+            pipeline.ttl(key)
+        results = pipeline.execute(raise_on_error=False)
+        for index, (family_name, _) in enumerate(samples):
+            memory, ttl = results[index * 2], results[index * 2 + 1]
+            # key 在 SCAN 之后已过期
+            if not isinstance(memory, int) or isinstance(ttl, Exception):
+                continue
+            family_stats = stats[family_name]
+            family_stats.sampled += 1
+            family_stats.sampled_memory += memory
+            family_stats.ttl_distribution[get_ttl_range(ttl)] += 1
+
+    def report(self, result: dict[str, dict[int, dict[str, KeyFamilyStats]]]):
+        """将分析结果写入自监控指标"""
+        for node, db_stats in result.items():
+            for db, family_stats in db_stats.items():
+                for family_name, stats in family_stats.items():
+                    labels = {"cluster_name": self.cluster_name, "node": node, "db": db, "family": family_name}
+                    metrics.REDIS_KEYSPACE_KEY_COUNT.labels(**labels).set(stats.count)
+                    metrics.REDIS_KEYSPACE_MEMORY_BYTES.labels(**labels).set(stats.memory)
+                    for ttl_range, count in stats.get_ttl_distribution().items():
+                        metrics.REDIS_KEYSPACE_TTL_KEY_COUNT.labels(**labels, ttl_range=ttl_range).set(count)
+                    for strategy_id, count in stats.strategies.most_common(self.top_n):
+                        metrics.REDIS_KEYSPACE_STRATEGY_KEY_COUNT.labels(**labels, strategy_id=strategy_id).set(count)
+
+    def collect_keyspace_metric_data(self):
+        # 与 redis 指标采集一致，这里不主动上报，由异步任务框架执行完成后统一上报
+        self.report(self.profile())
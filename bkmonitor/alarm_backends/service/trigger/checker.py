@@ -20,6 +20,7 @@ from alarm_backends.core.control.record_parser import RecordParser
 from alarm_backends.core.control.strategy import Strategy
 from alarm_backends.core.detect_result import ANOMALY_LABEL
 from bkmonitor.models import AnomalyRecord
+from bkmonitor.utils.common_utils import chunks
 
 logger = logging.getLogger("trigger")
 
@@ -54,6 +55,36 @@ class AnomalyChecker(object):
         # shortcut
         self.dimensions_md5 = self.record_parser.dimensions_md5
         self.source_time = self.record_parser.source_time
+        # 预拉取的检测结果，{(check_cache_key, min_score, max_score): check_results}
+        self.prefetched_check_results = {}
+
+    @classmethod
+    def prefetch_check_results(cls, checkers, chunk_size=1000):
+        """
+        批量预拉取检测窗口数据
+        将一批异常点所有级别需要的检测窗口去重后，按 chunk_size 分批通过 pipeline 拉取，
+        避免每个异常点每个级别都单独发起一次 ZRANGEBYSCORE 请求
+        :param list[AnomalyChecker] checkers: 异常检测器列表
+        :param int chunk_size: 单个 pipeline 的命令数量
+        """
+        window_checkers = {}
+        for checker in checkers:
+            for level in checker.point["anomaly"]:
+                trigger_config = checker.get_trigger_config(str(level))
+                if not trigger_config:
+                    continue
+                window = checker.get_check_window(str(level), trigger_config)
+                window_checkers.setdefault(window, []).append(checker)
+
+        for chunk_windows in chunks(list(window_checkers.keys()), chunk_size):
+            pipeline = CHECK_RESULT_CACHE_KEY.client.pipeline(transaction=False)
+            for check_cache_key, min_score, max_score in chunk_windows:
+                pipeline.zrangebyscore(name=check_cache_key, min=min_score, max=max_score, withscores=True)
+            results = pipeline.execute()
+
+            for window, check_results in zip(chunk_windows, results):
+                for checker in window_checkers[window]:
+                    checker.prefetched_check_results[window] = check_results or []
 
     @staticmethod
     def is_no_data_point(point):
@@ -165,39 +196,61 @@ class AnomalyChecker(object):
                 anomaly_level = level
         return anomaly_level, anomaly_timestamps
 
-    def _check_anomaly_by_level(self, level):
+    def get_trigger_config(self, level):
         """
-        检测某个级别的异常点是否满足触发条件
+        获取某个级别的触发配置
         :param str level: 告警级别
-        :return: 二元组：是否被触发，异常次数
+        :return: 触发配置，不存在时返回 None
         """
         try:
-            trigger_config = self.trigger_configs[level]
+            return self.trigger_configs[level]
         except KeyError:
             trigger_configs = self.trigger_configs.values()
             if not trigger_configs:
                 # 如果该等级没有在策略中配置，则不检测
-                logger.error(
-                    "strategy({}), item({}) level({}) trigger config not exists".format(
-                        self.strategy_id, self.item_id, level
-                    )
-                )
-                return False, []
+                return None
 
             # 默认兜底，trigger 配置当前所有告警级别默认一致
-            trigger_config = list(trigger_configs)[0]
+            return list(trigger_configs)[0]
 
+    def get_check_window(self, level, trigger_config):
+        """
+        获取检测窗口，时间范围为source_time前后的一个窗口偏移量
+        :return: 三元组：检测结果缓存key，窗口开始时间，窗口结束时间
+        """
         check_cache_key = CHECK_RESULT_CACHE_KEY.get_key(
             strategy_id=self.strategy_id,
             item_id=self.item_id,
             dimensions_md5=self.dimensions_md5,
             level=level,
         )
-        # 在对应的打点队列中取出打点信息。时间范围为source_time前后的一个窗口偏移量
         check_window_offset = trigger_config["check_window_size"] * self.check_window_unit - 1
-        check_results = CHECK_RESULT_CACHE_KEY.client.zrangebyscore(
-            name=check_cache_key, min=self.source_time - check_window_offset, max=self.source_time, withscores=True
-        )
+        return check_cache_key, self.source_time - check_window_offset, self.source_time
+
+    def _check_anomaly_by_level(self, level):
+        """
+        检测某个级别的异常点是否满足触发条件
+        :param str level: 告警级别
+        :return: 二元组：是否被触发，异常次数
+        """
+        trigger_config = self.get_trigger_config(level)
+        if not trigger_config:
+            logger.error(
+                "strategy({}), item({}) level({}) trigger config not exists".format(
+                    self.strategy_id, self.item_id, level
+                )
+            )
+            return False, []
+
+        # 在对应的打点队列中取出打点信息，优先使用批量预拉取的结果
+        window = self.get_check_window(level, trigger_config)
+        if window in self.prefetched_check_results:
+            check_results = self.prefetched_check_results[window]
+        else:
+            check_cache_key, min_score, max_score = window
+            check_results = CHECK_RESULT_CACHE_KEY.client.zrangebyscore(
+                name=check_cache_key, min=min_score, max=max_score, withscores=True
+            )
         # 统计包含异常标记的key的数量，并与trigger_count进行比较
         anomaly_timestamps = []
         for label, score in check_results:
@@ -12,6 +12,8 @@ import json
 import logging
 import time
 
+from django.conf import settings
+
 from alarm_backends.core.alert.adapter import MonitorEventAdapter
 from alarm_backends.core.cache.key import ANOMALY_LIST_KEY, ANOMALY_SIGNAL_KEY, TRIGGER_EVENT_RATE_LIMIT_KEY
 from alarm_backends.core.control.strategy import Strategy
@@ -29,6 +31,8 @@ logger = logging.getLogger("trigger")
 class TriggerProcessor:
     # 单次处理量(默认为全量处理)
     MAX_PROCESS_COUNT = 0
+    # 批量预拉取检测结果时，单个 pipeline 的命令数量
+    CHECK_RESULT_PREFETCH_CHUNK_SIZE = 1000
 
     def __init__(self, strategy_id, item_id):
         self.strategy_id = int(strategy_id)
@@ -270,6 +274,8 @@ class TriggerProcessor:
         in_alarm_time, message = self.strategy.in_alarm_time()
         if not in_alarm_time:
             logger.info("[trigger] strategy(%s) not in alarm time: %s, skipped", self.strategy_id, message)
+        elif settings.TRIGGER_BATCH_CHECK_ENABLED:
+            self.process_points(self.anomaly_points)
         else:
             for point in self.anomaly_points:
                 try:
@@ -280,10 +286,42 @@ class TriggerProcessor:
 
         self.push()
 
-    def process_point(self, point):
+    def process_points(self, points):
+        """
+        批量处理异常点：先批量预拉取所有异常点的检测窗口，再在内存中逐个判断是否满足触发条件
+        """
+        checkers = []
+        for point in points:
+            try:
+                checkers.append(self.get_checker(point))
+            except Exception as e:
+                error_message = f"[process error] strategy({self.strategy_id}), item({self.item_id}) reason: {e} \norigin data: {point}"
+                logger.exception(error_message)
+
+        try:
+            AnomalyChecker.prefetch_check_results(checkers, self.CHECK_RESULT_PREFETCH_CHUNK_SIZE)
+        except Exception as e:
+            # 预拉取失败时，检测器会逐个查询检测窗口
+            logger.exception(
+                f"[prefetch check results error] strategy({self.strategy_id}), item({self.item_id}) reason: {e}"
+            )
+
+        for checker in checkers:
+            try:
+                self.check(checker)
+            except Exception as e:
+                error_message = f"[process error] strategy({self.strategy_id}), item({self.item_id}) reason: {e} \norigin data: {checker.point}"
+                logger.exception(error_message)
+
+    def get_checker(self, point):
         point = json.loads(point)
         strategy = self.get_strategy_snapshot(point["strategy_snapshot_key"])
-        checker = AnomalyChecker(point, strategy, self.item_id)
+        return AnomalyChecker(point, strategy, self.item_id)
+
+    def process_point(self, point):
+        self.check(self.get_checker(point))
+
+    def check(self, checker):
         anomaly_records, event_record = checker.check()
 
         # 暂存结果，最后批量保存
@@ -0,0 +1,93 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from unittest import mock
+
+from alarm_backends.core.cache.strategy import LocalStrategyCache, StrategyCacheManager
+from alarm_backends.core.control.item import Item
+
+
+class TestLocalStrategyCache:
+    def test_get(self, settings):
+        settings.STRATEGY_LOCAL_CACHE_EPOCH_CHECK_INTERVAL = 0
+        settings.STRATEGY_LOCAL_CACHE_SUBSCRIBE_ENABLED = False
+        settings.STRATEGY_LOCAL_CACHE_MAX_SIZE = 2
+        loader = mock.MagicMock(side_effect=lambda strategy_id: {"id": int(strategy_id)})
+        cache = LocalStrategyCache()
+
+        with mock.patch.object(StrategyCacheManager, "get_epoch", return_value="1"):
+            assert cache.get(1, loader) == {"id": 1}
+            assert cache.get("1", loader) == {"id": 1}
+            assert loader.call_count == 1
+
+            # 超过最大数量时淘汰最久未使用的策略
+            cache.get(2, loader)
+            cache.get(3, loader)
+            assert list(cache.configs.keys()) == ["2", "3"]
+
+        # 版本号变更后清空缓存
+        with mock.patch.object(StrategyCacheManager, "get_epoch", return_value="2"):
+            cache.get(3, loader)
+            assert list(cache.configs.keys()) == ["3"]
+            assert loader.call_count == 4
+
+    def test_get__shared(self, settings):
+        settings.STRATEGY_LOCAL_CACHE_EPOCH_CHECK_INTERVAL = 0
+        settings.STRATEGY_LOCAL_CACHE_SUBSCRIBE_ENABLED = False
+        settings.STRATEGY_LOCAL_CACHE_MAX_SIZE = 2
+        loader = mock.MagicMock(return_value={"id": 1, "items": [{"query_configs": [{"agg_dimension": ["ip"]}]}]})
+        cache = LocalStrategyCache()
+
+        with mock.patch.object(StrategyCacheManager, "get_epoch", return_value="1"):
+            # 命中时直接返回共享的策略详情，不复制
+            config = cache.get(1, loader)
+            assert cache.get(1, loader) is config
+            assert loader.call_count == 1
+
+        # 监控项复制查询配置后再修改，不影响共享的策略详情
+        strategy = mock.MagicMock(config=config, bk_biz_id=2, bk_tenant_id="system")
+        query_config = {"data_source_label": "bk_monitor", "data_type_label": "time_series", "agg_dimension": ["ip"]}
+        config["items"][0].update({"target": [[{"field": "ip"}]], "query_configs": [query_config]})
+        with (
+            mock.patch("alarm_backends.core.control.item.load_data_source"),
+            mock.patch("alarm_backends.core.control.item.UnifyQuery"),
+        ):
+            item = Item(config["items"][0], strategy)
+            item.query_configs[0]["agg_dimension"] = ["ip", "bk_cloud_id"]
+        assert item.query_configs[0]["target"] == [[{"field": "ip"}]]
+        assert config["items"][0]["query_configs"] == [
+            {"data_source_label": "bk_monitor", "data_type_label": "time_series", "agg_dimension": ["ip"]}
+        ]
+
+    def test_apply_changes(self):
+        cache = LocalStrategyCache()
+        cache.epoch = "1"
+        cache.configs.update({"1": {"id": 1}, "2": {"id": 2}, "3": {"id": 3}})
+
+        # 版本号连续时按策略ID失效
+        cache.apply_changes({"epoch": "2", "strategy_ids": [1]})
+        assert list(cache.configs.keys()) == ["2", "3"]
+        assert cache.epoch == "2"
+
+        # 已感知的旧版本通知只做失效，不回退版本号
+        cache.apply_changes({"epoch": "2", "strategy_ids": [2]})
+        assert list(cache.configs.keys()) == ["3"]
+        assert cache.epoch == "2"
+
+        # 版本号不连续说明有通知丢失，清空缓存
+        cache.configs["4"] = {"id": 4}
+        cache.apply_changes({"epoch": "4", "strategy_ids": [5]})
+        assert not cache.configs
+        assert cache.epoch == "4"
+
+        # 未指定策略ID时清空缓存
+        cache.configs["4"] = {"id": 4}
+        cache.apply_changes({"epoch": "5", "strategy_ids": None})
+        assert not cache.configs
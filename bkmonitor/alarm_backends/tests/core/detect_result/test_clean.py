@@ -9,13 +9,15 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
+from unittest.mock import MagicMock, patch
 
 import arrow
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
-from alarm_backends.constants import LATEST_POINT_WITH_ALL_KEY
+from alarm_backends.constants import LATEST_NO_DATA_CHECK_POINT, LATEST_POINT_WITH_ALL_KEY
 from alarm_backends.core.cache import key
 from alarm_backends.core.detect_result import CheckResult
+from alarm_backends.core.detect_result.clean import CleanResult
 from alarm_backends.tests.core.detect_result.mock import *  # noqa
 from alarm_backends.tests.core.detect_result.mock_settings import *  # noqa
 from bkmonitor.models import CacheNode
@@ -142,3 +144,61 @@ class TestCleanResult(TestCase):
             all_members,
             ["{}|{}".format(self.three_hours_ago, "ANOMALY"), "{}|{}".format(self.now_timestamp, "ANOMALY")],
         )
+
+    def assert_clean_item_detect_result(self, clean_item):
+        strategy_id = self.strategies[0]["id"]
+        item = self.strategies[0]["items"][0]
+        last_checkpoints_cache_key = key.LAST_CHECKPOINTS_CACHE_KEY.get_key(strategy_id=strategy_id, item_id=item["id"])
+        CheckResult.update_last_checkpoint_by_d_md5(
+            strategy_id, item["id"], LATEST_NO_DATA_CHECK_POINT, self.now_timestamp, "1"
+        )
+        check_result_cache_keys = [
+            key.CHECK_RESULT_CACHE_KEY.get_key(
+                strategy_id=strategy_id,
+                item_id=item["id"],
+                dimensions_md5=algorithm["dimensions_md5"],
+                level=algorithm["level"],
+            )
+            for algorithm in item["algorithms"]
+        ]
+
+        # 保留最近一个点，仍有检测结果的维度保留最后检测时间点，没有检测结果的汇总维度被删除
+        clean_item(strategy_id, item["id"], 2)
+        for check_result_cache_key in check_result_cache_keys:
+            self.assertEqual(
+                key.CHECK_RESULT_CACHE_KEY.client.zrange(check_result_cache_key, 0, -1),
+                ["{}|{}".format(self.now_timestamp, "ANOMALY")],
+            )
+        self.assertEqual(len(key.LAST_CHECKPOINTS_CACHE_KEY.client.hkeys(last_checkpoints_cache_key)), 3)
+
+        # 检测结果被清空的维度同步删除最后检测时间点，无数据检测点不删除
+        clean_item(strategy_id, item["id"], 1)
+        for check_result_cache_key in check_result_cache_keys:
+            self.assertEqual(key.CHECK_RESULT_CACHE_KEY.client.zcard(check_result_cache_key), 0)
+        self.assertEqual(
+            key.LAST_CHECKPOINTS_CACHE_KEY.client.hkeys(last_checkpoints_cache_key),
+            [key.LAST_CHECKPOINTS_CACHE_KEY.get_field(dimensions_md5=LATEST_NO_DATA_CHECK_POINT, level="1")],
+        )
+
+        # 其他监控项不受影响
+        other_check_result_cache_key = key.CHECK_RESULT_CACHE_KEY.get_key(
+            strategy_id=strategy_id,
+            item_id=self.strategies[0]["items"][1]["id"],
+            dimensions_md5=self.strategies[0]["items"][1]["algorithms"][0]["dimensions_md5"],
+            level=self.strategies[0]["items"][1]["algorithms"][0]["level"],
+        )
+        self.assertEqual(key.CHECK_RESULT_CACHE_KEY.client.zcard(other_check_result_cache_key), 2)
+
+    def test_clean_item_detect_result(self):
+        self.assert_clean_item_detect_result(CleanResult.clean_item_detect_result)
+
+    @override_settings(DETECT_RESULT_CLEAN_SCAN_COUNT=1)
+    def test_clean_item_detect_result_by_script(self):
+        rate_limiter = MagicMock()
+
+        def clean_item(strategy_id, item_id, point_remain):
+            CleanResult.clean_item_detect_result_by_script(strategy_id, item_id, point_remain, rate_limiter)
+
+        self.assert_clean_item_detect_result(clean_item)
+        # 两次清理共扫描 5 + 3 个维度
+        self.assertEqual(sum(call[0][0] for call in rate_limiter.acquire.call_args_list), 8)
@@ -0,0 +1,160 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from redis.exceptions import ConnectionError, ResponseError
+
+from alarm_backends.core.storage.redis_cluster import RedisProxy
+
+
+class StrategyKey(str):
+    def __new__(cls, value, strategy_id):
+        obj = super().__new__(cls, value)
+        obj.strategy_id = strategy_id
+        return obj
+
+
+class FakePipeline:
+    """
+    记录命令的 pipeline，execute 时返回 "节点ID:命令:key"，命令名在 failed_commands 中时返回错误
+    """
+
+    def __init__(self, node_id, failed_commands=()):
+        self.node_id = node_id
+        self.failed_commands = failed_commands
+        self.commands = []
+        self.executed = []
+        self.connection_error = False
+
+    def __len__(self):
+        return len(self.commands)
+
+    def __getattr__(self, name):
+        def command(key, *args):
+            self.commands.append((name, key))
+            return self
+
+        return command
+
+    def execute(self, raise_on_error=True):
+        commands, self.commands = self.commands, []
+        if self.connection_error:
+            raise ConnectionError("connection refused")
+        self.executed.append(commands)
+        results = []
+        for name, key in commands:
+            if name in self.failed_commands:
+                error = ResponseError(f"{name} failed")
+                if raise_on_error:
+                    raise error
+                results.append(error)
+            else:
+                results.append(f"{self.node_id}:{name}:{key}")
+        return results
+
+    def reset(self):
+        self.commands = []
+
+
+@pytest.fixture
+def pipelines():
+    # 奇数策略路由到节点1，偶数策略路由到节点2
+    pipelines = {1: FakePipeline(1, failed_commands=("ltrim",)), 2: FakePipeline(2)}
+    with (
+        mock.patch(
+            "alarm_backends.core.storage.redis_cluster.get_node_by_strategy_id",
+            side_effect=lambda strategy_id: SimpleNamespace(id=2 - strategy_id % 2),
+        ),
+        mock.patch.object(
+            RedisProxy,
+            "get_client",
+            side_effect=lambda node: mock.MagicMock(pipeline=lambda *args, **kwargs: pipelines[node.id]),
+        ),
+    ):
+        yield pipelines
+
+
+class TestBatchPipelineProxy:
+    def test_batch(self, pipelines):
+        proxy = RedisProxy("service")
+        with proxy.batch(max_size=100, max_delay=60) as batch:
+            results = [batch.lpush(StrategyKey(f"key{strategy_id}", strategy_id), "v") for strategy_id in range(1, 5)]
+            # 退出上下文前不会提交
+            assert not pipelines[1].executed and not pipelines[2].executed
+
+        # 跨策略的命令按节点合并，每个节点一次往返，结果按命令下发顺序对齐
+        assert pipelines[1].executed == [[("lpush", "key1"), ("lpush", "key3")]]
+        assert pipelines[2].executed == [[("lpush", "key2"), ("lpush", "key4")]]
+        assert [result.get() for result in results] == ["1:lpush:key1", "2:lpush:key2", "1:lpush:key3", "2:lpush:key4"]
+
+    def test_flush(self, pipelines):
+        proxy = RedisProxy("service")
+        with proxy.batch(max_size=2, max_delay=60) as batch:
+            batch.lpush(StrategyKey("key1", 1), "v")
+            batch.lpush(StrategyKey("key3", 3), "v")
+            # 达到最大命令数时提交
+            assert pipelines[1].executed == [[("lpush", "key1"), ("lpush", "key3")]]
+
+            # 读取未提交的结果时提交
+            result = batch.expire(StrategyKey("key2", 2), 60)
+            assert result.get() == "2:expire:key2"
+            assert pipelines[2].executed == [[("expire", "key2")]]
+
+        with proxy.batch(max_size=100, max_delay=0) as batch:
+            # 超过最长等待时间时提交
+            batch.lpush(StrategyKey("key5", 5), "v")
+            assert pipelines[1].executed[-1] == [("lpush", "key5")]
+
+    def test_command_error(self, pipelines):
+        proxy = RedisProxy("service")
+        callback_values = []
+        with proxy.batch(max_size=100, max_delay=60) as batch:
+            lpush_result = batch.lpush(StrategyKey("key1", 1), "v")
+            ltrim_result = batch.ltrim(StrategyKey("key1", 1), 0, 10)
+            expire_result = batch.expire(StrategyKey("key2", 2), 60)
+            batch.add_callback(
+                lambda: callback_values.extend(result.value for result in [lpush_result, ltrim_result, expire_result])
+            )
+
+        # 单条命令失败不影响同批次的其他命令，回调可以拿到每条命令的错误
+        assert lpush_result.get() == "1:lpush:key1"
+        assert expire_result.get() == "2:expire:key2"
+        with pytest.raises(ResponseError):
+            ltrim_result.get()
+        assert isinstance(callback_values[1], ResponseError)
+
+    def test_connection_error(self, pipelines):
+        proxy = RedisProxy("service")
+        batch_context = proxy.batch(max_size=100, max_delay=60)
+        batch = batch_context.__enter__()
+        callback = mock.MagicMock()
+
+        # 节点1提交失败，节点2的命令尚未提交
+        pipelines[1].connection_error = True
+        failed_results = [batch.lpush(StrategyKey("key1", 1), "v"), batch.lpush(StrategyKey("key2", 2), "v")]
+        batch.add_callback(callback)
+        with pytest.raises(ConnectionError):
+            batch.flush()
+
+        # 提交失败时所有命令的结果均为该异常，回调仍会执行
+        callback.assert_called_once()
+        for result in failed_results:
+            with pytest.raises(ConnectionError):
+                result.get()
+
+        # 复用批次时不会残留上次的命令，结果不会错位
+        pipelines[1].connection_error = False
+        results = [batch.lpush(StrategyKey("key4", 4), "v"), batch.lpush(StrategyKey("key3", 3), "v")]
+        batch_context.__exit__(None, None, None)
+        assert [result.get() for result in results] == ["2:lpush:key4", "1:lpush:key3"]
+        assert pipelines[2].executed == [[("lpush", "key4")]]
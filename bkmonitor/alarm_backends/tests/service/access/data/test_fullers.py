@@ -18,7 +18,7 @@ from alarm_backends.core.control.strategy import Strategy
 from alarm_backends.service.access.data.fullers import TopoNodeFuller
 from alarm_backends.service.access.data.records import DataRecord
 
-from .config import RAW_DATA, STRATEGY_CONFIG
+from .config import RAW_DATA, RAW_DATA_ZERO, STRATEGY_CONFIG
 
 
 class MockTopoNode(object):
@@ -86,3 +86,31 @@ class TestTopoNodeFuller(object):
         assert service_topo_node == ["biz|2", "module|1", "set|1"]
 
         assert record.dimensions["bk_host_id"] == 0
+
+    def test_prefetch(self, mocker, settings):
+        settings.ACCESS_CMDB_LOCAL_CACHE_TTL = 0
+        mocker.patch.object(StrategyCacheManager, "get_strategy_by_id", return_value=copy.deepcopy(STRATEGY_CONFIG))
+        host = MockHost({"module|1": [MockTopoNode("biz|2"), MockTopoNode("module|1"), MockTopoNode("set|1")]})
+        mget = mocker.patch.object(HostManager, "mget", return_value={"127.0.0.1|0": host})
+        get = mocker.patch.object(HostManager, "get")
+
+        strategy = Strategy(1)
+        strategy.config["scenario"] = "os"
+        records = [
+            DataRecord(strategy.items[0], copy.deepcopy(RAW_DATA)),
+            DataRecord(strategy.items[0], copy.deepcopy(RAW_DATA)),
+            DataRecord(strategy.items[0], copy.deepcopy(RAW_DATA_ZERO)),
+        ]
+
+        f = TopoNodeFuller()
+        f.prefetch(records)
+        for record in records:
+            f.full(record)
+
+        # 同一批次的主机只查询一次，不存在的主机也不会再单独查询
+        mget.assert_called_once()
+        assert sorted(mget.call_args.kwargs["host_keys"]) == ["127.0.0.1|0", "127.0.0.2|0"]
+        get.assert_not_called()
+        assert sorted(records[0].dimensions["bk_topo_node"]) == ["biz|2", "module|1", "set|1"]
+        assert sorted(records[1].dimensions["bk_topo_node"]) == ["biz|2", "module|1", "set|1"]
+        assert "bk_topo_node" not in records[2].dimensions
@@ -8,9 +8,7 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
-import base64
 import copy
-import gzip
 import json
 import time
 from collections import defaultdict
@@ -20,7 +18,7 @@ import pytest
 from django.conf import settings
 
 from alarm_backends.core.cache import key
-from alarm_backends.service.access.data import AccessBatchDataProcess, AccessDataProcess
+from alarm_backends.service.access.data import AccessBatchDataProcess, AccessDataProcess, batch
 from bkmonitor.models import CacheNode
 from bkmonitor.utils.common_utils import count_md5
 
@@ -86,6 +84,17 @@ class TestAccessDataProcess:
         assert mock_records.call_count == 1
         assert mock_strategy_group.call_count == 1
 
+    def test_batch_frame(self):
+        points = [
+            {"bk_target_ip": "127.0.0.1", "_time_": 1569246420, "_result_": 1},
+            {"bk_target_ip": "127.0.0.1", "_time_": 1569246480, "_result_": None},
+            {"bk_target_ip": "127.0.0.2", "tags": ["a"], "_time_": 1569246420, "_result_": 2.5},
+            {"bk_target_ip": "127.0.0.2", "_time_": 1569246480},
+        ]
+        frames = batch.encode_frames(points, frame_size=3)
+        assert len(frames) == 2
+        assert [point for frame in frames for point in batch.decode_frame(frame)] == points
+
     @mock.patch(
         "alarm_backends.core.cache.strategy.StrategyCacheManager.get_strategy_by_id", return_value=STRATEGY_CONFIG_V3
     )
@@ -99,14 +108,14 @@ class TestAccessDataProcess:
         acc_data = AccessDataProcess(strategy_group_key)
         settings.ACCESS_DATA_BATCH_PROCESS_THRESHOLD = 2
         settings.ACCESS_DATA_BATCH_PROCESS_SIZE = 1
+        settings.ACCESS_DATA_STREAMING_QUERY_ENABLED = False
         acc_data.pull()
 
         c = key.ACCESS_BATCH_DATA_KEY.client
         data_key = key.ACCESS_BATCH_DATA_KEY.get_key(
             strategy_group_key=strategy_group_key, sub_task_id=f"{acc_data.batch_timestamp}.2"
         )
-        data = c.get(data_key)
-        result = json.loads(gzip.decompress(base64.b64decode(data)).decode("utf-8"))
+        result = [point for frame in c.lrange(data_key, 0, -1) for point in batch.decode_frame(frame)]
         assert len(result) == 2
         assert (
             json.dumps(result[0], sort_keys=True) == '{"_result_": 0, "_time_": 1569246420, "bk_target_cloud_id":'
@@ -129,6 +138,35 @@ class TestAccessDataProcess:
         )
         assert len(result) == 1
 
+    @mock.patch(
+        "alarm_backends.core.cache.strategy.StrategyCacheManager.get_strategy_by_id", return_value=STRATEGY_CONFIG_V3
+    )
+    @mock.patch(
+        "alarm_backends.core.cache.strategy.StrategyCacheManager.get_strategy_group_detail", return_value={"1": [1]}
+    )
+    @mock.patch("alarm_backends.service.access.tasks.run_access_batch_data")
+    def test_pull_batch_streaming(self, mock_batch, mock_strategy_group, mock_strategy):
+        strategy_group_key = "123456789"
+        acc_data = AccessDataProcess(strategy_group_key)
+        settings.ACCESS_DATA_BATCH_PROCESS_THRESHOLD = 2
+        settings.ACCESS_DATA_BATCH_PROCESS_SIZE = 1
+        settings.ACCESS_DATA_STREAMING_QUERY_ENABLED = True
+        chunks = iter([[copy.deepcopy(RAW_DATA)], [copy.deepcopy(RAW_DATA_ZERO), copy.deepcopy(RAW_DATA_NONE)]])
+        with mock.patch("alarm_backends.core.control.item.Item.query_record_chunks", return_value=chunks):
+            acc_data.pull()
+
+        # 第一个分块原地处理，超过阈值的第二个分块下发分批任务
+        assert acc_data.batch_count == 2
+        assert len(acc_data.record_list) == 1
+        assert mock_batch.delay.call_count == 1
+
+        c = key.ACCESS_BATCH_DATA_KEY.client
+        data_key = key.ACCESS_BATCH_DATA_KEY.get_key(
+            strategy_group_key=strategy_group_key, sub_task_id=f"{acc_data.batch_timestamp}.2"
+        )
+        result = [point for frame in c.lrange(data_key, 0, -1) for point in batch.decode_frame(frame)]
+        assert result == [RAW_DATA_ZERO, RAW_DATA_NONE]
+
     @mock.patch(
         "alarm_backends.core.cache.strategy.StrategyCacheManager.get_strategy_by_id", return_value=STRATEGY_CONFIG_V3
     )
@@ -156,7 +194,7 @@ class TestAccessDataProcess:
         client = key.DATA_LIST_KEY.client
         output_key = key.DATA_LIST_KEY.get_key(strategy_id=strategy_id, item_id=item_id)
         expected_data = copy.deepcopy(STANDARD_DATA)
-        assert client.rpop(output_key) == json.dumps(expected_data)
+        assert json.loads(client.rpop(output_key)) == expected_data
 
         client = key.NOISE_REDUCE_TOTAL_KEY.client
         noise_dimension_hash = count_md5(["bk_target_ip", "bk_target_cloud_id"])
@@ -198,6 +236,42 @@ class TestAccessDataProcess:
         )
         assert client.zrangebyscore(record_key, start_timestamp, int(time.time() + 1)) == []
 
+    hll_strategy_dict = copy.deepcopy(STRATEGY_CONFIG_V3)
+    hll_strategy_dict["notice"]["options"]["noise_reduce_config"]["cardinality_mode"] = "approximate"
+
+    @mock.patch(
+        "alarm_backends.core.cache.strategy.StrategyCacheManager.get_strategy_by_id", return_value=hll_strategy_dict
+    )
+    @mock.patch(
+        "alarm_backends.core.cache.strategy.StrategyCacheManager.get_strategy_group_detail", return_value={"1": [1]}
+    )
+    def test_push_approximate_noise(self, mock_strategy, mock_strategy_group):
+        strategy_id = 1
+        item_id = 1
+        strategy_group_key = "123456789"
+        acc_data = AccessDataProcess(strategy_group_key)
+        record = MockRecord(STANDARD_DATA)
+        record.items = [acc_data.items[0]]
+        record.is_retains = {item_id: True}
+        acc_data.record_list = [
+            record,
+        ]
+        acc_data.push()
+
+        noise_dimension_hash = count_md5(["bk_target_ip", "bk_target_cloud_id"])
+        # 近似模式不再写入有序集合
+        record_key = key.NOISE_REDUCE_TOTAL_KEY.get_key(
+            strategy_id=strategy_id, noise_dimension_hash=noise_dimension_hash
+        )
+        assert key.NOISE_REDUCE_TOTAL_KEY.client.zcard(record_key) == 0
+
+        hll_key = key.NOISE_REDUCE_TOTAL_HLL_KEY.get_key(
+            strategy_id=strategy_id,
+            noise_dimension_hash=noise_dimension_hash,
+            bucket=STANDARD_DATA["time"] // settings.NOISE_REDUCE_HLL_BUCKET_SIZE,
+        )
+        assert key.NOISE_REDUCE_TOTAL_HLL_KEY.client.pfcount(hll_key) == 1
+
 
 class TestLimitRecordsByTimePoints:
     """测试 _limit_records_by_time_points 方法（方案 B：限制处理时间点数量）"""
@@ -11,10 +11,16 @@ specific language governing permissions and limitations under the License.
 
 
 import copy
+import json
 
 from alarm_backends.core.cache.strategy import StrategyCacheManager
 from alarm_backends.core.control.strategy import Strategy
-from alarm_backends.service.access.data.records import DataRecord
+from alarm_backends.service.access.data.records import (
+    DataRecord,
+    decode_record_data,
+    encode_record_data,
+)
+from bkmonitor.utils.common_utils import count_md5, dimension_fingerprint
 
 from .config import FORMAT_RAW_DATA, STANDARD_DATA, STRATEGY_CONFIG_V3
 
@@ -32,3 +38,34 @@ class TestRecords(object):
         record.data.pop("access_time", None)
         record.data.pop("dimension_fields", None)
         assert record.data == STANDARD_DATA
+
+    def test_dimension_fingerprint(self):
+        dimensions_list = [
+            {},
+            {"bk_target_ip": "127.0.0.1", "bk_target_cloud_id": 0, "device_name": None, "value": 1.5, "flag": True},
+            {"tags": ["a", "b"], "extra": {"k": "v"}},
+        ]
+        for dimensions in dimensions_list:
+            assert dimension_fingerprint(dimensions) == count_md5(dimensions)
+
+        assert dimension_fingerprint({"a": 1, "b": "2"}, legacy=False) == dimension_fingerprint(
+            {"b": "2", "a": 1}, legacy=False
+        )
+        assert dimension_fingerprint({"a": 1}, legacy=False) != dimension_fingerprint({"a": 2}, legacy=False)
+
+    def test_record_data_codec(self):
+        data = {
+            "record_id": "f7659f5811a0e187c71d119c7d625f23.1569246480",
+            "value": 1.38,
+            "values": {"timestamp": 1569246480, "load5": 1.38},
+            "dimensions": {"bk_target_ip": "127.0.0.1", "url": "http://127.0.0.1/a", "name": "中文"},
+            "time": 1569246480,
+        }
+        payload = encode_record_data(data)
+        assert json.loads(payload) == data
+        assert decode_record_data(payload) == data
+        assert decode_record_data(payload.encode("utf-8")) == data
+        # 兼容 json.dumps 编码的历史数据
+        assert decode_record_data(json.dumps(data)) == data
+        # 超出 ujson 编码范围的数据回退到 json.dumps
+        assert decode_record_data(encode_record_data({"value": 2**70})) == {"value": 2**70}
@@ -9,6 +9,8 @@ specific language governing permissions and limitations under the License.
 """
 
 import json
+import queue
+import threading
 import time
 
 from unittest import mock
@@ -18,8 +20,9 @@ from elasticsearch.helpers import BulkIndexError
 
 from alarm_backends.core.alert import Alert, Event
 from alarm_backends.core.alert.alert import AlertUIDManager
-from alarm_backends.core.cache.key import ALERT_DEDUPE_CONTENT_KEY, ALERT_SNAPSHOT_KEY
+from alarm_backends.core.cache.key import ALERT_DEDUPE_CONTENT_KEY, ALERT_EVENT_UID_KEY, ALERT_SNAPSHOT_KEY
 from alarm_backends.service.alert.builder.processor import AlertBuilder
+from alarm_backends.service.alert.builder.writer import EventBulkWriter
 from api.cmdb.define import Host
 from bkmonitor.models import CacheNode
 from constants.data_source import KubernetesResultTableLabel
@@ -622,6 +625,114 @@ class TestProcessor(TestCase):
 
         self.assertEqual(0, len(result))
 
+    @mock.patch("bkmonitor.documents.base.BaseDocument.bulk_create")
+    def test_save_events__async(self, bulk_create):
+        documents = []
+        write_event = threading.Event()
+
+        def mock_bulk_create(docs, *args, **kwargs):
+            write_event.wait(5)
+            errors = []
+            for doc in docs:
+                if doc.id in {document.id for document in documents}:
+                    errors.append({"create": {"_index": "fta-test", "_id": doc.id, "status": 409}})
+                elif doc.event_id == "4":
+                    errors.append({"create": {"_index": "fta-test", "_id": doc.id, "status": 400}})
+                else:
+                    documents.append(doc)
+            if errors:
+                raise BulkIndexError(f"{len(errors)} document(s) failed to index.", errors)
+
+        bulk_create.side_effect = mock_bulk_create
+
+        def make_event(event_id):
+            return Event(
+                {
+                    "event_id": event_id,
+                    "plugin_id": "fta-test",
+                    "alert_name": "CPU usage high",
+                    "time": 1617504100,
+                    "tags": [{"key": "device", "value": "cpu0"}],
+                    "severity": 1,
+                    "ip": "10.0.0.1",
+                    "dedupe_keys": ["alert_name", "tags.device", "ip"],
+                }
+            )
+
+        event = make_event("3")
+        error_event = make_event("4")
+        writer = EventBulkWriter(queue_size=10, batch_size=10, concurrency=1, max_retries=0)
+        processor = AlertBuilder()
+        with (
+            self.settings(ALERT_EVENT_ASYNC_WRITE_ENABLED=True),
+            mock.patch("alarm_backends.service.alert.builder.processor.EVENT_WRITER", writer),
+        ):
+            # 不等待 ES 写入结果，直接返回去重后的事件
+            result = processor.save_events([event] * 3 + [error_event])
+            # 正在写入的事件视为重复事件
+            pending_result = processor.save_events([event])
+            write_event.set()
+            writer.flush(timeout=5)
+
+            # 写入成功的事件视为重复事件，写入失败的事件可以重新写入
+            duplicate_result = processor.save_events([event, error_event])
+            writer.flush(timeout=5)
+
+        self.assertEqual([event.id, error_event.id], [e.id for e in result])
+        self.assertEqual(0, len(pending_result))
+        self.assertEqual([error_event.id], [e.id for e in duplicate_result])
+        self.assertEqual([event.id], [document.id for document in documents])
+        self.assertEqual(2, bulk_create.call_count)
+
+        keys = [writer.get_uid_key(e.to_document()) for e in [event, error_event]]
+        self.assertEqual([1, 0], [ALERT_EVENT_UID_KEY.client.exists(key) for key in keys])
+        ALERT_EVENT_UID_KEY.client.delete(*keys)
+
+    @mock.patch("bkmonitor.documents.base.BaseDocument.bulk_create")
+    def test_event_writer_backpressure(self, bulk_create):
+        bulk_create.side_effect = BulkIndexError(
+            "1 document(s) failed to index.", [{"create": {"_index": "fta-test", "_id": "2", "status": 400}}]
+        )
+        writer = EventBulkWriter(queue_size=1, batch_size=10, concurrency=1, max_retries=0)
+        writer.load_options()
+        # 队列已满且没有后台线程消费
+        writer.queue = queue.Queue(maxsize=1)
+        writer.queue.put(mock.MagicMock(id="0"))
+
+        # 队列已满的文档由调用方同步写入
+        documents = [mock.MagicMock(id="1", strategy_id=0), mock.MagicMock(id="2", strategy_id=0)]
+        with mock.patch.object(writer, "start"), mock.patch.object(writer, "mark_written") as mark_written:
+            self.assertEqual(2, writer.put(documents, timeout=0))
+        self.assertEqual([["1", "2"]], [[doc.id for doc in call[0][0]] for call in bulk_create.call_args_list])
+        # 写入失败的文档不记录为已写入
+        self.assertEqual([["1"]], [[doc.id for doc in call[0][0]] for call in mark_written.call_args_list])
+        self.assertEqual(set(), writer.pending_ids)
+
+    @mock.patch("alarm_backends.service.alert.builder.writer.time.sleep", mock.MagicMock())
+    @mock.patch("bkmonitor.documents.base.BaseDocument.bulk_create")
+    def test_event_writer_retry(self, bulk_create):
+        documents = [mock.MagicMock(id="1"), mock.MagicMock(id="2"), mock.MagicMock(id="3")]
+        calls = []
+
+        def mock_bulk_create(docs, *args, **kwargs):
+            calls.append([doc.id for doc in docs])
+            if len(calls) == 1:
+                raise BulkIndexError(
+                    "2 document(s) failed to index.",
+                    [
+                        {"create": {"_index": "fta-test", "_id": "1", "status": 409}},
+                        {"create": {"_index": "fta-test", "_id": "2", "status": 429}},
+                    ],
+                )
+
+        bulk_create.side_effect = mock_bulk_create
+
+        conflict_ids, failed_ids = EventBulkWriter(max_retries=3).bulk_create(documents)
+        # 409 冲突不重试，其他错误只重试失败的文档
+        self.assertEqual([["1", "2", "3"], ["2"]], calls)
+        self.assertEqual({"1"}, conflict_ids)
+        self.assertEqual(set(), failed_ids)
+
     @mock.patch("bkmonitor.documents.base.BaseDocument.bulk_create")
     def test_save_alerts(self, bulk_create):
         documents = []
@@ -0,0 +1,74 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import time
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from alarm_backends.core.alert.alert import AlertKey
+from alarm_backends.core.cache.key import ACTIVE_ALERT_TIMER_KEY
+from alarm_backends.service.alert.manager.tasks import check_abnormal_alert
+from alarm_backends.service.alert.manager.timer_wheel import ActiveAlertTimerWheel
+from bkmonitor.models import CacheNode
+
+
+@override_settings(ALERT_TIMER_WHEEL_ENABLED=True)
+class TestActiveAlertTimerWheel(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        CacheNode.refresh_from_settings()
+
+    def setUp(self):
+        ACTIVE_ALERT_TIMER_KEY.client.flushall()
+
+    def tearDown(self):
+        ACTIVE_ALERT_TIMER_KEY.client.flushall()
+
+    def test_pop_due(self):
+        ActiveAlertTimerWheel.add([AlertKey(alert_id="1", strategy_id=11), AlertKey(alert_id="2", strategy_id=None)])
+        now = int(time.time())
+
+        # 未到期
+        self.assertEqual(ActiveAlertTimerWheel.pop_due(now), [])
+
+        # 到期后取出，并顺延到下一周期
+        next_cycle = ActiveAlertTimerWheel.get_next_check_time(now)
+        alerts = ActiveAlertTimerWheel.pop_due(next_cycle)
+        self.assertEqual(
+            sorted(alerts, key=lambda a: a["id"]), [{"id": "1", "strategy_id": 11}, {"id": "2", "strategy_id": None}]
+        )
+        self.assertEqual(ActiveAlertTimerWheel.pop_due(next_cycle), [])
+
+        # 移除后不再检测
+        ActiveAlertTimerWheel.remove([AlertKey(alert_id="1", strategy_id=11)])
+        alerts = ActiveAlertTimerWheel.pop_due(ActiveAlertTimerWheel.get_next_check_time(next_cycle))
+        self.assertEqual(alerts, [{"id": "2", "strategy_id": None}])
+
+    def test_check_abnormal_alert(self):
+        es_alerts = [{"id": "1", "strategy_id": 11}, {"id": "3", "strategy_id": 33}]
+        with (
+            mock.patch(
+                "alarm_backends.service.alert.manager.tasks.scan_abnormal_alerts", return_value=es_alerts
+            ) as scan_abnormal_alerts,
+            mock.patch("alarm_backends.service.alert.manager.tasks.send_check_task") as send_check_task,
+        ):
+            # 首次执行通过 ES 对账，补齐时间轮
+            check_abnormal_alert()
+            send_check_task.assert_called_once_with(es_alerts)
+            self.assertEqual(ACTIVE_ALERT_TIMER_KEY.client.zcard(ACTIVE_ALERT_TIMER_KEY.get_key()), 2)
+
+            # 对账周期内不再扫描 ES，只取出到期的告警
+            send_check_task.reset_mock()
+            with mock.patch("time.time", return_value=ActiveAlertTimerWheel.get_next_check_time()):
+                check_abnormal_alert()
+            self.assertEqual(scan_abnormal_alerts.call_count, 1)
+            self.assertEqual(sorted(a["id"] for a in send_check_task.call_args[0][0]), ["1", "3"])
@@ -8,7 +8,9 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
+
 import json
+import threading
 import time
 from collections import namedtuple
 
@@ -373,3 +375,112 @@ class TestAlertPollerHandler(object):
         assert 1 == alert.severity
         assert "ABNORMAL" == alert.status
         assert 1 == AlertUIDManager.parse_sequence(alert.id)
+
+    def test_concurrent_poller(self, mock_alert_kafka_consumer, mock_run_alert_builder):
+        service = mock.Mock()
+        p = AlertHandler(service)
+        p.ip = "127.0.0.1"
+
+        p.redis_client.hset(
+            p.data_id_cache_key,
+            p.ip,
+            json.dumps(
+                [
+                    {
+                        "data_id": 1,
+                        "topic": "topic1",
+                        "partition": 0,
+                        "bootstrap_server": "kafka1.service.consul:9092",
+                    },
+                    {
+                        "data_id": 2,
+                        "topic": "topic2",
+                        "partition": 0,
+                        "bootstrap_server": "kafka2.service.consul:9092",
+                    },
+                ]
+            ),
+        )
+        p.run_consumer_manager()
+        p.run_once = False
+
+        # 集群1持续无数据，不应阻塞集群2的事件推送
+        p.consumers["kafka1.service.consul:9092"].poll = lambda *args, **kwargs: time.sleep(0.5) or {}
+        polled = []
+
+        def poll(*args, **kwargs):
+            if polled:
+                time.sleep(0.5)
+                return {}
+            polled.append(1)
+            return {"topic2": [b"event1", b"event2"]}
+
+        p.consumers["kafka2.service.consul:9092"].poll = poll
+
+        def stop():
+            deadline = time.time() + 5
+            while not mock_run_alert_builder.call_count and time.time() < deadline:
+                time.sleep(0.1)
+            p._stop_signal = True
+
+        stopper = threading.Thread(target=stop)
+        stopper.start()
+        with mock.patch.object(settings, "ALERT_POLLER_CONCURRENT_ENABLED", True):
+            p.run_poller()
+        stopper.join()
+
+        assert mock_run_alert_builder.call_count == 1
+        kwargs = mock_run_alert_builder.call_args[1]
+        assert kwargs["bootstrap_server"] == "kafka2.service.consul:9092"
+        assert kwargs["events"] == [b"event1", b"event2"]
+
+    def test_concurrent_poller__stop_with_full_queue(self, mock_alert_kafka_consumer, mock_run_alert_builder):
+        service = mock.Mock()
+        p = AlertHandler(service)
+        p.ip = "127.0.0.1"
+
+        p.redis_client.hset(
+            p.data_id_cache_key,
+            p.ip,
+            json.dumps(
+                [
+                    {
+                        "data_id": 1,
+                        "topic": "topic1",
+                        "partition": 0,
+                        "bootstrap_server": "kafka1.service.consul:9092",
+                    },
+                ]
+            ),
+        )
+        p.run_consumer_manager()
+        p.run_once = False
+
+        # 持续拉取到事件，推送线程停止时队列已满
+        polled = []
+
+        def poll(*args, **kwargs):
+            events = [f"event{len(polled)}".encode()]
+            polled.extend(events)
+            return {"topic1": events}
+
+        p.consumers["kafka1.service.consul:9092"].poll = poll
+
+        def stop():
+            deadline = time.time() + 5
+            while len(polled) < 5 and time.time() < deadline:
+                time.sleep(0.01)
+            p._stop_signal = True
+
+        stopper = threading.Thread(target=stop)
+        stopper.start()
+        with (
+            mock.patch.object(settings, "ALERT_POLLER_CONCURRENT_ENABLED", True),
+            mock.patch.object(settings, "ALERT_POLLER_QUEUE_SIZE", 1),
+        ):
+            p.run_poller()
+        stopper.join()
+
+        # 已拉取的事件在退出前全部推送，不会因队列已满而丢弃
+        pushed = [event for call in mock_run_alert_builder.call_args_list for event in call[1]["events"]]
+        assert pushed == polled
@@ -0,0 +1,142 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pytest
+
+from alarm_backends.service.converge.shield.shield_index import (
+    ShieldIndex,
+    ShieldIndexManager,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def make_shield_config(shield_id, category, scope_type, dimension_config):
+    return {
+        "id": shield_id,
+        "is_enabled": True,
+        "is_deleted": False,
+        "bk_biz_id": 2,
+        "category": category,
+        "scope_type": scope_type,
+        "content": "",
+        "description": "",
+        "begin_time": datetime.now(tz=timezone.utc),
+        "end_time": datetime.now(tz=timezone.utc) + timedelta(hours=1),
+        "dimension_config": dimension_config,
+        "cycle_config": {"type": 1, "week_list": [], "day_list": [], "begin_time": "", "end_time": ""},
+    }
+
+
+SHIELD_CONFIGS = [
+    make_shield_config(1, "strategy", "biz", {"strategy_id": [1, 2], "level": [1]}),
+    make_shield_config(2, "strategy", "biz", {"strategy_id": [3]}),
+    make_shield_config(
+        3,
+        "scope",
+        "ip",
+        {"bk_target_ip": [{"bk_target_ip": "127.0.0.1", "bk_target_cloud_id": 0}]},
+    ),
+    make_shield_config(
+        4,
+        "dimension",
+        "",
+        {"dimension_conditions": [{"key": "device_name", "value": ["eth0"], "method": "eq", "condition": "and"}]},
+    ),
+    make_shield_config(
+        5,
+        "dimension",
+        "",
+        {
+            "dimension_conditions": [
+                {"key": "device_name", "value": ["eth0"], "method": "eq", "condition": "and"},
+                {"key": "device_name", "value": ["eth1"], "method": "eq", "condition": "or"},
+            ]
+        },
+    ),
+    make_shield_config(6, "scope", "biz", {}),
+]
+
+
+def get_candidate_ids(index, dimension):
+    return sorted(shield_obj.id for shield_obj in index.get_candidates(dimension))
+
+
+def test_get_candidates():
+    index = ShieldIndex(SHIELD_CONFIGS, "v1")
+    # OR 条件及业务屏蔽没有必须满足的等值条件，需要逐条匹配
+    assert sorted(shield_obj.id for shield_obj in index.unindexed) == [5, 6]
+
+    assert get_candidate_ids(index, {"strategy_id": 2, "level": 1}) == [1, 5, 6]
+    assert get_candidate_ids(index, {"strategy_id": 4}) == [5, 6]
+    assert get_candidate_ids(index, {"bk_target_ip": "127.0.0.1", "bk_target_cloud_id": 0}) == [3, 5, 6]
+    assert get_candidate_ids(index, {"bk_target_ip": "127.0.0.1", "bk_target_cloud_id": 1}) == [5, 6]
+    assert get_candidate_ids(index, {"strategy_id": 3, "device_name": "eth0"}) == [2, 4, 5, 6]
+
+    # 候选配置必须覆盖所有可能命中的配置
+    dimensions = [
+        {"strategy_id": 2, "level": 1},
+        {"strategy_id": 3, "device_name": "eth0"},
+        {"bk_target_ip": "127.0.0.1", "bk_target_cloud_id": 0, "device_name": "eth1"},
+    ]
+    for dimension in dimensions:
+        matched = {
+            shield_obj.id for shield_obj in index.shield_objs.values() if shield_obj.dimension_check.is_match(dimension)
+        }
+        assert matched <= set(get_candidate_ids(index, dimension))
+
+
+def test_index_manager():
+    ShieldIndexManager.indexes.clear()
+    with (
+        mock.patch(
+            "alarm_backends.core.cache.shield.ShieldCacheManager.get_shield_version", return_value="v1"
+        ) as get_shield_version,
+        mock.patch(
+            "alarm_backends.core.cache.shield.ShieldCacheManager.get_shields_by_biz_id", return_value=SHIELD_CONFIGS
+        ) as get_shields_by_biz_id,
+    ):
+        index = ShieldIndexManager.get(2)
+        assert ShieldIndexManager.get(2) is index
+        assert get_shields_by_biz_id.call_count == 1
+
+        # 版本变化后重建索引
+        get_shield_version.return_value = "v2"
+        assert ShieldIndexManager.get(2) is not index
+        assert get_shields_by_biz_id.call_count == 2
+    ShieldIndexManager.indexes.clear()
+
+
+def test_index_manager_eviction(settings):
+    settings.SHIELD_INDEX_TTL = 60
+    settings.SHIELD_INDEX_MAX_SIZE = 2
+    ShieldIndexManager.indexes.clear()
+    with (
+        mock.patch("alarm_backends.core.cache.shield.ShieldCacheManager.get_shield_version", return_value="v1"),
+        mock.patch(
+            "alarm_backends.core.cache.shield.ShieldCacheManager.get_shields_by_biz_id", return_value=SHIELD_CONFIGS
+        ) as get_shields_by_biz_id,
+    ):
+        index = ShieldIndexManager.get(2)
+        ShieldIndexManager.get(3)
+        # 超出上限时淘汰最久未使用的索引
+        assert ShieldIndexManager.get(2) is index
+        ShieldIndexManager.get(4)
+        assert list(ShieldIndexManager.indexes) == [2, 4]
+        assert get_shields_by_biz_id.call_count == 3
+
+        # 过期的索引在写入新索引时被清理
+        ShieldIndexManager.indexes[2].create_time -= 60
+        ShieldIndexManager.get(5)
+        assert list(ShieldIndexManager.indexes) == [4, 5]
+    ShieldIndexManager.indexes.clear()
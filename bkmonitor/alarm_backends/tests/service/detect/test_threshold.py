@@ -143,3 +143,34 @@ class TestThreshold(object):
 
         anomaly_records = detect_engine.detect_records([datapoint], 1)
         assert anomaly_records[0].anomaly_message == "avg(测试指标) >= 1.0KiB, 当前值1.000977KiB"
+
+    def test_vectorized_detect_records(self, settings):
+        algorithms_config = [
+            [{"threshold": 6, "method": "gt"}, {"threshold": 99, "method": "lte"}, {"threshold": 50, "method": "neq"}],
+            [{"threshold": 6, "method": "eq"}],
+        ]
+        values = [99, 50, 6, 5.9999999, 6.0000001, 120, None, "abc", float("nan"), 0]
+        data_points = [
+            DataPoint(
+                {
+                    "record_id": f"{index}.1569246480",
+                    "value": value,
+                    "values": {"timestamp": 1569246480, "load5": value},
+                    "dimensions": {"ip": f"10.0.0.{index}"},
+                    "time": 1569246480,
+                },
+                datapoint99.item,
+            )
+            for index, value in enumerate(values)
+        ]
+
+        settings.THRESHOLD_VECTORIZED_DETECT_MIN_POINTS = 0
+        expected = Threshold(config=algorithms_config).detect_records(data_points, 1)
+
+        settings.THRESHOLD_VECTORIZED_DETECT_MIN_POINTS = 1
+        detect_engine = Threshold(config=algorithms_config)
+        assert len(detect_engine.filter_candidates(data_points)) < len(data_points)
+        anomaly_result = detect_engine.detect_records(data_points, 1)
+
+        assert [ap.data_point.record_id for ap in anomaly_result] == [ap.data_point.record_id for ap in expected]
+        assert [ap.anomaly_message for ap in anomaly_result] == [ap.anomaly_message for ap in expected]
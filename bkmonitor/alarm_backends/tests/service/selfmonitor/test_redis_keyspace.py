@@ -0,0 +1,48 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from alarm_backends.core.cache import key
+from alarm_backends.service.selfmonitor.collect.redis_keyspace import (
+    KeyFamilyMatcher,
+    KeyFamilyStats,
+    get_key_families,
+    get_ttl_range,
+)
+
+
+def test_key_family_matcher():
+    matcher = KeyFamilyMatcher(get_key_families())
+
+    cases = [
+        (key.DATA_LIST_KEY.get_key(strategy_id=1, item_id=2), "DATA_LIST_KEY", "1"),
+        (key.DATA_SIGNAL_KEY.get_key(), "DATA_SIGNAL_KEY", None),
+        (
+            key.CHECK_RESULT_CACHE_KEY.get_key(strategy_id=3, item_id=4, dimensions_md5="abc", level=1),
+            "CHECK_RESULT_CACHE_KEY",
+            "3",
+        ),
+    ]
+    for redis_key, family_name, strategy_id in cases:
+        family = matcher.match(redis_key)
+        assert family.name == family_name
+        assert family.get_strategy_id(redis_key) == strategy_id
+
+    assert matcher.match(f"{key.KEY_PREFIX}.not.registered.key") is None
+
+
+def test_key_family_stats():
+    stats = KeyFamilyStats()
+    stats.count = 100
+    stats.sampled = 2
+    stats.sampled_memory = 200
+    stats.ttl_distribution.update([get_ttl_range(30), get_ttl_range(-1)])
+
+    assert stats.memory == 10000
+    assert stats.get_ttl_distribution() == {"1m": 50, "persist": 50}
@@ -473,3 +473,17 @@ class TestChecker(TestCase):
         anomaly_records, event_record = checker.check()
         self.assertEqual(len(anomaly_records), 3)
         self.assertEqual(event_record["trigger"]["level"], "2")
+
+    def test_prefetch_check_results(self):
+        self.insert_check_result(2)
+        checkers = [AnomalyChecker(POINT, STRATEGY, 1), AnomalyChecker(POINT, STRATEGY, 1)]
+        AnomalyChecker.prefetch_check_results(checkers, chunk_size=2)
+
+        for checker in checkers:
+            self.assertEqual(len(checker.prefetched_check_results), 3)
+
+        # 预拉取后不再访问 redis
+        self.clear_check_result()
+        anomaly_level, anomaly_timestamps = checkers[0].check_anomaly()
+        self.assertEqual(anomaly_level, 2)
+        self.assertListEqual(anomaly_timestamps, [1569246240, 1569246420])
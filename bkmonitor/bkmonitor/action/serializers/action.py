@@ -27,6 +27,7 @@ from constants.action import (
     GLOBAL_BIZ_ID,
     ActionSignal,
     IntervalNotifyMode,
+    NoiseReduceCardinalityMode,
     NoticeChannel,
     NotifyStep,
     VoiceNoticeMode,
@@ -96,6 +97,11 @@ class NoiseReduceConfigSlz(serializers.Serializer):
     count = serializers.IntegerField(help_text="降噪阈值", allow_null=True, required=False)
     unit = serializers.CharField(default="percent")
     timedelta = serializers.IntegerField(default=settings.NOISE_REDUCE_TIMEDELTA, help_text="降噪时间窗口, 单位（min）")
+    cardinality_mode = serializers.ChoiceField(
+        choices=NoiseReduceCardinalityMode.CHOICES,
+        default=NoiseReduceCardinalityMode.EXACT,
+        help_text="降噪基数统计方式",
+    )
 
     def run_validation(self, data=empty):
         """
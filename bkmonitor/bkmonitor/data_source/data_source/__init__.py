@@ -2098,10 +2098,13 @@ class LogSearchTimeSeriesDataSource(BaseBkMonitorLogDataSource):
             "eq": "is one of",
             "neq": "is not one of",
         }
-        for condition in self.where:
-            if condition["method"] in condition_mapping:
-                condition["_origin_method"] = condition["method"]
-                condition["method"] = condition_mapping[condition["method"]]
+        # 查询条件可能来自共享的策略配置，替换时不修改原条件
+        self.where = [
+            {**condition, "_origin_method": condition["method"], "method": condition_mapping[condition["method"]]}
+            if condition["method"] in condition_mapping
+            else condition
+            for condition in self.where
+        ]
 
     def _fetch_black_list(self) -> list[str | int]:
         return []
@@ -69,6 +69,39 @@ class TestUnifyQuery:
         assert records == [{"bk_target_ip": "127.0.0.1", "_time_": 1774525980000, "_result_": 1}]
         assert series_stat == {((("bk_target_ip", "127.0.0.1"),), "_result_"): {"count": [0, 1]}}
 
+    def test_query_unify_query_chunks_by_series(self, mocker):
+        query = build_unify_query()
+        span = MagicMock()
+        mocker.patch.object(query, "get_unify_query_params", return_value={"query_list": [{"reference_name": "a"}]})
+        mocker.patch(
+            "bkmonitor.data_source.unify_query.query.tracer.start_as_current_span", return_value=nullcontext(span)
+        )
+        mocker.patch(
+            "bkmonitor.data_source.unify_query.query.api.unify_query.query_data",
+            return_value={
+                "series": [
+                    {
+                        "columns": ["_time", "_value"],
+                        "types": ["float", "float"],
+                        "group_keys": ["bk_target_ip"],
+                        "group_values": [ip],
+                        "values": [[1774525980000, 1], [1774526040000, 2]],
+                    }
+                    for ip in ["127.0.0.1", "127.0.0.2", "127.0.0.3"]
+                ],
+                "is_partial": True,
+            },
+        )
+        mocker.patch.object(query, "process_data_by_datasource", side_effect=lambda records: records)
+
+        chunks, is_partial, _ = query._query_unify_query(start_time=1774525980000, end_time=1774526100000, chunk_size=3)
+
+        assert is_partial is True
+        chunks = list(chunks)
+        # 每个分块至少包含 chunk_size 个数据点，且同一 series 不会跨块
+        assert [len(chunk) for chunk in chunks] == [4, 2]
+        assert {record["bk_target_ip"] for record in chunks[1]} == {"127.0.0.3"}
+
     def test_query_unify_query_compatible_without_series_stat(self, mocker):
         query = build_unify_query()
         span = MagicMock()
@@ -0,0 +1,37 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import arrow
+import pytest
+
+from bkmonitor.data_source.unify_query.decoder import decode_series_records, time_to_ms
+
+
+@pytest.mark.parametrize(
+    "value",
+    [1700000000, 1700000000.5, 1700000000000, 1700000000999, 1700000000123456, "2023-11-14T22:13:20Z"],
+)
+def test_time_to_ms(value):
+    assert time_to_ms(value) == arrow.get(value).timestamp * 1000
+
+
+ROW = {
+    "columns": ["_time", "a"],
+    "types": ["time", "float"],
+    "values": [[1700000000000, 1.0], [1700000060000, 2.0], [1700000120000, 3.0]],
+}
+
+
+def test_decode_series_records():
+    records = decode_series_records(ROW, {"ip": "127.0.0.1"}, "a", end_time=1700000120000)
+    assert records == [
+        {"ip": "127.0.0.1", "_time_": 1700000000000, "a": 1.0, "_result_": 1.0},
+        {"ip": "127.0.0.1", "_time_": 1700000060000, "a": 2.0, "_result_": 2.0},
+    ]
@@ -0,0 +1,94 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+统一查询返回值解码
+
+统一查询按 series 返回数据，每个 series 包含 columns/types 及按行排列的 values。
+这里按 series 预先计算好列名映射及时间列位置，避免逐个单元格重复判断；
+数值型时间戳直接换算为毫秒，只有字符串等其他格式才交给 arrow 解析。
+"""
+
+import math
+from typing import Any
+
+import arrow
+
+# 与 arrow.util.normalize_timestamp 保持一致的时间戳范围
+MAX_TIMESTAMP = 253402318799.0
+MAX_TIMESTAMP_MS = MAX_TIMESTAMP * 1000
+MAX_TIMESTAMP_US = MAX_TIMESTAMP * 1000000
+
+# 统一查询列名到内部字段名的映射
+COLUMN_NAME_MAPPING = {"_time": "_time_", "_result": "_result_", "_value": "_result_"}
+
+
+def time_to_ms(value) -> int:
+    """
+    将统一查询返回的时间转换为毫秒时间戳，结果与 arrow.get(value).timestamp * 1000 一致
+    数值型时间戳兼容秒、毫秒及微秒，统一截断到秒
+    """
+    value_type = type(value)
+    if value_type is int or value_type is float:
+        timestamp = value
+        if timestamp > MAX_TIMESTAMP:
+            if timestamp < MAX_TIMESTAMP_MS:
+                timestamp /= 1e3
+            elif timestamp < MAX_TIMESTAMP_US:
+                timestamp /= 1e6
+            else:
+                return arrow.get(value).timestamp * 1000
+        return math.floor(timestamp) * 1000
+    return arrow.get(value).timestamp * 1000
+
+
+def get_series_columns(row: dict[str, Any]) -> tuple[list[str], list[int]]:
+    """
+    获取 series 转换后的列名及时间列的位置
+    """
+    columns = [COLUMN_NAME_MAPPING.get(column, column) for column in row["columns"]]
+    time_indexes = [index for index, column_type in enumerate(row["types"]) if column_type == "time"]
+    return columns, time_indexes
+
+
+def decode_series_records(
+    row: dict[str, Any],
+    dimensions: dict[str, Any],
+    reference_name: str,
+    end_time: int = None,
+) -> list[dict[str, Any]]:
+    """
+    将单个 series 解码为数据点列表，每个数据点为独立的字典
+    :param row: 统一查询返回的 series
+    :param dimensions: series 的维度
+    :param reference_name: 缺少 _result_ 列时，用于补充 _result_ 的列名
+    :param end_time: 时间戳等于结束时间的数据点不返回，为空时不过滤
+    """
+    columns, time_indexes = get_series_columns(row)
+    fill_result = "_result_" not in columns
+
+    records = []
+    for value in row["values"]:
+        if time_indexes:
+            value = list(value)
+            for index in time_indexes:
+                value[index] = time_to_ms(value[index])
+
+        record = {**dimensions}
+        record.update(zip(columns, value))
+
+        # 单指标情况下避免缺少_result_字段
+        if fill_result:
+            record["_result_"] = record[reference_name]
+
+        # 如果是最后一条数据，且时间戳等于结束时间，不返回
+        if end_time and record.get("_time_") == end_time:
+            continue
+
+        records.append(record)
+    return records
@@ -12,10 +12,10 @@ import json
 import logging
 import re
 import time
+from collections.abc import Iterator
 from itertools import chain
 from typing import Any
 
-import arrow
 from django.conf import settings
 from django.utils import timezone
 from django.utils.functional import cached_property
@@ -23,6 +23,7 @@ from opentelemetry import trace
 
 from bkm_space.utils import bk_biz_id_to_space_uid
 from bkmonitor.data_source.data_source import DataSource, TimeSeriesDataSource
+from bkmonitor.data_source.unify_query.decoder import decode_series_records
 from bkmonitor.data_source.unify_query.functions import (
     AggMethods,
     CpAggMethods,
@@ -152,31 +153,46 @@ class UnifyQuery:
 
         rows = data.get("series") or []
         for row in rows:
-            dimensions = cls.extract_unify_query_series_dimensions(row)
-
-            for value in row["values"]:
-                record = {**dimensions}
-                for column, column_type, v in zip(row["columns"], row["types"], value):
-                    if column_type == "time":
-                        v = arrow.get(v).timestamp * 1000
+            records.extend(cls.process_unify_query_row(params, row, end_time))
+        return records
 
-                    if column == "_time":
-                        column = "_time_"
-                    elif column in ["_result", "_value"]:
-                        column = "_result_"
+    @classmethod
+    def iter_unify_query_data_chunks(
+        cls, params: dict, data: dict, end_time: int = None, chunk_size: int = settings.SQL_MAX_LIMIT
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        按 series 分块处理统一查询模块返回值，每块至少包含 chunk_size 个数据点，且 series 不会跨块
+        已处理的 series 会从返回值中移除，避免原始返回值与展开后的数据点同时全量驻留内存
+        """
+        rows = data.get("series") or []
+        rows.reverse()
 
-                    record[column] = v
+        records = []
+        while rows:
+            records.extend(cls.process_unify_query_row(params, rows.pop(), end_time))
+            if len(records) >= chunk_size:
+                yield records
+                records = []
 
-                # 单指标情况下避免缺少_result_字段
-                if "_result_" not in record:
-                    record["_result_"] = record[params["query_list"][0]["reference_name"]]
+        if records:
+            yield records
 
-                # 如果是最后一条数据，且时间戳等于结束时间，不返回
-                if not params.get("instant") and end_time and record.get("_time_") == end_time:
-                    continue
+    @classmethod
+    def process_unify_query_row(cls, params: dict, row: dict, end_time: int = None) -> list[dict[str, Any]]:
+        """
+        处理统一查询模块返回的单个 series
+        """
+        return decode_series_records(
+            row,
+            cls.extract_unify_query_series_dimensions(row),
+            cls.get_reference_name(params),
+            None if params.get("instant") else end_time,
+        )
 
-                records.append(record)
-        return records
+    @staticmethod
+    def get_reference_name(params: dict) -> str | None:
+        query_list = params.get("query_list") or [{}]
+        return query_list[0].get("reference_name")
 
     @classmethod
     def extract_unify_query_series_dimensions(cls, row: dict[str, Any]) -> dict[str, Any]:
@@ -395,9 +411,11 @@ class UnifyQuery:
         time_alignment: bool = True,
         instant: bool = None,
         not_time_align: bool = False,
-    ) -> tuple[list[dict], bool, dict]:
+        chunk_size: int | None = None,
+    ) -> tuple[list[dict] | Iterator[list[dict]], bool, dict]:
         """
         使用统一查询模块进行查询
+        :param chunk_size: 按 series 分块返回数据，为空时返回全部数据点
         """
         is_partial = False
         params = self.get_unify_query_params(start_time, end_time, time_alignment, not_time_align=not_time_align)
@@ -419,6 +437,10 @@ class UnifyQuery:
             data = api.unify_query.query_data(**params)
             is_partial = data.get("is_partial", False)
             series_stat = self.process_unify_query_series_stat(params, data)
+            if chunk_size:
+                chunks = self.iter_unify_query_data_chunks(params, data, end_time=end_time, chunk_size=chunk_size)
+                return map(self.process_data_by_datasource, chunks), is_partial, series_stat
+
             records: list[dict[str, Any]] = self.process_unify_query_data(params, data, end_time=end_time)
             records = self.process_data_by_datasource(records)
         return records, is_partial, series_stat
@@ -567,11 +589,12 @@ class UnifyQuery:
         not_time_align: bool = False,
         *args,
         with_series_stat: bool = False,
+        chunk_size: int | None = None,
         **kwargs,
-    ) -> tuple[list[dict], dict]:
+    ) -> tuple[list[dict] | Iterator[list[dict]], dict]:
         self.is_partial = False
         if not self.data_sources:
-            return [], {}
+            return ([] if not chunk_size else iter([])), {}
 
         self.process_data_sources(self.data_sources)
 
@@ -597,6 +620,7 @@ class UnifyQuery:
                         time_alignment=time_alignment,
                         instant=kwargs.get("instant"),
                         not_time_align=not_time_align,
+                        chunk_size=chunk_size,
                     )
                     self.is_partial = is_partial
             except Exception as e:
@@ -614,6 +638,9 @@ class UnifyQuery:
                         with_series_stat=with_series_stat,
                         **kwargs,
                     )
+                # 原始数据源不支持分块，整体作为一个分块返回
+                if chunk_size:
+                    data = iter([data])
             except Exception as e:
                 exc = e
 
@@ -650,6 +677,37 @@ class UnifyQuery:
         )
         return data
 
+    def query_data_chunks(
+        self,
+        start_time: int = None,
+        end_time: int = None,
+        chunk_size: int = settings.SQL_MAX_LIMIT,
+        limit: int | None = settings.SQL_MAX_LIMIT,
+        slimit: int | None = settings.SQL_MAX_LIMIT,
+        offset: int | None = None,
+        down_sample_range: str | None = "",
+        not_time_align: bool = False,
+        *args,
+        **kwargs,
+    ) -> Iterator[list[dict]]:
+        """
+        按 series 分块查询数据，同一 series 的数据点不会被拆分到多个分块中
+        查询在调用时立即执行(is_partial 等状态随之更新)，数据点在迭代时才展开
+        """
+        data, _ = self._query_data_internal(
+            start_time=start_time,
+            end_time=end_time,
+            limit=limit,
+            slimit=slimit,
+            offset=offset,
+            down_sample_range=down_sample_range,
+            not_time_align=not_time_align,
+            chunk_size=chunk_size,
+            *args,
+            **kwargs,
+        )
+        return data
+
     def query_data_with_stat(
         self,
         start_time: int = None,
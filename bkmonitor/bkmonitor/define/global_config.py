@@ -152,6 +152,20 @@ ADVANCED_OPTIONS = OrderedDict(
         ("STRATEGY_NOTICE_BUCKET_WINDOW", slz.IntegerField(label="策略告警限流窗口(s)", default=60)),
         ("STRATEGY_NOTICE_BUCKET_SIZE", slz.IntegerField(label="策略告警限流数量", default=100)),
         ("GLOBAL_SHIELD_ENABLED", slz.BooleanField(label="是否开启全局告警屏蔽", default=False)),
+        ("SHIELD_INDEX_ENABLED", slz.BooleanField(label="告警屏蔽匹配是否使用进程内屏蔽索引", default=True)),
+        ("SHIELD_INDEX_TTL", slz.IntegerField(label="进程内屏蔽索引最长复用时间(秒)", default=60)),
+        ("SHIELD_INDEX_MAX_SIZE", slz.IntegerField(label="进程内屏蔽索引最多缓存的业务数", default=1000)),
+        ("ALERT_TIMER_WHEEL_ENABLED", slz.BooleanField(label="是否通过活跃告警时间轮获取待检测告警", default=False)),
+        ("ALERT_TIMER_WHEEL_RECONCILE_INTERVAL", slz.IntegerField(label="活跃告警时间轮与ES对账周期(min)", default=10)),
+        ("REDIS_KEYSPACE_PROFILE_ENABLED", slz.BooleanField(label="是否周期分析告警缓存redis的key空间", default=False)),
+        ("REDIS_KEYSPACE_SAMPLE_RATIO", slz.FloatField(label="redis key空间分析抽样比例", default=0.01)),
+        (
+            "REDIS_KEYSPACE_MAX_SCAN_KEYS",
+            slz.IntegerField(label="redis key空间分析单个db最大扫描key数", default=1000000),
+        ),
+        ("REDIS_PIPELINE_BATCH_MAX_SIZE", slz.IntegerField(label="redis批量模式单批次最大命令数", default=1000)),
+        ("REDIS_PIPELINE_BATCH_MAX_DELAY", slz.FloatField(label="redis批量模式单批次最长等待时间(秒)", default=0.05)),
+        ("ACCESS_PUSH_BATCH_ENABLED", slz.BooleanField(label="access推送检测队列时是否跨策略批量提交", default=True)),
         ("BIZ_WHITE_LIST_FOR_3RD_EVENT", slz.ListField(label="第三方事件接入业务白名单", default=[])),
         ("TIME_SERIES_METRIC_EXPIRED_SECONDS", slz.IntegerField(label="自定义指标过期时间", default=30 * 24 * 3600)),
         ("AIDEV_AGENT_LLM_DEFAULT_TEMPERATURE", slz.IntegerField(label="LLM默认温度参数", default=0.3)),
@@ -175,6 +189,7 @@ ADVANCED_OPTIONS = OrderedDict(
         ("BK_PLUGIN_APP_INFO", slz.JSONField(label="蓝鲸插件实际调用APP", default={})),
         ("DELAY_TO_GET_RELATED_INFO_INTERVAL", slz.IntegerField(label="重新获取关联信息时间间隔(ms)", default=500)),
         ("NOISE_REDUCE_TIMEDELTA", slz.IntegerField(label="降噪时间窗口(min)", default=5)),
+        ("NOISE_REDUCE_HLL_BUCKET_SIZE", slz.IntegerField(label="降噪近似基数统计分桶时长(s)", default=60)),
         ("NO_DATA_ALERT_EXPIRED_TIMEDELTA", slz.IntegerField(label="无数据告警过期时间窗口(s)", default=24 * 60 * 60)),
         ("APM_APP_DEFAULT_ES_STORAGE_CLUSTER", slz.IntegerField(label="APM应用默认集群ID", default=-1)),
         ("APM_APP_DEFAULT_ES_RETENTION", slz.IntegerField(label="APM应用默认过期时间", default=7)),
@@ -303,10 +318,30 @@ ADVANCED_OPTIONS = OrderedDict(
         ("ACCESS_LATENCY_INTERVAL_FACTOR", slz.IntegerField(label="access数据源延迟上报周期因子", default=1)),
         ("ACCESS_LATENCY_THRESHOLD_CONSTANT", slz.IntegerField(label="access数据源延迟上报常量阈值", default=180)),
         ("ACCESS_DETECT_MERGE_STRATEGY_IDS", slz.ListField(label="access合并detect策略列表", default=[])),
+        (
+            "THRESHOLD_VECTORIZED_DETECT_MIN_POINTS",
+            slz.IntegerField(label="静态阈值向量化检测最小数据点数量(0为不启用)", default=1000),
+        ),
+        ("TRIGGER_BATCH_CHECK_ENABLED", slz.BooleanField(label="trigger是否批量预拉取检测窗口", default=True)),
+        ("STRATEGY_LOCAL_CACHE_ENABLED", slz.BooleanField(label="是否开启进程内策略详情缓存", default=False)),
+        ("STRATEGY_LOCAL_CACHE_MAX_SIZE", slz.IntegerField(label="进程内策略缓存最大策略数", default=10000)),
+        (
+            "STRATEGY_LOCAL_CACHE_EPOCH_CHECK_INTERVAL",
+            slz.IntegerField(label="进程内策略缓存版本号检查间隔(秒)", default=10),
+        ),
+        (
+            "STRATEGY_LOCAL_CACHE_SUBSCRIBE_ENABLED",
+            slz.BooleanField(label="进程内策略缓存是否订阅策略变更通知", default=True),
+        ),
+        (
+            "ACCESS_BATCH_DATA_COLUMNAR_ENABLED",
+            slz.BooleanField(label="access分批数据是否使用列式数据帧格式", default=True),
+        ),
         ("KAFKA_AUTO_COMMIT", slz.BooleanField(label="kafka是否自动提交", default=True)),
         ("MAX_BUILD_EVENT_NUMBER", slz.IntegerField(label="单次告警生成任务处理的event数量", default=0)),
         ("HOST_DYNAMIC_FIELDS", slz.ListField(label="主机动态属性", default=[])),
         ("METRIC_CACHE_TASK_PERIOD", slz.IntegerField(label="指标缓存任务周期(min)", default=10)),
+        ("METRIC_SEARCH_INDEX_ENABLED", slz.BooleanField(label="是否开启指标选择器搜索索引", default=False)),
         ("LAST_MIGRATE_VERSION", slz.CharField(label="最后一次迁移版本", default="")),
         ("GSE_MANAGERS", slz.ListField(label="GSE平台管理员", default=[])),
         ("OFFICIAL_PLUGINS_MANAGERS", slz.ListField(label="官方插件管理员", default=[])),
@@ -415,6 +450,18 @@ ADVANCED_OPTIONS = OrderedDict(
             slz.IntegerField(label="access数据批量处理触发阈值(0为不触发)", default=0),
         ),
         ("ACCESS_DATA_BATCH_PROCESS_SIZE", slz.IntegerField(label="access数据批量处理单次处理量", default=50000)),
+        (
+            "ACCESS_DATA_STREAMING_QUERY_ENABLED",
+            slz.BooleanField(label="access数据批量处理是否按series分块流式查询", default=True),
+        ),
+        (
+            "ACCESS_CMDB_LOCAL_CACHE_TTL",
+            slz.IntegerField(label="access维度补充进程内CMDB缓存过期时间(秒)", default=60),
+        ),
+        (
+            "ACCESS_CMDB_LOCAL_CACHE_MAX_SIZE",
+            slz.IntegerField(label="access维度补充进程内CMDB缓存最大数量", default=50000),
+        ),
         ("BASE64_ENCODE_TRIGGER_CHARS", slz.ListField(label="需要base64编码的特殊字符", default=[])),
         ("AIDEV_KNOWLEDGE_BASE_IDS", slz.ListField(label="aidev的知识库ID", default=[])),
         ("AIDEV_AGENT_AI_GENERATING_KEYWORD", slz.CharField(label="AIAgent内容生成关键字", default="生成中")),
@@ -451,6 +498,23 @@ ADVANCED_OPTIONS = OrderedDict(
         ("SKIP_INFLUXDB_TABLE_ID_LIST", slz.BooleanField(label="跳过写入influxdb的结果表列表", default=[])),
         ("ENABLE_UPTIMECHECK_TEST", slz.BooleanField(label="是否开启拨测联通性测试", default=True)),
         ("CHECK_RESULT_TTL_HOURS", slz.CharField(label="检测结果缓存 TTL(小时)", default=1)),
+        ("ALERT_EVENT_ASYNC_WRITE_ENABLED", slz.BooleanField(label="告警构建时是否异步批量写入事件", default=False)),
+        ("ALERT_EVENT_WRITER_QUEUE_SIZE", slz.IntegerField(label="事件异步写入队列长度", default=50000)),
+        ("ALERT_EVENT_WRITER_BATCH_SIZE", slz.IntegerField(label="事件异步写入单批数量", default=2000)),
+        ("ALERT_EVENT_WRITER_CONCURRENCY", slz.IntegerField(label="事件异步写入并发请求数", default=4)),
+        ("ALERT_EVENT_WRITER_MAX_RETRIES", slz.IntegerField(label="事件异步写入失败重试次数", default=3)),
+        ("ALERT_POLLER_CONCURRENT_ENABLED", slz.BooleanField(label="告警事件是否按kafka集群并发拉取", default=False)),
+        ("ALERT_POLLER_QUEUE_SIZE", slz.IntegerField(label="告警事件并发拉取待推送队列长度", default=100)),
+        ("ALERT_POLLER_BATCH_WINDOW", slz.IntegerField(label="告警事件并发拉取攒批等待时间(毫秒)", default=200)),
+        (
+            "DETECT_RESULT_CLEAN_SCRIPT_ENABLED",
+            slz.BooleanField(label="检测结果过期清理是否使用lua脚本在redis服务端执行", default=True),
+        ),
+        ("DETECT_RESULT_CLEAN_SCAN_COUNT", slz.IntegerField(label="检测结果过期清理单次扫描维度数量", default=1000)),
+        (
+            "DETECT_RESULT_CLEAN_MAX_FIELDS_PER_SECOND",
+            slz.IntegerField(label="检测结果过期清理每秒最多扫描维度数量(0表示不限制)", default=50000),
+        ),
         ("K8S_PLUGIN_COLLECT_CLUSTER_ID", slz.CharField(label="默认K8S插件采集集群ID", default="")),
         ("TENCENT_CLOUD_METRIC_PLUGIN_CONFIG", slz.JSONField(label="腾讯云监控插件配置", default={})),
         ("ENABLED_TARGET_CACHE_BK_BIZ_IDS", slz.ListField(label="启用监控目标缓存的业务ID列表", default=[])),
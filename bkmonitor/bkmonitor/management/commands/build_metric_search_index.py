@@ -0,0 +1,47 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from django.core.management.base import BaseCommand
+
+from bkmonitor.models import MetricListCache, MetricListCacheSearchToken
+
+
+class Command(BaseCommand):
+    """
+    全量重建指标选择器缓存的搜索索引
+    开启 METRIC_SEARCH_INDEX_ENABLED 前需执行一次，后续由指标缓存刷新任务增量维护
+    """
+
+    help = "全量重建指标选择器缓存的搜索索引"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="每批处理的指标数量")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        MetricListCacheSearchToken.objects.all().delete()
+
+        fields = ["id", *MetricListCacheSearchToken.SEARCH_FIELDS]
+        metrics = []
+        total = 0
+        for metric in MetricListCache.objects.only(*fields).order_by("id").iterator(chunk_size=batch_size):
+            metrics.append(metric)
+            if len(metrics) >= batch_size:
+                MetricListCacheSearchToken.refresh(metrics)
+                total += len(metrics)
+                metrics = []
+                self.stdout.write(f"{total} metrics indexed")
+
+        if metrics:
+            MetricListCacheSearchToken.refresh(metrics)
+            total += len(metrics)
+
+        self.stdout.write(f"指标搜索索引重建完成: {total} metrics indexed.")
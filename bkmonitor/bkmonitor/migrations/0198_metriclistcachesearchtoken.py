@@ -0,0 +1,28 @@
+# Generated manually: 指标选择器缓存三元组搜索索引
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bkmonitor", "0197_strategylabel_covering_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MetricListCacheSearchToken",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("token", models.CharField(max_length=16, verbose_name="三元组")),
+                ("metric_id", models.IntegerField(verbose_name="指标缓存ID")),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="metriclistcachesearchtoken",
+            index=models.Index(fields=["token", "metric_id"], name="idx_metric_search_token"),
+        ),
+        migrations.AddIndex(
+            model_name="metriclistcachesearchtoken",
+            index=models.Index(fields=["metric_id"], name="idx_metric_search_metric_id"),
+        ),
+    ]
@@ -9,8 +9,11 @@ specific language governing permissions and limitations under the License.
 """
 
 import logging
+from itertools import islice
 
+from django.conf import settings
 from django.db import models
+from django.db.models import Count
 from django.utils.translation import gettext_lazy as _
 
 from bkmonitor.utils.common_utils import safe_int
@@ -229,6 +232,9 @@ class MetricListCache(models.Model):
 
         super().save(*args, **kwargs)
 
+        if MetricListCacheSearchToken.is_enabled():
+            MetricListCacheSearchToken.refresh([self])
+
     @property
     def is_already_readable(self) -> bool:
         """判断当前指标名是否已经可读"""
@@ -273,3 +279,89 @@ class MetricListCache(models.Model):
             return f"{db}.{self.metric_field}"
 
         return self.result_table_readable_name
+
+
+class MetricListCacheSearchToken(models.Model):
+    """
+    指标选择器缓存搜索索引
+    对指标的 data_label、result_table_id、metric_field、metric_field_name 建立三元组(trigram)倒排索引，
+    模糊搜索先由索引求出同时包含查询串全部三元组的候选指标，再对候选指标做精确匹配，避免全表 LIKE 扫描
+    """
+
+    TOKEN_SIZE = 3
+    SEARCH_FIELDS = ["data_label", "result_table_id", "metric_field", "metric_field_name"]
+    # 单次搜索最多使用的三元组数量，候选指标仍需精确匹配，因此只取部分三元组不影响结果
+    MAX_QUERY_TOKENS = 8
+
+    token = models.CharField(max_length=16, verbose_name="三元组")
+    metric_id = models.IntegerField(verbose_name="指标缓存ID")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["token", "metric_id"], name="idx_metric_search_token"),
+            models.Index(fields=["metric_id"], name="idx_metric_search_metric_id"),
+        ]
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return settings.METRIC_SEARCH_INDEX_ENABLED
+
+    @classmethod
+    def get_tokens(cls, text: str) -> list[str]:
+        """
+        按出现顺序获取文本的三元组
+        """
+        text = (text or "").lower()
+        tokens = {}
+        for i in range(len(text) - cls.TOKEN_SIZE + 1):
+            tokens[text[i : i + cls.TOKEN_SIZE]] = None
+        return list(tokens)
+
+    @classmethod
+    def get_metric_tokens(cls, metric: MetricListCache) -> set[str]:
+        tokens = set()
+        for field in cls.SEARCH_FIELDS:
+            tokens.update(cls.get_tokens(getattr(metric, field, "")))
+        return tokens
+
+    @classmethod
+    def remove(cls, metric_ids: list[int]):
+        cls.objects.filter(metric_id__in=metric_ids).delete()
+
+    @classmethod
+    def refresh(cls, metrics: list[MetricListCache], batch_size: int = 5000):
+        """
+        重建指标的搜索索引
+        """
+        metric_ids = [metric.pk for metric in metrics if metric.pk]
+        if not metric_ids:
+            return
+        cls.remove(metric_ids)
+
+        search_tokens = (
+            cls(token=token, metric_id=metric.pk)
+            for metric in metrics
+            if metric.pk
+            for token in cls.get_metric_tokens(metric)
+        )
+        while True:
+            batch = list(islice(search_tokens, batch_size))
+            if not batch:
+                break
+            cls.objects.bulk_create(batch, batch_size=batch_size)
+
+    @classmethod
+    def search(cls, query: str):
+        """
+        获取可能匹配查询串的指标缓存ID子查询，查询串长度不足三元组时返回None，由调用方回退为全表匹配
+        """
+        tokens = cls.get_tokens(query.strip())[: cls.MAX_QUERY_TOKENS]
+        if not tokens:
+            return None
+        return (
+            cls.objects.filter(token__in=tokens)
+            .values("metric_id")
+            .annotate(token_count=Count("token", distinct=True))
+            .filter(token_count=len(tokens))
+            .values("metric_id")
+        )
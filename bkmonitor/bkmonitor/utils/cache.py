@@ -8,9 +8,11 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
+import copy
 import functools
 import json
 import logging
+import threading
 import time
 import zlib
 from time import monotonic
@@ -25,6 +27,7 @@ from django.utils.encoding import force_bytes
 from bkmonitor.utils.common_utils import count_md5
 from bkmonitor.utils.local import local
 from bkmonitor.utils.request import get_request
+from bkmonitor.utils.thread_backend import InheritParentThread
 
 logger = logging.getLogger(__name__)
 
@@ -35,10 +38,29 @@ except Exception:
     mem_cache = cache
 
 
+class RefreshFlight:
+    """
+    进程内正在进行的回源，同一进程内等待同一缓存 key 的请求直接等待其结果
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+refresh_flights: dict[str, RefreshFlight] = {}
+refresh_flights_lock = threading.Lock()
+
+
 class UsingCache:
     min_length = 15
     preset = 6
     key_prefix = "web_cache"
+    # 缓存新鲜标记 key 的后缀，标记过期后缓存值仍可在 stale_timeout 内使用
+    fresh_key_suffix = ":fresh"
+    # 回源锁 key 的后缀
+    lock_key_suffix = ":lock"
 
     def __init__(
         self,
@@ -108,14 +130,37 @@ class UsingCache:
         local (miss), cache(miss): cache <- result
         local (miss), cache(hit): local <- result
         """
+        value, _ = self.get_entry(cache_key)
+        if value is None:
+            return default
+        return value
+
+    def get_entry(self, cache_key):
+        """
+        获取缓存值及其是否新鲜
+        若缓存类型配置了 stale_timeout，缓存值超过 timeout 后仍会返回，但标记为不新鲜
+        :return: (缓存值, 是否新鲜)，未命中时缓存值为 None
+        """
+        stale_timeout = getattr(self.using_cache_type, "stale_timeout", 0)
+
         if self.local_cache_enable:
             value = getattr(local, cache_key, None)
             if value:
-                return json.loads(value)
+                return json.loads(value), True
 
-        value = mem_cache.get(cache_key, default=None) or cache.get(cache_key, default=None)
+        fresh = True
+        value = mem_cache.get(cache_key, default=None)
         if value is None:
-            return default
+            if stale_timeout:
+                fresh_key = f"{cache_key}{self.fresh_key_suffix}"
+                values = cache.get_many([cache_key, fresh_key])
+                value = values.get(cache_key)
+                fresh = fresh_key in values
+            else:
+                value = cache.get(cache_key, default=None)
+        if value is None:
+            return None, True
+
         if self.compress:
             try:
                 value = zlib.decompress(value)
@@ -124,12 +169,14 @@ class UsingCache:
             try:
                 value = json.loads(force_bytes(value))
             except Exception:
-                value = default
+                return None, True
+
         if value and self.local_cache_enable:
             setattr(local, cache_key, json.dumps(value))
-        return value
+        return value, fresh
 
     def set_value(self, key, value, timeout=60):
+        stale_timeout = getattr(self.using_cache_type, "stale_timeout", 0)
         if self.compress:
             try:
                 value = json.dumps(value)
@@ -142,8 +189,13 @@ class UsingCache:
 
         try:
             if mem_cache is not cache:
-                mem_cache.set(key, value, 60)
-            cache.set(key, value, timeout)
+                mem_cache.set(key, value, min(60, timeout))
+            if stale_timeout:
+                # 缓存值保留到 timeout + stale_timeout，新鲜标记在 timeout 后过期
+                cache.set(key, value, timeout + stale_timeout)
+                cache.set(f"{key}{self.fresh_key_suffix}", 1, timeout)
+            else:
+                cache.set(key, value, timeout)
         except Exception as e:
             try:
                 request_path = get_request().path
@@ -156,28 +208,121 @@ class UsingCache:
         """
         【默认缓存模式】
         先检查是否缓存是否存在
-        若存在，则直接返回缓存内容
-        若不存在，则执行函数，并将结果回写到缓存中
+        若存在，则直接返回缓存内容，缓存不新鲜时在后台刷新
+        若不存在，则执行函数，并将结果回写到缓存中（同一个缓存key只有一个请求执行函数）
         """
         if settings.ENVIRONMENT == "development":
             cache_key = None
         else:
             cache_key = self._cache_key(task_definition, args, kwargs)
         if cache_key:
-            return_value = self.get_value(cache_key, default=None)
+            return_value, fresh = self.get_entry(cache_key)
 
             if return_value is None:
-                return_value = self._refresh(task_definition, args, kwargs)
+                return_value = self._single_flight_refresh(cache_key, task_definition, args, kwargs)
+            elif not fresh:
+                self._background_refresh(cache_key, task_definition, args, kwargs)
         else:
             return_value = self._cacheless(task_definition, args, kwargs)
         return return_value
 
-    def _refresh(self, task_definition, args, kwargs):
+    def _acquire_refresh_lock(self, cache_key) -> bool:
+        """
+        获取回源锁，缓存服务异常时视为获取成功
+        """
+        try:
+            return bool(cache.add(f"{cache_key}{self.lock_key_suffix}", 1, settings.CACHE_REFRESH_LOCK_TIMEOUT))
+        except Exception as e:
+            logger.warning(f"[Cache]获取回源锁[key:{cache_key}]失败：{e}")
+            return True
+
+    def _release_refresh_lock(self, cache_key):
+        try:
+            cache.delete(f"{cache_key}{self.lock_key_suffix}")
+        except Exception as e:
+            logger.warning(f"[Cache]释放回源锁[key:{cache_key}]失败：{e}")
+
+    def _single_flight_refresh(self, cache_key, task_definition, args, kwargs):
+        """
+        【单飞刷新模式】
+        同一进程内只有一个请求回源，其余请求等待其结果；跨进程通过回源锁保证只有一个请求执行函数
+        等待超时或回源失败时，等待的请求自行执行函数
+        """
+        if not settings.CACHE_SINGLE_FLIGHT_ENABLED:
+            return self._refresh(task_definition, args, kwargs, cache_key=cache_key)
+
+        with refresh_flights_lock:
+            flight = refresh_flights.get(cache_key)
+            is_leader = flight is None
+            if is_leader:
+                flight = refresh_flights[cache_key] = RefreshFlight()
+
+        if not is_leader:
+            if flight.event.wait(settings.CACHE_SINGLE_FLIGHT_WAIT) and flight.error is None:
+                # 结果在多个请求间共享，返回副本避免相互修改
+                return copy.deepcopy(flight.value)
+            return self._refresh(task_definition, args, kwargs, cache_key=cache_key)
+
+        try:
+            flight.value = self._locked_refresh(cache_key, task_definition, args, kwargs)
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with refresh_flights_lock:
+                refresh_flights.pop(cache_key, None)
+            flight.event.set()
+
+    def _locked_refresh(self, cache_key, task_definition, args, kwargs):
+        """
+        获取到回源锁的请求执行函数并回写缓存
+        回源锁被其他进程持有时轮询缓存等待其结果，回源锁释放或过期后仍无缓存（如结果不满足缓存条件），则自行执行函数
+        """
+        if self._acquire_refresh_lock(cache_key):
+            try:
+                return self._refresh(task_definition, args, kwargs, cache_key=cache_key)
+            finally:
+                self._release_refresh_lock(cache_key)
+
+        deadline = monotonic() + settings.CACHE_SINGLE_FLIGHT_WAIT
+        interval = 0.01
+        while monotonic() < deadline:
+            time.sleep(min(interval, max(deadline - monotonic(), 0)))
+            interval = min(interval * 2, 0.2)
+            return_value, _ = self.get_entry(cache_key)
+            if return_value is not None:
+                return return_value
+            if cache.get(f"{cache_key}{self.lock_key_suffix}") is None:
+                break
+
+        return self._refresh(task_definition, args, kwargs, cache_key=cache_key)
+
+    def _background_refresh(self, cache_key, task_definition, args, kwargs):
+        """
+        【后台刷新模式】
+        缓存不新鲜时，由获取到回源锁的请求在后台线程中刷新缓存，当前请求直接使用旧值
+        """
+        if not self._acquire_refresh_lock(cache_key):
+            return
+
+        def refresh():
+            try:
+                self._refresh(task_definition, args, kwargs, cache_key=cache_key)
+            except Exception as e:
+                logger.exception(f"[Cache]后台刷新缓存[key:{cache_key}]失败：{e}")
+            finally:
+                self._release_refresh_lock(cache_key)
+
+        InheritParentThread(target=refresh, daemon=True).start()
+
+    def _refresh(self, task_definition, args, kwargs, cache_key=None):
         """
         【强制刷新模式】
         不使用缓存的数据，将函数执行返回结果回写缓存
         """
-        cache_key = self._cache_key(task_definition, args, kwargs)
+        if cache_key is None:
+            cache_key = self._cache_key(task_definition, args, kwargs)
 
         return_value = self._cacheless(task_definition, args, kwargs)
 
@@ -257,20 +402,22 @@ class CacheTypeItem:
     缓存类型定义
     """
 
-    def __init__(self, key, timeout, user_related=None, label=""):
+    def __init__(self, key, timeout, user_related=None, label="", stale_timeout=0):
         """
         :param key: 缓存名称
         :param timeout: 缓存超时，单位：s
         :param user_related: 是否用户相关
         :param label: 详细说明
+        :param stale_timeout: 缓存超时后仍可使用旧值的时间，期间由一个请求在后台刷新，单位：s
         """
         self.key = key
         self.timeout = timeout
         self.label = label
         self.user_related = user_related
+        self.stale_timeout = stale_timeout
 
     def __call__(self, timeout):
-        return CacheTypeItem(self.key, timeout, self.user_related, self.label)
+        return CacheTypeItem(self.key, timeout, self.user_related, self.label, self.stale_timeout)
 
 
 class CacheType:
@@ -307,7 +454,9 @@ class CacheType:
     HOME = CacheTypeItem(key="home", timeout=settings.CACHE_HOME_TIMEOUT, label="自愈统计数据相关", user_related=False)
     DEVOPS = CacheTypeItem(key="devops", timeout=60 * 5, label="蓝盾接口相关", user_related=False)
     GRAFANA = CacheTypeItem(key="grafana", timeout=60 * 5, label="仪表盘相关", user_related=False)
-    SCENE_VIEW = CacheTypeItem(key="scene_view", timeout=60 * 1, label="观测场景相关", user_related=False)
+    SCENE_VIEW = CacheTypeItem(
+        key="scene_view", timeout=60 * 1, label="观测场景相关", user_related=False, stale_timeout=60 * 5
+    )
     DB_CACHE = CacheTypeItem(key="db_cache", timeout=60 * 3, label="db缓存", user_related=False)
 
 
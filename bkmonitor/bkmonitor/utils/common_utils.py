@@ -26,11 +26,13 @@ import traceback
 import uuid
 from collections import OrderedDict, defaultdict
 from contextlib import contextmanager
+from functools import lru_cache
 from io import StringIO
 from pipes import quote
 from typing import Dict, List, Union
 from zipfile import ZipFile
 
+import xxhash
 from django.conf import settings
 from django.utils.encoding import force_str
 from django.utils.functional import Promise
@@ -479,6 +481,48 @@ def count_md5(content, dict_sort=True, list_sort=True):
     return _count_md5(str(content))
 
 
+# 维度值为以下类型时，维度指纹可以走快速路径
+DIMENSION_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+@lru_cache(maxsize=65536)
+def _dimension_item_md5(key: str, value: str) -> str:
+    """
+    计算单个维度的 md5，与 count_md5 中 (str(key), count_md5(value)) 的计算结果一致
+    """
+    return _count_md5(str(sorted([_count_md5(key), _count_md5(_count_md5(value))])))
+
+
+def dimension_fingerprint(dimensions: dict, legacy: bool = True) -> str:
+    """
+    计算维度指纹，单次遍历维度，避免 count_md5 的递归开销
+    :param dimensions: 维度
+    :param legacy: 兼容模式，结果与 count_md5 一致，维度指纹会作为 redis key 持久化时必须使用兼容模式
+    :return: 维度指纹
+    """
+    if not isinstance(dimensions, dict):
+        return count_md5(dimensions)
+
+    if legacy:
+        item_md5_list = []
+        for k, v in dimensions.items():
+            # 维度值不是标量时，退化为 count_md5 计算
+            if type(v) not in DIMENSION_SCALAR_TYPES:
+                return count_md5(dimensions)
+            item_md5_list.append(_dimension_item_md5(str(k), str(v)))
+        item_md5_list.sort()
+        return _count_md5(str(item_md5_list))
+
+    items = sorted(
+        (
+            str(k),
+            str(v) if type(v) in DIMENSION_SCALAR_TYPES else json.dumps(v, sort_keys=True, default=str),
+        )
+        for k, v in dimensions.items()
+    )
+    return xxhash.xxh3_128_hexdigest("\x1e".join(f"{k}\x1f{v}" for k, v in items).encode("utf8"))
+
+
 def make_callable_hash(content):
     """
     计算callable的hash
@@ -14,6 +14,7 @@ import logging
 import re
 import types
 from collections import defaultdict
+from functools import cache, lru_cache
 from os import path
 
 import arrow
@@ -336,19 +337,10 @@ class Jinja2Renderer:
         """
         支持json和re函数
         """
-        notice_way = context.get("notice_way")
-        if notice_way in settings.MD_SUPPORTED_NOTICE_WAYS:
-            autoescape = True
-            escape_func = escape_markdown
-        else:
-            autoescape = False
-            escape_func = None
-
-        return (
-            jinja2_environment(autoescape=autoescape, escape_func=escape_func)
-            .from_string(content)
-            # helper 放在 **context 之后，避免被同名上下文键覆盖
-            .render({**context, "json": SAFE_TEMPLATE_JSON, "re": SAFE_TEMPLATE_RE, "arrow": SAFE_TEMPLATE_ARROW})
+        autoescape = context.get("notice_way") in settings.MD_SUPPORTED_NOTICE_WAYS
+        # helper 放在 **context 之后，避免被同名上下文键覆盖
+        return get_compiled_template(content, autoescape).render(
+            {**context, "json": SAFE_TEMPLATE_JSON, "re": SAFE_TEMPLATE_RE, "arrow": SAFE_TEMPLATE_ARROW}
         )
 
 
@@ -556,6 +548,30 @@ def jinja2_environment(**options):
     return env
 
 
+# 进程内编译模板缓存容量，通知模板种类有限，超出后按 LRU 淘汰
+JINJA2_TEMPLATE_CACHE_SIZE = 2048
+
+
+@cache
+def get_jinja2_environment(autoescape: bool):
+    """
+    获取进程内复用的沙箱环境
+    环境创建后不再修改，翻译函数在渲染时按当前语言取值，因此可以在多次渲染间共享
+    :param autoescape: 是否按 markdown 自动转义
+    """
+    if autoescape:
+        return jinja2_environment(autoescape=True, escape_func=escape_markdown)
+    return jinja2_environment(autoescape=False)
+
+
+@lru_cache(maxsize=JINJA2_TEMPLATE_CACHE_SIZE)
+def get_compiled_template(content: str, autoescape: bool):
+    """
+    获取编译后的模板，按模板内容和转义模式缓存，避免每次渲染重复解析和编译
+    """
+    return get_jinja2_environment(autoescape).from_string(content)
+
+
 def jinja_render(template_value, context):
     """
     支持object的jinja2渲染
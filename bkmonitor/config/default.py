@@ -378,6 +378,28 @@ ENABLE_MESSAGE_QUEUE = True
 MESSAGE_QUEUE_DSN = ""
 COMPATIBLE_ALARM_FORMAT = True
 ENABLE_PUSH_SHIELDED_ALERT = True
+# 告警屏蔽匹配时是否使用进程内屏蔽配置索引
+SHIELD_INDEX_ENABLED = True
+# 进程内屏蔽配置索引的最长复用时间(秒)，过期后重建，以刷新动态分组等关联数据
+SHIELD_INDEX_TTL = 60
+# 进程内屏蔽配置索引最多缓存的业务数，超出后淘汰最久未使用的索引
+SHIELD_INDEX_MAX_SIZE = 1000
+# 是否通过活跃告警时间轮获取需要周期检测的告警，替代每分钟全量扫描 ES
+ALERT_TIMER_WHEEL_ENABLED = False
+# 活跃告警时间轮与 ES 对账的周期(min)
+ALERT_TIMER_WHEEL_RECONCILE_INTERVAL = 10
+# 是否周期分析告警缓存 redis 的 key 空间
+REDIS_KEYSPACE_PROFILE_ENABLED = False
+# key 空间分析时获取内存占用及 TTL 的 key 抽样比例
+REDIS_KEYSPACE_SAMPLE_RATIO = 0.01
+# key 空间分析时单个 db 最多扫描的 key 数量
+REDIS_KEYSPACE_MAX_SCAN_KEYS = 1000000
+# 告警缓存 redis 批量模式单批次最大命令数
+REDIS_PIPELINE_BATCH_MAX_SIZE = 1000
+# 告警缓存 redis 批量模式单批次最长等待时间(秒)
+REDIS_PIPELINE_BATCH_MAX_DELAY = 0.05
+# access 推送检测队列时是否跨策略批量提交
+ACCESS_PUSH_BATCH_ENABLED = True
 
 # 采集数据存储天数
 TS_DATA_SAVED_DAYS = 30
@@ -705,6 +727,9 @@ TRANSFER_BUILTIN_CLUSTER_ID = ""
 # 是否开启数据平台指标缓存
 ENABLE_BKDATA_METRIC_CACHE = True
 
+# 是否开启指标选择器搜索索引，开启前需执行 build_metric_search_index 命令构建存量索引
+METRIC_SEARCH_INDEX_ENABLED = False
+
 # influxdb proxy使用的默认集群名
 INFLUXDB_DEFAULT_PROXY_CLUSTER_NAME = "default"
 INFLUXDB_DEFAULT_PROXY_CLUSTER_NAME_FOR_K8S = "default"
@@ -736,6 +761,8 @@ GRAFANA_ADMIN_USERNAME = os.getenv("BKAPP_GRAFANA_ADMIN_USERNAME", "admin")
 
 # 降噪时间窗口
 NOISE_REDUCE_TIMEDELTA = 5
+# 降噪近似基数统计的 HyperLogLog 分桶时长(秒)
+NOISE_REDUCE_HLL_BUCKET_SIZE = 60
 
 # 指标上报默认任务标志
 DEFAULT_METRIC_PUSH_JOB = "SLI"
@@ -781,6 +808,24 @@ ACCESS_LATENCY_THRESHOLD_CONSTANT = 180
 # 仅对列表中的策略启用合并处理，为空时对所有静态阈值策略生效
 ACCESS_DETECT_MERGE_STRATEGY_IDS = []
 
+# 静态阈值向量化检测触发的最小数据点数量（0为不启用）
+THRESHOLD_VECTORIZED_DETECT_MIN_POINTS = 1000
+
+# trigger 是否批量预拉取检测窗口数据
+TRIGGER_BATCH_CHECK_ENABLED = True
+
+# 是否开启进程内策略详情缓存
+STRATEGY_LOCAL_CACHE_ENABLED = False
+# 进程内策略缓存最大策略数
+STRATEGY_LOCAL_CACHE_MAX_SIZE = 10000
+# 进程内策略缓存版本号检查间隔(秒)
+STRATEGY_LOCAL_CACHE_EPOCH_CHECK_INTERVAL = 10
+# 进程内策略缓存是否订阅策略变更通知
+STRATEGY_LOCAL_CACHE_SUBSCRIBE_ENABLED = True
+
+# access 分批数据是否使用列式数据帧格式
+ACCESS_BATCH_DATA_COLUMNAR_ENABLED = True
+
 # kafka是否自动提交配置
 KAFKA_AUTO_COMMIT = True
 
@@ -1065,6 +1110,12 @@ CACHE_DATA_TIMEOUT = 60 * 2
 CACHE_OVERVIEW_TIMEOUT = 60 * 2
 CACHE_HOME_TIMEOUT = 60 * 10
 CACHE_USER_TIMEOUT = 60 * 60
+# 缓存失效时，同一个缓存key只允许一个请求回源，其余请求等待其结果
+CACHE_SINGLE_FLIGHT_ENABLED = True
+# 等待其他请求回源结果的最长时间(秒)，超时后自行回源
+CACHE_SINGLE_FLIGHT_WAIT = 3
+# 回源锁的过期时间(秒)
+CACHE_REFRESH_LOCK_TIMEOUT = 30
 
 # SaaS访问读写权限
 ROLE_WRITE_PERMISSION = "w"
@@ -1692,6 +1743,12 @@ SYNC_BKBASE_META_SUPPORTED_STORAGE_TYPES = ["mysql", "tspider", "hdfs"]
 # access数据批量处理
 ACCESS_DATA_BATCH_PROCESS_SIZE = 50000
 ACCESS_DATA_BATCH_PROCESS_THRESHOLD = 0
+# access数据批量处理时，是否按series分块流式查询，避免先加载全部数据点
+ACCESS_DATA_STREAMING_QUERY_ENABLED = True
+# access维度补充时，进程内CMDB主机及服务实例缓存的过期时间(秒)，0表示不使用进程内缓存
+ACCESS_CMDB_LOCAL_CACHE_TTL = 60
+# access维度补充时，进程内CMDB主机及服务实例缓存的最大数量
+ACCESS_CMDB_LOCAL_CACHE_MAX_SIZE = 50000
 
 # metadata请求es超时配置, 单位为秒，默认10秒
 # 格式: {default: 10, 集群域名: 20}
@@ -1712,6 +1769,30 @@ ENABLE_UPTIMECHECK_TEST = True
 # 检测结果缓存 TTL(小时)
 CHECK_RESULT_TTL_HOURS = 1
 
+# 告警构建时是否异步批量写入事件到 ES
+ALERT_EVENT_ASYNC_WRITE_ENABLED = False
+# 事件异步写入队列长度，队列满时转为同步写入
+ALERT_EVENT_WRITER_QUEUE_SIZE = 50000
+# 事件异步写入单批数量
+ALERT_EVENT_WRITER_BATCH_SIZE = 2000
+# 事件异步写入并发请求数
+ALERT_EVENT_WRITER_CONCURRENCY = 4
+# 事件异步写入失败重试次数
+ALERT_EVENT_WRITER_MAX_RETRIES = 3
+# 告警事件拉取是否按kafka集群并发拉取，各集群由独立线程拉取后汇总推送
+ALERT_POLLER_CONCURRENT_ENABLED = False
+# 告警事件并发拉取时，待推送队列长度(按单次拉取结果计数)
+ALERT_POLLER_QUEUE_SIZE = 100
+# 告警事件并发拉取时，攒批推送的最长等待时间(毫秒)
+ALERT_POLLER_BATCH_WINDOW = 200
+
+# 检测结果过期清理是否使用 lua 脚本在 redis 服务端执行
+DETECT_RESULT_CLEAN_SCRIPT_ENABLED = True
+# 检测结果过期清理单次脚本调用扫描的维度数量
+DETECT_RESULT_CLEAN_SCAN_COUNT = 1000
+# 检测结果过期清理每秒最多扫描的维度数量，0 表示不限制
+DETECT_RESULT_CLEAN_MAX_FIELDS_PER_SECOND = 50000
+
 # 支持来源 APIGW 列表
 FROM_APIGW_NAME = os.getenv("FROM_APIGW_NAME", "bk-monitor")
 # 网关环境，prod 表示生产环境，stage 表示测试环境
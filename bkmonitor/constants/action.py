@@ -812,6 +812,21 @@ class IntervalNotifyMode:
     CHOICES = [(key, value) for key, value in DICT.items()]
 
 
+class NoiseReduceCardinalityMode:
+    """
+    降噪基数统计方式
+    """
+
+    # 按维度组合记录有序集合成员，结果精确，内存随维度基数增长
+    EXACT = "exact"
+    # 按时间分桶记录 HyperLogLog，结果存在约 0.81% 的标准误差，单个分桶内存固定
+    APPROXIMATE = "approximate"
+
+    DICT = {EXACT: _lazy("精确"), APPROXIMATE: _lazy("近似")}
+
+    CHOICES = [(key, value) for key, value in DICT.items()]
+
+
 class ChatMessageType:
     DETAIL_URL = "detail_url"
     ALARM_CONTENT = "alarm_content"
@@ -304,6 +304,29 @@ ALERT_PROCESS_PUSH_DATA_COUNT = Counter(
     labelnames=("bk_data_id", "topic", "strategy_id", "is_saved"),
 )
 
+ALERT_EVENT_WRITE_COUNT = Counter(
+    name="bkmonitor_alert_event_write_count",
+    documentation="alert(builder) 模块异步写入 ES 的事件条数",
+    labelnames=("status",),
+)
+
+ALERT_EVENT_WRITER_BACKPRESSURE_COUNT = Counter(
+    name="bkmonitor_alert_event_writer_backpressure_count",
+    documentation="alert(builder) 模块异步写入队列已满，转为同步写入的事件条数",
+)
+
+ALERT_POLLER_POLL_EVENT_COUNT = Counter(
+    name="bkmonitor_alert_poller_poll_event_count",
+    documentation="alert(poller) 模块各 kafka 集群拉取事件条数",
+    labelnames=("bootstrap_server",),
+)
+
+ALERT_POLLER_CONSUMER_LAG = Gauge(
+    name="bkmonitor_alert_poller_consumer_lag",
+    documentation="alert(poller) 模块 kafka 分区消费积压条数",
+    labelnames=("bootstrap_server", "topic", "partition"),
+)
+
 PROCESS_BIG_LATENCY = Histogram(
     name="bkmonitor_big_process_latency",
     documentation="处理延迟过大",
@@ -1164,6 +1187,45 @@ DB_KEYS_EXPIRING = Gauge(
     labelnames=("node", "role", "db", "host", "port", "cluster_name"),
 )
 
+# redis key 空间分析指标
+REDIS_KEYSPACE_KEY_COUNT = Gauge(
+    name="redis_keyspace_key_count",
+    documentation="各 key 族的 key 数量",
+    labelnames=("cluster_name", "node", "db", "family"),
+)
+
+REDIS_KEYSPACE_MEMORY_BYTES = Gauge(
+    name="redis_keyspace_memory_bytes",
+    documentation="各 key 族的内存占用(抽样估算)",
+    labelnames=("cluster_name", "node", "db", "family"),
+)
+
+REDIS_KEYSPACE_TTL_KEY_COUNT = Gauge(
+    name="redis_keyspace_ttl_key_count",
+    documentation="各 key 族按剩余过期时间区间的 key 数量(抽样估算)",
+    labelnames=("cluster_name", "node", "db", "family", "ttl_range"),
+)
+
+REDIS_KEYSPACE_STRATEGY_KEY_COUNT = Gauge(
+    name="redis_keyspace_strategy_key_count",
+    documentation="各 key 族中 key 数量最多的策略",
+    labelnames=("cluster_name", "node", "db", "family", "strategy_id"),
+)
+
+REDIS_PIPELINE_ROUND_TRIP_TIME = Histogram(
+    name="bkmonitor_redis_pipeline_round_trip_time",
+    documentation="告警缓存 redis 各节点 pipeline 提交耗时",
+    labelnames=("backend", "node_id"),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, INF),
+)
+
+REDIS_PIPELINE_BATCH_SIZE = Histogram(
+    name="bkmonitor_redis_pipeline_batch_size",
+    documentation="告警缓存 redis 各节点 pipeline 单次提交的命令数",
+    labelnames=("backend", "node_id"),
+    buckets=(1, 5, 10, 50, 100, 500, 1000, 5000, INF),
+)
+
 API_FAILED_REQUESTS_TOTAL = Counter(
     name="bkmonitor_api_failed_requests_total",
     documentation="API调用失败计数",
@@ -77,6 +77,10 @@ SPACE_TO_RESULT_TABLE_KEY = os.environ.get(
 SPACE_TO_RESULT_TABLE_CHANNEL = os.environ.get(
     "SPACE_TO_RESULT_TABLE_CHANNEL", f"{SPACE_REDIS_PREFIX_KEY}:space_to_result_table:channel"
 )
+# 空间关联的结果表内容摘要，用于批量推送时跳过未变化的空间
+SPACE_TO_RESULT_TABLE_DIGEST_KEY = os.environ.get(
+    "SPACE_TO_RESULT_TABLE_DIGEST_KEY", f"{SPACE_REDIS_PREFIX_KEY}:space_to_result_table:digest"
+)
 # 数据标签关联的结果表
 DATA_LABEL_TO_RESULT_TABLE_KEY = os.environ.get(
     "DATA_LABEL_TO_RESULT_TABLE_KEY", f"{SPACE_REDIS_PREFIX_KEY}:data_label_to_result_table"
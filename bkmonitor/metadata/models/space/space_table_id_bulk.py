@@ -0,0 +1,223 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import datetime
+import logging
+from collections import defaultdict
+from collections.abc import Callable
+from typing import Any
+
+from django.db.models import Q
+from django.utils.timezone import now as tz_now
+
+from metadata import models
+from metadata.models.record_rule.constants import RECORD_RULE_V4_DELETED_RETENTION_DAYS
+from metadata.models.space.constants import SpaceTypes
+from metadata.models.space.ds_rt import get_platform_data_ids
+from metadata.utils.db import filter_model_by_in_page, filter_query_set_by_in_page
+
+logger = logging.getLogger("metadata")
+
+
+class SpaceTableIDBulkContext:
+    """
+    批量组装空间路由时共享的数据
+
+    空间路由中的大部分数据与具体空间无关（平台数据源、结果表存储、结果表类型等），其余数据可按空间批量查询
+    （空间、空间资源、空间数据源、预计算结果表等）。批量推送时预先加载或按需缓存这些数据，
+    逐个空间组装时只需在内存中计算，避免重复查询数据库。
+    """
+
+    def __init__(self, spaces: list[models.Space]):
+        self.spaces: dict[tuple[str, str], models.Space] = {
+            (space.space_type_id, str(space.space_id)): space for space in spaces
+        }
+        space_ids = list({space_id for _, space_id in self.spaces})
+
+        self._cache: dict[Any, Any] = {}
+        # 数据源 -> 结果表
+        self._data_id_table_ids: dict[int, list[str]] = {}
+        # 租户 -> 结果表 -> 是否写入 influxdb/vm/es
+        self._refined_table_ids: dict[str, dict[str, bool]] = defaultdict(dict)
+        # 数据源 -> 数据源详情
+        self._data_id_detail: dict[int, dict | None] = {}
+        # (租户, 结果表) -> 结果表详情
+        self._result_tables: dict[tuple[str | None, str], dict | None] = {}
+        # (租户, 结果表, 数据源) -> 结果表类型
+        self._measurement_types: dict[tuple[str, str, int], str | None] = {}
+
+        # 空间关联的数据源
+        self.space_data_sources: dict[tuple[str, str], list[dict]] = defaultdict(list)
+        for item in filter_model_by_in_page(
+            model=models.SpaceDataSource,
+            field_op="space_id__in",
+            filter_data=space_ids,
+            value_func="values",
+            value_field_list=["space_type_id", "space_id", "bk_data_id", "from_authorization"],
+        ):
+            key = (item["space_type_id"], item["space_id"])
+            if key in self.spaces:
+                self.space_data_sources[key].append(item)
+
+        # 空间关联的资源，按主键排序以保持与 first() 一致的结果
+        self.space_resources: dict[tuple[str, str, str], list[models.SpaceResource]] = defaultdict(list)
+        for resource in filter_query_set_by_in_page(
+            query_set=models.SpaceResource.objects.order_by("id"),
+            field_op="space_id__in",
+            filter_data=space_ids,
+        ):
+            key = (resource.space_type_id, resource.space_id)
+            if key in self.spaces:
+                self.space_resources[(*key, resource.resource_type)].append(resource)
+
+        # 预计算结果表
+        from metadata.models.record_rule.rules import RecordRule
+        from metadata.models.record_rule.v4 import RecordRuleV4
+
+        self.record_rule_table_ids: dict[tuple[str, str, str], list[str]] = defaultdict(list)
+        for item in filter_model_by_in_page(
+            model=RecordRule,
+            field_op="space_id__in",
+            filter_data=space_ids,
+            value_func="values",
+            value_field_list=["space_type", "space_id", "bk_tenant_id", "table_id"],
+        ):
+            self.record_rule_table_ids[(item["space_type"], item["space_id"], item["bk_tenant_id"])].append(
+                item["table_id"]
+            )
+
+        queryable_deleted_at = tz_now() - datetime.timedelta(days=RECORD_RULE_V4_DELETED_RETENTION_DAYS)
+        self.record_rule_v4_table_ids: dict[tuple[str, str, str], list[str]] = defaultdict(list)
+        for item in filter_query_set_by_in_page(
+            query_set=RecordRuleV4.objects.filter(Q(deleted_at__isnull=True) | Q(deleted_at__gt=queryable_deleted_at)),
+            field_op="space_id__in",
+            filter_data=space_ids,
+            value_func="values",
+            value_field_list=["space_type", "space_id", "bk_tenant_id", "table_id"],
+        ):
+            self.record_rule_v4_table_ids[(item["space_type"], item["space_id"], item["bk_tenant_id"])].append(
+                item["table_id"]
+            )
+
+    def memo(self, key: Any, func: Callable[[], Any]) -> Any:
+        """缓存与具体空间无关的数据"""
+        if key not in self._cache:
+            self._cache[key] = func()
+        return self._cache[key]
+
+    def has_space(self, space_type: str, space_id: str) -> bool:
+        return (space_type, str(space_id)) in self.spaces
+
+    def get_space(self, space_type: str, space_id: str) -> models.Space | None:
+        return self.spaces.get((space_type, str(space_id)))
+
+    def get_biz_id_by_space(self, space_type: str, space_id: str) -> int | None:
+        """与 Space.objects.get_biz_id_by_space 一致"""
+        space = self.get_space(space_type, space_id)
+        if space is None:
+            return None
+        if space_type == SpaceTypes.BKCC.value:
+            return int(space.space_id)
+        return -space.id
+
+    def get_space_resource(
+        self, space_type: str, space_id: str, resource_type: str, resource_id: str | None = None
+    ) -> models.SpaceResource | None:
+        for resource in self.space_resources.get((space_type, str(space_id), resource_type), []):
+            if resource_id is None or resource.resource_id == resource_id:
+                return resource
+        return None
+
+    def get_space_data_ids(self, space_type: str, space_id: str, from_authorization: bool | None = None) -> set[int]:
+        return {
+            item["bk_data_id"]
+            for item in self.space_data_sources.get((space_type, str(space_id)), [])
+            if from_authorization is None or item["from_authorization"] == from_authorization
+        }
+
+    def get_platform_data_ids(self, space_type: str, bk_tenant_id: str) -> dict[int, str]:
+        return self.memo(
+            ("platform_data_ids", space_type, bk_tenant_id),
+            lambda: get_platform_data_ids(space_type=space_type, bk_tenant_id=bk_tenant_id),
+        )
+
+    def get_table_id_data_id(self, data_ids: set[int]) -> dict[str, int]:
+        """获取数据源关联的结果表，与 get_space_table_id_data_id 返回格式一致"""
+        missing_data_ids = [data_id for data_id in data_ids if data_id not in self._data_id_table_ids]
+        for data_id in missing_data_ids:
+            self._data_id_table_ids[data_id] = []
+        for item in filter_model_by_in_page(
+            model=models.DataSourceResultTable,
+            field_op="bk_data_id__in",
+            filter_data=missing_data_ids,
+            value_func="values",
+            value_field_list=["bk_data_id", "table_id"],
+        ):
+            self._data_id_table_ids[item["bk_data_id"]].append(item["table_id"])
+
+        return {table_id: data_id for data_id in data_ids for table_id in self._data_id_table_ids[data_id]}
+
+    def refine_table_ids(self, table_id_list: list[str], bk_tenant_id: str, func: Callable[[list], set]) -> set:
+        """按结果表缓存是否写入 influxdb/vm/es 的判断结果"""
+        refined = self._refined_table_ids[bk_tenant_id]
+        missing_table_ids = list({table_id for table_id in table_id_list if table_id not in refined})
+        if missing_table_ids:
+            refined_table_ids = func(missing_table_ids)
+            for table_id in missing_table_ids:
+                refined[table_id] = table_id in refined_table_ids
+        return {table_id for table_id in table_id_list if refined[table_id]}
+
+    def get_data_id_detail(self, data_ids: list[int], func: Callable[[list], list[dict]]) -> dict[int, dict]:
+        missing_data_ids = list({data_id for data_id in data_ids if data_id not in self._data_id_detail})
+        for data_id in missing_data_ids:
+            self._data_id_detail[data_id] = None
+        for data in func(missing_data_ids):
+            self._data_id_detail[data["bk_data_id"]] = data
+        return {data_id: self._data_id_detail[data_id] for data_id in data_ids if self._data_id_detail[data_id]}
+
+    def get_result_tables(
+        self, table_ids: set[str], bk_tenant_id: str | None, func: Callable[[list], list[dict]]
+    ) -> list[dict]:
+        missing_table_ids = [table_id for table_id in table_ids if (bk_tenant_id, table_id) not in self._result_tables]
+        for table_id in missing_table_ids:
+            self._result_tables[(bk_tenant_id, table_id)] = None
+        for data in func(missing_table_ids):
+            self._result_tables[(bk_tenant_id, data["table_id"])] = data
+        return [
+            self._result_tables[(bk_tenant_id, table_id)]
+            for table_id in table_ids
+            if self._result_tables[(bk_tenant_id, table_id)]
+        ]
+
+    def get_measurement_types(
+        self,
+        table_list: list[dict],
+        table_id_data_id: dict[str, int],
+        bk_tenant_id: str,
+        func: Callable[[set, list, dict], dict],
+    ) -> dict[str, str]:
+        def key(table_id):
+            return bk_tenant_id, table_id, table_id_data_id.get(table_id)
+
+        missing_table_list = [table for table in table_list if key(table["table_id"]) not in self._measurement_types]
+        if missing_table_list:
+            missing_table_ids = {table["table_id"] for table in missing_table_list}
+            measurement_types = func(
+                missing_table_ids,
+                missing_table_list,
+                {table_id: table_id_data_id.get(table_id) for table_id in missing_table_ids},
+            )
+            for table_id in missing_table_ids:
+                self._measurement_types[key(table_id)] = measurement_types.get(table_id)
+        return {
+            table["table_id"]: self._measurement_types[key(table["table_id"])]
+            for table in table_list
+            if self._measurement_types[key(table["table_id"])]
+        }
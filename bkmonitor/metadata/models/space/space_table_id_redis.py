@@ -35,6 +35,7 @@ from metadata.models.space.constants import (
     RESULT_TABLE_DETAIL_CHANNEL,
     RESULT_TABLE_DETAIL_KEY,
     SPACE_TO_RESULT_TABLE_CHANNEL,
+    SPACE_TO_RESULT_TABLE_DIGEST_KEY,
     SPACE_TO_RESULT_TABLE_KEY,
     BCSClusterTypes,
     EtlConfigs,
@@ -55,6 +56,7 @@ from metadata.models.space.utils import (
     get_related_spaces,
     reformat_table_id,
 )
+from metadata.models.space.space_table_id_bulk import SpaceTableIDBulkContext
 from metadata.utils.db import filter_model_by_in_page, filter_query_set_by_in_page
 from metadata.utils.redis_tools import RedisTools
 
@@ -69,6 +71,9 @@ class SpaceTableIDRedis:
 
     SUPPORT_SPACE_TYPES = {SpaceTypes.BKCC.value, SpaceTypes.BKCI.value, SpaceTypes.BKSAAS.value}
 
+    # 批量推送空间路由时共享的数据，仅在 push_multi_space_table_ids 创建的实例上设置
+    bulk_context: SpaceTableIDBulkContext | None = None
+
     def push_space_table_ids(self, space_type: str, space_id: str, is_publish: bool | None = False):
         """
         推送空间及对应的结果表和过滤条件
@@ -79,6 +84,96 @@ class SpaceTableIDRedis:
         space_id = str(space_id)
 
         space = models.Space.objects.get(space_type_id=space_type, space_id=space_id)
+        space_redis_key, values_to_redis = self._compose_space_redis_values(space)
+
+        # 推送数据
+        if values_to_redis:
+            redis_value = json.dumps(values_to_redis)
+            RedisTools.hmset_to_redis(SPACE_TO_RESULT_TABLE_KEY, {space_redis_key: redis_value})
+            # 同步更新内容摘要，保证批量推送时的变化判断准确
+            RedisTools.hset_to_redis(
+                SPACE_TO_RESULT_TABLE_DIGEST_KEY, space_redis_key, RedisTools.get_value_digest(redis_value)
+            )
+
+        logger.info(
+            "push redis space_to_result_table, space_type: %s, space_id: %s",
+            space_type,
+            space_id,
+        )
+
+        # 通知使用方
+        if is_publish:
+            RedisTools.publish(SPACE_TO_RESULT_TABLE_CHANNEL, [space_redis_key])
+        logger.info("push space table_id data successfully, space_type: %s, space_id: %s", space_type, space_id)
+
+    def push_multi_space_table_ids(
+        self, spaces: list[models.Space | dict], is_publish: bool | None = False, force: bool = False
+    ) -> list[str]:
+        """
+        批量推送空间数据
+
+        空间无关的数据（平台数据源、结果表存储及类型等）在批次内只查询一次，空间相关的数据按批次预先加载，
+        组装完成后通过 pipeline 一次写入；内容未变化的空间不重复写入，也不通知使用方
+        :param spaces: 空间列表，支持 Space 实例或包含 space_type_id、space_id 的字典
+        :param is_publish: 是否通知使用方
+        :param force: 是否忽略内容摘要，强制写入全部空间
+        :return: 发生变化的空间 redis key
+        """
+        space_keys = set()
+        for space in spaces:
+            if isinstance(space, dict):
+                space_keys.add((space["space_type_id"], str(space["space_id"])))
+            else:
+                space_keys.add((space.space_type_id, str(space.space_id)))
+        if not space_keys:
+            return []
+
+        space_objs = [
+            space
+            for space in filter_model_by_in_page(
+                model=models.Space,
+                field_op="space_id__in",
+                filter_data=list({space_id for _, space_id in space_keys}),
+            )
+            if (space.space_type_id, space.space_id) in space_keys
+        ]
+        for space_type, space_id in space_keys - {(space.space_type_id, space.space_id) for space in space_objs}:
+            logger.error(
+                "push_multi_space_table_ids: space not found, space_type: %s, space_id: %s", space_type, space_id
+            )
+
+        # 批量推送使用独立的实例，避免多线程共用实例时互相影响
+        client = self.__class__()
+        client.bulk_context = SpaceTableIDBulkContext(space_objs)
+
+        field_value = {}
+        for space in space_objs:
+            space_redis_key, values_to_redis = client._compose_space_redis_values(space)
+            if values_to_redis:
+                field_value[space_redis_key] = json.dumps(values_to_redis)
+
+        # 推送数据
+        changed_keys = RedisTools.hmset_changed_to_redis(
+            SPACE_TO_RESULT_TABLE_KEY, SPACE_TO_RESULT_TABLE_DIGEST_KEY, field_value, force=force
+        )
+        logger.info(
+            "push_multi_space_table_ids: total spaces->[%s], pushed->[%s], changed->[%s]",
+            len(space_keys),
+            len(field_value),
+            len(changed_keys),
+        )
+
+        # 通知使用方
+        if is_publish and changed_keys:
+            RedisTools.publish(SPACE_TO_RESULT_TABLE_CHANNEL, changed_keys)
+        return changed_keys
+
+    def _compose_space_redis_values(self, space: models.Space) -> tuple[str, dict]:
+        """
+        组装空间对应的 redis key 及结果表数据
+        """
+        space_type: str = space.space_type_id
+        space_id: str = str(space.space_id)
         bk_tenant_id = space.bk_tenant_id
 
         # 过滤空间关联的数据源信息
@@ -103,39 +198,7 @@ class SpaceTableIDRedis:
             space_redis_key = f"{space_type}__{space_id}|{bk_tenant_id}"
         else:
             space_redis_key = f"{space_type}__{space_id}"
-
-        # 推送数据
-        if values_to_redis:
-            RedisTools.hmset_to_redis(SPACE_TO_RESULT_TABLE_KEY, {space_redis_key: json.dumps(values_to_redis)})
-
-        logger.info(
-            "push redis space_to_result_table, space_type: %s, space_id: %s",
-            space_type,
-            space_id,
-        )
-
-        # 通知使用方
-        if is_publish:
-            RedisTools.publish(SPACE_TO_RESULT_TABLE_CHANNEL, [space_redis_key])
-        logger.info("push space table_id data successfully, space_type: %s, space_id: %s", space_type, space_id)
-
-    def push_multi_space_table_ids(self, spaces: list[models.Space], is_publish: bool | None = False) -> None:
-        """
-        批量推送空间数据
-        """
-        # 推送数据
-        for space in spaces:
-            self.push_space_table_ids(space.space_type_id, space.space_id, is_publish=False)
-
-        # 通知使用方
-        if is_publish:
-            push_redis_keys = []
-            for space in spaces:
-                if settings.ENABLE_MULTI_TENANT_MODE:
-                    push_redis_keys.append(f"{space.space_type_id}__{space.space_id}|{space.bk_tenant_id}")
-                else:
-                    push_redis_keys.append(f"{space.space_type_id}__{space.space_id}")
-            RedisTools.publish(SPACE_TO_RESULT_TABLE_CHANNEL, push_redis_keys)
+        return space_redis_key, values_to_redis
 
     def push_data_label_table_ids(
         self,
@@ -925,11 +988,25 @@ class SpaceTableIDRedis:
             space_id,
             bk_tenant_id,
         )
-        records = models.VMShortLinkRecord.objects.filter(
-            bk_tenant_id=bk_tenant_id,
-            is_enabled=True,
-            is_deleted=False,
-        ).filter(Q(space_type=space_type, space_id=space_id) | Q(is_global=True))
+        if self.bulk_context is not None:
+            records = [
+                record
+                for record in self.bulk_context.memo(
+                    ("vm_short_link_records", bk_tenant_id),
+                    lambda: list(
+                        models.VMShortLinkRecord.objects.filter(
+                            bk_tenant_id=bk_tenant_id, is_enabled=True, is_deleted=False
+                        )
+                    ),
+                )
+                if (record.space_type == space_type and record.space_id == space_id) or record.is_global
+            ]
+        else:
+            records = models.VMShortLinkRecord.objects.filter(
+                bk_tenant_id=bk_tenant_id,
+                is_enabled=True,
+                is_deleted=False,
+            ).filter(Q(space_type=space_type, space_id=space_id) | Q(is_global=True))
         if not records:
             return {}
 
@@ -964,21 +1041,27 @@ class SpaceTableIDRedis:
         logger.info("start to push cluster of bcs space table_id, space_type: %s, space_id: %s", space_type, space_id)
         # 首先获取关联业务的数据
         resource_type = SpaceTypes.BKCC.value
-        obj = models.SpaceResource.objects.filter(
-            space_type_id=space_type, space_id=space_id, resource_type=resource_type
-        ).first()
+        obj = self._get_space_resource(space_type=space_type, space_id=space_id, resource_type=resource_type)
         if not obj:
             logger.error("space: %s__%s, resource_type: %s not found", space_type, space_id, resource_type)
             return {}
+
         # 获取空间关联的业务，注意这里业务 ID 为字符串类型
         # 追加空间访问指定插件的 filter
-        rts = models.ResultTable.objects.filter(
-            Q(table_id__startswith=BKCI_SYSTEM_TABLE_ID_PREFIX) | Q(table_id__in=settings.BKCI_SPACE_ACCESS_PLUGIN_LIST)
-        )
+        def get_tids():
+            rts = models.ResultTable.objects.filter(
+                Q(table_id__startswith=BKCI_SYSTEM_TABLE_ID_PREFIX)
+                | Q(table_id__in=settings.BKCI_SPACE_ACCESS_PLUGIN_LIST)
+            )
 
-        if settings.ENABLE_MULTI_TENANT_MODE:  # 若开启多租户模式,则这里应该会变成新版1001数据
-            rts = rts.filter(bk_tenant_id=bk_tenant_id)
-        tids = rts.values_list("table_id", flat=True)
+            if settings.ENABLE_MULTI_TENANT_MODE:  # 若开启多租户模式,则这里应该会变成新版1001数据
+                rts = rts.filter(bk_tenant_id=bk_tenant_id)
+            return list(rts.values_list("table_id", flat=True))
+
+        if self.bulk_context is not None:
+            tids = self.bulk_context.memo(("bcs_space_biz_table_ids", bk_tenant_id), get_tids)
+        else:
+            tids = get_tids()
 
         return {tid: {"filters": [{"bk_biz_id": str(obj.resource_id)}]} for tid in tids}
 
@@ -992,11 +1075,10 @@ class SpaceTableIDRedis:
         # 获取空间的集群数据
         resource_type = SpaceTypes.BCS.value
         # 优先进行判断项目相关联的容器资源，减少等待
-        sr_objs = models.SpaceResource.objects.filter(
-            space_type_id=space_type, space_id=space_id, resource_type=resource_type, resource_id=space_id
-        )
         default_values = {}
-        str_obj = sr_objs.first()
+        str_obj = self._get_space_resource(
+            space_type=space_type, space_id=space_id, resource_type=resource_type, resource_id=space_id
+        )
         if not str_obj:
             logger.error("space: %s__%s, resource_type: %s not found", space_type, space_id, resource_type)
             return default_values
@@ -1036,13 +1118,17 @@ class SpaceTableIDRedis:
         """组装 bkci 全局下的结果表"""
         logger.info("start to push bkci level table_id, space_type: %s, space_id: %s", space_type, space_id)
         # 过滤空间级的数据源
-        data_ids = get_platform_data_ids(space_type=space_type, bk_tenant_id=bk_tenant_id)
-        # 一个空间下 data_id 不会太多
-        table_is_list = list(
-            models.DataSourceResultTable.objects.filter(bk_data_id__in=data_ids.keys()).values_list(
-                "table_id", flat=True
+        if self.bulk_context is not None:
+            data_ids = self.bulk_context.get_platform_data_ids(space_type=space_type, bk_tenant_id=bk_tenant_id)
+            table_is_list = list(self.bulk_context.get_table_id_data_id(set(data_ids.keys())).keys())
+        else:
+            data_ids = get_platform_data_ids(space_type=space_type, bk_tenant_id=bk_tenant_id)
+            # 一个空间下 data_id 不会太多
+            table_is_list = list(
+                models.DataSourceResultTable.objects.filter(bk_data_id__in=data_ids.keys()).values_list(
+                    "table_id", flat=True
+                )
             )
-        )
         _values = {}
         if not table_is_list:
             return _values
@@ -1051,7 +1137,13 @@ class SpaceTableIDRedis:
         # 组装数据
         for tid in table_ids:
             if tid in settings.SPECIAL_RT_ROUTE_ALIAS_RESULT_TABLE_LIST:
-                rt_ins = models.ResultTable.objects.get(bk_tenant_id=bk_tenant_id, table_id=tid)
+                if self.bulk_context is not None:
+                    rt_ins = self.bulk_context.memo(
+                        ("special_alias_result_table", bk_tenant_id, tid),
+                        lambda: models.ResultTable.objects.get(bk_tenant_id=bk_tenant_id, table_id=tid),
+                    )
+                else:
+                    rt_ins = models.ResultTable.objects.get(bk_tenant_id=bk_tenant_id, table_id=tid)
                 logger.info(
                     "_compose_bkci_level_table_ids: table_id->[%s] in special_rt_list, will use filter key->[%s]",
                     tid,
@@ -1066,7 +1158,7 @@ class SpaceTableIDRedis:
     def _compose_bkci_other_table_ids(self, space_type: str, space_id: str, bk_tenant_id=DEFAULT_TENANT_ID) -> dict:
         logger.info("start to push bkci space other table_id, space_type: %s, space_id: %s", space_type, space_id)
         exclude_data_id_list = utils.cached_cluster_data_id_list()
-        table_id_data_id = get_space_table_id_data_id(
+        table_id_data_id = self._get_space_table_id_data_id(
             space_type,
             space_id,
             exclude_data_id_list=exclude_data_id_list,
@@ -1094,13 +1186,21 @@ class SpaceTableIDRedis:
         logger.info(
             "start to push bkci space cross space_type table_id, space_type: %s, space_id: %s", space_type, space_id
         )
-        tids = models.ResultTable.objects.filter(table_id__startswith=BKCI_1001_TABLE_ID_PREFIX).values_list(
-            "table_id", flat=True
-        )
-        # bkci 访问 p4 主机数据对应的结果表
-        p4_tids = models.ResultTable.objects.filter(table_id__startswith=P4_1001_TABLE_ID_PREFIX).values_list(
-            "table_id", flat=True
-        )
+
+        def get_tids():
+            tids = models.ResultTable.objects.filter(table_id__startswith=BKCI_1001_TABLE_ID_PREFIX).values_list(
+                "table_id", flat=True
+            )
+            # bkci 访问 p4 主机数据对应的结果表
+            p4_tids = models.ResultTable.objects.filter(table_id__startswith=P4_1001_TABLE_ID_PREFIX).values_list(
+                "table_id", flat=True
+            )
+            return list(tids), list(p4_tids)
+
+        if self.bulk_context is not None:
+            tids, p4_tids = self.bulk_context.memo("bkci_cross_table_ids", get_tids)
+        else:
+            tids, p4_tids = get_tids()
         # 组装结果表对应的 filter
         tid_filters = {tid: {"filters": [{"projectId": space_id}]} for tid in tids}
         tid_filters.update({tid: {"filters": [{"devops_id": space_id}]} for tid in p4_tids})
@@ -1110,10 +1210,10 @@ class SpaceTableIDRedis:
         """组装非业务类型的全空间类型的结果表数据"""
         logger.info("start to push all space type table_id, space_type: %s, space_id: %s", space_type, space_id)
         # 转换空间对应的bk_biz_id
-        try:
-            _id = models.Space.objects.get(space_type_id=space_type, space_id=space_id).id
-        except models.Space.DoesNotExist:
+        space = self._get_space(space_type, space_id)
+        if space is None:
             return {}
+        _id = space.id
         return {tid: {"filters": [{"bk_biz_id": str(-_id)}]} for tid in ALL_SPACE_TYPE_TABLE_ID_LIST}
 
     def _compose_apm_all_type_table_ids(self, space_type: str, space_id: str) -> dict:
@@ -1123,14 +1223,21 @@ class SpaceTableIDRedis:
         """
         # TODO： 该方法为临时支持，长期需要改造抽象为公共逻辑
         logger.info("start to push apm all space type table_id, space_type: %s, space_id: %s", space_type, space_id)
-        try:
-            space = models.Space.objects.get(space_type_id=space_type, space_id=space_id)
-        except models.Space.DoesNotExist:
+        space = self._get_space(space_type, space_id)
+        if space is None:
             return {}
 
-        result_tables = models.ResultTable.objects.filter(
-            table_id__startswith=ApmGlobalTablePrefix.COMMON, bk_tenant_id=space.bk_tenant_id
-        )
+        def get_result_tables():
+            return list(
+                models.ResultTable.objects.filter(
+                    table_id__startswith=ApmGlobalTablePrefix.COMMON, bk_tenant_id=space.bk_tenant_id
+                )
+            )
+
+        if self.bulk_context is not None:
+            result_tables = self.bulk_context.memo(("apm_all_type_table_ids", space.bk_tenant_id), get_result_tables)
+        else:
+            result_tables = get_result_tables()
         return {rt.table_id: {"filters": [{rt.bk_biz_id_alias: str(-space.id)}]} for rt in result_tables}
 
     def _compose_bksaas_space_cluster_table_ids(
@@ -1146,11 +1253,10 @@ class SpaceTableIDRedis:
         # 获取空间的集群数据
         resource_type = SpaceTypes.BKSAAS.value
         # 优先进行判断项目相关联的容器资源，减少等待
-        sr_objs = models.SpaceResource.objects.filter(
-            space_type_id=space_type, space_id=space_id, resource_type=resource_type, resource_id=space_id
-        )
         default_values = {}
-        str_obj = sr_objs.first()
+        str_obj = self._get_space_resource(
+            space_type=space_type, space_id=space_id, resource_type=resource_type, resource_id=space_id
+        )
         if not str_obj:
             logger.error("space: %s__%s, resource_type: %s not found", space_type, space_id, resource_type)
             return default_values
@@ -1201,7 +1307,7 @@ class SpaceTableIDRedis:
         logger.info("start to push bksaas space other table_id, space_type: %s, space_id: %s", space_type, space_id)
         exclude_data_id_list = utils.cached_cluster_data_id_list()
         # 过滤到对应的结果表
-        table_id_data_id = get_space_table_id_data_id(
+        table_id_data_id = self._get_space_table_id_data_id(
             space_type,
             space_id,
             table_id_list=table_id_list,
@@ -1241,7 +1347,7 @@ class SpaceTableIDRedis:
             bk_tenant_id,
         )
         # 过滤到对应的结果表
-        table_id_data_id = get_space_table_id_data_id(
+        table_id_data_id = self._get_space_table_id_data_id(
             space_type,
             space_id,
             table_id_list=table_id_list,
@@ -1261,13 +1367,20 @@ class SpaceTableIDRedis:
         table_id_data_id = {tid: table_id_data_id.get(tid) for tid in table_ids}
 
         data_id_list = list(table_id_data_id.values())
-        _filter_data = filter_model_by_in_page(
-            model=models.DataSource,
-            field_op="bk_data_id__in",
-            filter_data=data_id_list,
-            value_func="values",
-            value_field_list=["bk_data_id", "etl_config", "space_uid", "is_platform_data_id"],
-        )
+
+        def filter_data_id_detail(_data_id_list):
+            return filter_model_by_in_page(
+                model=models.DataSource,
+                field_op="bk_data_id__in",
+                filter_data=_data_id_list,
+                value_func="values",
+                value_field_list=["bk_data_id", "etl_config", "space_uid", "is_platform_data_id"],
+            )
+
+        if self.bulk_context is not None:
+            _filter_data = self.bulk_context.get_data_id_detail(data_id_list, filter_data_id_detail).values()
+        else:
+            _filter_data = filter_data_id_detail(data_id_list)
         # 获取datasource的信息，避免后续每次都去查询db
         data_id_detail = {
             data["bk_data_id"]: {
@@ -1283,14 +1396,22 @@ class SpaceTableIDRedis:
             other_filter.update({"bk_tenant_id": bk_tenant_id})
 
         # 判断是否添加过滤条件
-        _table_list = filter_model_by_in_page(
-            model=models.ResultTable,
-            field_op="table_id__in",
-            filter_data=table_ids,
-            value_func="values",
-            value_field_list=["table_id", "schema_type", "data_label", "bk_biz_id_alias", "default_storage"],
-            other_filter=other_filter,
-        )  # 新增bk_biz_id_alias,部分业务存在自定义过滤规则别名需求，如bk_biz_id -> appid
+        def filter_table_list(_table_ids):
+            return filter_model_by_in_page(
+                model=models.ResultTable,
+                field_op="table_id__in",
+                filter_data=_table_ids,
+                value_func="values",
+                value_field_list=["table_id", "schema_type", "data_label", "bk_biz_id_alias", "default_storage"],
+                other_filter=other_filter,
+            )  # 新增bk_biz_id_alias,部分业务存在自定义过滤规则别名需求，如bk_biz_id -> appid
+
+        if self.bulk_context is not None:
+            _table_list = self.bulk_context.get_result_tables(
+                table_ids, other_filter.get("bk_tenant_id"), filter_table_list
+            )
+        else:
+            _table_list = filter_table_list(table_ids)
 
         # ES / Doris 路由由后续独立流程处理，这里仅按 default_storage 排除，不再根据 RT 启用或删除状态过滤。
         _table_list = [
@@ -1302,9 +1423,25 @@ class SpaceTableIDRedis:
         table_id_data_id = {tid: table_id_data_id.get(tid) for tid in table_ids}
 
         # 获取结果表对应的类型
-        measurement_type_dict = get_measurement_type_by_table_id(
-            table_ids=table_ids, table_list=_table_list, table_id_data_id=table_id_data_id, bk_tenant_id=bk_tenant_id
-        )
+        if self.bulk_context is not None:
+            measurement_type_dict = self.bulk_context.get_measurement_types(
+                _table_list,
+                table_id_data_id,
+                bk_tenant_id,
+                lambda _table_ids, _table_list, _table_id_data_id: get_measurement_type_by_table_id(
+                    table_ids=_table_ids,
+                    table_list=_table_list,
+                    table_id_data_id=_table_id_data_id,
+                    bk_tenant_id=bk_tenant_id,
+                ),
+            )
+        else:
+            measurement_type_dict = get_measurement_type_by_table_id(
+                table_ids=table_ids,
+                table_list=_table_list,
+                table_id_data_id=table_id_data_id,
+                bk_tenant_id=bk_tenant_id,
+            )
 
         # 获取结果表-业务ID过滤别名 字典
         try:
@@ -1314,9 +1451,12 @@ class SpaceTableIDRedis:
             bk_biz_id_alias_dict = {}
 
         # 获取空间所属的数据源 ID
-        _space_data_ids = models.SpaceDataSource.objects.filter(
-            space_type_id=space_type, space_id=space_id, from_authorization=False
-        ).values_list("bk_data_id", flat=True)
+        if self.bulk_context is not None and self.bulk_context.has_space(space_type, space_id):
+            _space_data_ids = self.bulk_context.get_space_data_ids(space_type, space_id, from_authorization=False)
+        else:
+            _space_data_ids = models.SpaceDataSource.objects.filter(
+                space_type_id=space_type, space_id=space_id, from_authorization=False
+            ).values_list("bk_data_id", flat=True)
         for tid in table_ids:
             # NOTE: 特殊逻辑，忽略跨空间类型的 bkci 的结果表; 如果有其它，再提取为常量
             if tid.startswith(BKCI_1001_TABLE_ID_PREFIX):
@@ -1374,8 +1514,12 @@ class SpaceTableIDRedis:
             space_id,
             bk_tenant_id,
         )
-        objs = RecordRule.objects.filter(space_type=space_type, space_id=space_id, bk_tenant_id=bk_tenant_id)
-        values = {obj.table_id: {"filters": []} for obj in objs}
+        if self.bulk_context is not None and self.bulk_context.has_space(space_type, space_id):
+            table_ids = self.bulk_context.record_rule_table_ids.get((space_type, str(space_id), bk_tenant_id), [])
+        else:
+            objs = RecordRule.objects.filter(space_type=space_type, space_id=space_id, bk_tenant_id=bk_tenant_id)
+            table_ids = [obj.table_id for obj in objs]
+        values = {table_id: {"filters": []} for table_id in table_ids}
         values.update(
             self._compose_record_rule_v4_table_ids(
                 space_type=space_type,
@@ -1395,6 +1539,10 @@ class SpaceTableIDRedis:
 
         from metadata.models.record_rule.v4 import RecordRuleV4
 
+        if self.bulk_context is not None and self.bulk_context.has_space(space_type, space_id):
+            table_ids = self.bulk_context.record_rule_v4_table_ids.get((space_type, str(space_id), bk_tenant_id), [])
+            return {table_id: {"filters": []} for table_id in table_ids}
+
         queryable_deleted_at = tz_now() - datetime.timedelta(days=RECORD_RULE_V4_DELETED_RETENTION_DAYS)
         objs = RecordRuleV4.objects.filter(
             space_type=space_type,
@@ -1405,6 +1553,21 @@ class SpaceTableIDRedis:
 
     def _compose_es_table_ids(self, space_type: str, space_id: str, bk_tenant_id=DEFAULT_TENANT_ID):
         """组装es的结果表"""
+        if self.bulk_context is not None and self.bulk_context.has_space(space_type, space_id):
+            biz_id_table_ids = self.bulk_context.memo(
+                ("es_table_ids", bk_tenant_id),
+                lambda: self._group_table_ids_by_biz(
+                    models.ResultTable.objects.filter(
+                        default_storage=models.ClusterInfo.TYPE_ES,
+                        is_deleted=False,
+                        is_enable=True,
+                        bk_tenant_id=bk_tenant_id,
+                    )
+                ),
+            )
+            biz_id = self.bulk_context.get_biz_id_by_space(space_type, space_id)
+            return {tid: {"filters": []} for tid in biz_id_table_ids.get(biz_id, [])}
+
         biz_id = models.Space.objects.get_biz_id_by_space(space_type, space_id)
         tids = models.ResultTable.objects.filter(
             bk_biz_id=biz_id,
@@ -1419,12 +1582,83 @@ class SpaceTableIDRedis:
         """
         组装Doris链路结果表
         """
+        if self.bulk_context is not None and self.bulk_context.has_space(space_type, space_id):
+            biz_id_table_ids = self.bulk_context.memo(
+                "doris_table_ids",
+                lambda: self._group_table_ids_by_biz(
+                    models.ResultTable.objects.filter(
+                        default_storage=models.ClusterInfo.TYPE_DORIS, is_deleted=False, is_enable=True
+                    )
+                ),
+            )
+            biz_id = self.bulk_context.get_biz_id_by_space(space_type, space_id)
+            return {tid: {"filters": []} for tid in biz_id_table_ids.get(biz_id, [])}
+
         biz_id = models.Space.objects.get_biz_id_by_space(space_type, space_id)
         tids = models.ResultTable.objects.filter(
             bk_biz_id=biz_id, default_storage=models.ClusterInfo.TYPE_DORIS, is_deleted=False, is_enable=True
         ).values_list("table_id", flat=True)
         return {tid: {"filters": []} for tid in tids}
 
+    @staticmethod
+    def _group_table_ids_by_biz(result_tables) -> dict[int, list[str]]:
+        """按业务分组结果表"""
+        biz_id_table_ids = {}
+        for rt in result_tables.values("bk_biz_id", "table_id"):
+            biz_id_table_ids.setdefault(rt["bk_biz_id"], []).append(rt["table_id"])
+        return biz_id_table_ids
+
+    def _get_space(self, space_type: str, space_id: str) -> models.Space | None:
+        """获取空间，批量推送时使用预先加载的数据"""
+        if self.bulk_context is not None and self.bulk_context.has_space(space_type, space_id):
+            return self.bulk_context.get_space(space_type, space_id)
+        try:
+            return models.Space.objects.get(space_type_id=space_type, space_id=space_id)
+        except models.Space.DoesNotExist:
+            return None
+
+    def _get_space_resource(
+        self, space_type: str, space_id: str, resource_type: str, resource_id: str | None = None
+    ) -> models.SpaceResource | None:
+        """获取空间关联的资源，批量推送时使用预先加载的数据"""
+        if self.bulk_context is not None and self.bulk_context.has_space(space_type, space_id):
+            return self.bulk_context.get_space_resource(space_type, space_id, resource_type, resource_id)
+        sr_objs = models.SpaceResource.objects.filter(
+            space_type_id=space_type, space_id=space_id, resource_type=resource_type
+        )
+        if resource_id is not None:
+            sr_objs = sr_objs.filter(resource_id=resource_id)
+        return sr_objs.first()
+
+    def _get_space_table_id_data_id(
+        self,
+        space_type: str,
+        space_id: str,
+        table_id_list: list | None = None,
+        from_authorization: bool | None = None,
+        include_platform_data_id: bool | None = True,
+        exclude_data_id_list: list | None = None,
+        bk_tenant_id: str | None = DEFAULT_TENANT_ID,
+    ) -> dict:
+        """获取空间下的结果表和数据源信息，批量推送时使用预先加载的数据"""
+        if self.bulk_context is None or table_id_list or not self.bulk_context.has_space(space_type, space_id):
+            return get_space_table_id_data_id(
+                space_type,
+                space_id,
+                table_id_list=table_id_list,
+                from_authorization=from_authorization,
+                include_platform_data_id=include_platform_data_id,
+                exclude_data_id_list=exclude_data_id_list,
+                bk_tenant_id=bk_tenant_id,
+            )
+
+        data_ids = self.bulk_context.get_space_data_ids(space_type, space_id, from_authorization=from_authorization)
+        if include_platform_data_id:
+            data_ids |= set(self.bulk_context.get_platform_data_ids(space_type, bk_tenant_id).keys())
+        if exclude_data_id_list:
+            data_ids -= set(exclude_data_id_list)
+        return self.bulk_context.get_table_id_data_id(data_ids)
+
     def _compose_related_bkci_table_ids(self, space_type: str, space_id: str, bk_tenant_id=DEFAULT_TENANT_ID):
         """
         组装关联的BKCI类型的Es/Doris结果表
@@ -1566,6 +1800,16 @@ class SpaceTableIDRedis:
 
     def _refine_table_ids(self, table_id_list: list | None = None, bk_tenant_id: str | None = DEFAULT_TENANT_ID) -> set:
         """提取写入到influxdb或vm的结果表数据"""
+        if self.bulk_context is not None and table_id_list:
+            return self.bulk_context.refine_table_ids(
+                table_id_list, bk_tenant_id, lambda _table_ids: self._filter_refined_table_ids(_table_ids, bk_tenant_id)
+            )
+        return self._filter_refined_table_ids(table_id_list, bk_tenant_id)
+
+    def _filter_refined_table_ids(
+        self, table_id_list: list | None = None, bk_tenant_id: str | None = DEFAULT_TENANT_ID
+    ) -> set:
+        """查询写入到influxdb或vm的结果表数据"""
         # 过滤写入 influxdb 的结果表
         influxdb_table_ids = models.InfluxDBStorage.objects.values_list("table_id", flat=True)
 
@@ -800,21 +800,18 @@ def push_and_publish_space_router(
         for space in spaces
     ]
 
-    # 批量处理 -- SPACE_TO_RESULT_TABLE 路由
+    # 批量处理 -- SPACE_TO_RESULT_TABLE 路由，记录各批次中内容发生变化的空间
+    changed_keys = []
     bulk_handle(
-        lambda batch_spaces: SpaceTableIDRedis().push_multi_space_table_ids(batch_spaces, is_publish=False),
+        lambda batch_spaces: changed_keys.extend(
+            SpaceTableIDRedis().push_multi_space_table_ids(batch_spaces, is_publish=False)
+        ),
         list(spaces),
     )
 
-    # 通知到使用方
-    if is_publish:
-        space_uid_list = []
-        for space in spaces:
-            if settings.ENABLE_MULTI_TENANT_MODE:
-                space_uid_list.append(f"{space['space_type_id']}__{space['space_id']}|{space['bk_tenant_id']}")
-            else:
-                space_uid_list.append(f"{space['space_type_id']}__{space['space_id']}")
-        RedisTools.publish(SPACE_TO_RESULT_TABLE_CHANNEL, space_uid_list)
+    # 只通知内容发生变化的空间
+    if is_publish and changed_keys:
+        RedisTools.publish(SPACE_TO_RESULT_TABLE_CHANNEL, changed_keys)
 
     # 仅存在空间 id 时，可以直接按照结果表进行处理
     # 非多租户环境: 所有table_id的路由一并推送
@@ -1029,15 +1026,11 @@ def refresh_bksaas_space_resouce():
     # 批量进行推送数据
     # NOTE: 此时集群或者公共插件相关的信息已经存在了，不需要再进行指标或 data_label 的映射
     space_client = SpaceTableIDRedis()
-    bulk_handle(lambda space_list: space_client.push_multi_space_table_ids(space_list), spaces)
+    changed_keys = []
+    bulk_handle(lambda space_list: changed_keys.extend(space_client.push_multi_space_table_ids(space_list)), spaces)
 
-    # 通知到使用方
-    push_redis_keys = []
-    for space in spaces:
-        if settings.ENABLE_MULTI_TENANT_MODE:
-            push_redis_keys.append(f"{space.space_type_id}__{space.space_id}|{space.bk_tenant_id}")
-        else:
-            push_redis_keys.append(f"{space.space_type_id}__{space.space_id}")
-    RedisTools.publish(SPACE_TO_RESULT_TABLE_CHANNEL, push_redis_keys)
+    # 只通知内容发生变化的空间
+    if changed_keys:
+        RedisTools.publish(SPACE_TO_RESULT_TABLE_CHANNEL, changed_keys)
 
     logger.info("refresh bksaas space resource successfully")
@@ -306,3 +306,78 @@ def test_push_space_to_rt_router_without_tenant_for_bksaas(create_or_delete_reco
                 "bkmonitorv3:spaces:space_to_result_table:channel",
                 ["bksaas__monitor_saas"],
             )
+
+
+@pytest.mark.django_db(databases="__all__")
+def test_push_multi_space_to_rt_router(create_or_delete_records):
+    """测试SPACE_TO_RESULT_TABLE路由批量推送，结果需要与逐个空间推送一致，且未变化的空间不重复推送"""
+    from metadata.models.space.constants import SPACE_TO_RESULT_TABLE_DIGEST_KEY, SPACE_TO_RESULT_TABLE_KEY
+    from metadata.utils.redis_tools import RedisTools
+
+    settings.ENABLE_MULTI_TENANT_MODE = True
+    spaces = [("bkcc", "1"), ("bkci", "bkmonitor"), ("bksaas", "monitor_saas")]
+
+    # 逐个空间推送的结果
+    expected = {}
+    with patch("metadata.utils.redis_tools.RedisTools.hmset_to_redis") as mock_hmset_to_redis:
+        with patch("metadata.utils.redis_tools.RedisTools.hset_to_redis"):
+            client = SpaceTableIDRedis()
+            for space_type, space_id in spaces:
+                client.push_space_table_ids(space_type=space_type, space_id=space_id)
+                expected.update(mock_hmset_to_redis.call_args[0][1])
+
+    RedisTools.delete(SPACE_TO_RESULT_TABLE_KEY)
+    RedisTools.delete(SPACE_TO_RESULT_TABLE_DIGEST_KEY)
+    with patch("metadata.utils.redis_tools.RedisTools.publish") as mock_publish:
+        # 支持 Space 实例及字典
+        space_list = list(models.Space.objects.filter(space_type_id="bkcc")) + list(
+            models.Space.objects.exclude(space_type_id="bkcc").values("space_type_id", "space_id", "bk_tenant_id")
+        )
+        changed_keys = SpaceTableIDRedis().push_multi_space_table_ids(space_list, is_publish=True)
+        assert set(changed_keys) == set(expected.keys())
+        mock_publish.assert_called_once_with("bkmonitorv3:spaces:space_to_result_table:channel", changed_keys)
+
+        actual = RedisTools.hgetall(SPACE_TO_RESULT_TABLE_KEY)
+        assert {key.decode(): json.loads(value) for key, value in actual.items()} == {
+            key: json.loads(value) for key, value in expected.items()
+        }
+
+        # 内容未变化时不再写入及通知
+        mock_publish.reset_mock()
+        assert SpaceTableIDRedis().push_multi_space_table_ids(space_list, is_publish=True) == []
+        mock_publish.assert_not_called()
+
+        # 强制推送
+        assert set(SpaceTableIDRedis().push_multi_space_table_ids(space_list, force=True)) == set(expected.keys())
+
+    RedisTools.delete(SPACE_TO_RESULT_TABLE_KEY)
+    RedisTools.delete(SPACE_TO_RESULT_TABLE_DIGEST_KEY)
+
+
+@pytest.mark.django_db(databases="__all__")
+def test_push_and_publish_space_router_only_publish_changed(create_or_delete_records):
+    """测试推送空间路由时只通知内容发生变化的空间"""
+    from metadata.task.sync_space import push_and_publish_space_router
+
+    settings.ENABLE_MULTI_TENANT_MODE = False
+    changed = {"bkcc__1"}
+
+    def push_multi_space_table_ids(self, spaces, is_publish=False, force=False):
+        assert not is_publish
+        keys = [f"{space['space_type_id']}__{space['space_id']}" for space in spaces]
+        return [key for key in keys if key in changed]
+
+    with (
+        patch.object(SpaceTableIDRedis, "push_multi_space_table_ids", push_multi_space_table_ids),
+        patch.object(SpaceTableIDRedis, "push_data_label_table_ids"),
+        patch.object(SpaceTableIDRedis, "push_table_id_detail"),
+        patch("metadata.utils.redis_tools.RedisTools.publish") as mock_publish,
+    ):
+        push_and_publish_space_router(bk_tenant_id=None)
+        mock_publish.assert_called_once_with("bkmonitorv3:spaces:space_to_result_table:channel", ["bkcc__1"])
+
+        # 所有空间内容均未变化时不通知
+        mock_publish.reset_mock()
+        changed.clear()
+        push_and_publish_space_router(bk_tenant_id=None)
+        mock_publish.assert_not_called()
@@ -8,6 +8,7 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
+import hashlib
 import json
 import logging
 import os
@@ -67,6 +68,54 @@ class RedisTools:
         logger.info("hmset_to_redis: key->[%s], field_value->[%s]", key, field_value)
         return cls().client.hmset(key, field_value)
 
+    @classmethod
+    def get_value_digest(cls, value: str) -> str:
+        """获取数据内容摘要"""
+        return hashlib.md5(value.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def hmset_changed_to_redis(
+        cls, key: str, digest_key: str, field_value: dict[str, str], force: bool = False
+    ) -> list[str]:
+        """
+        仅推送内容发生变化的数据，返回发生变化的 field
+
+        digest_key 中记录每个 field 对应内容的 md5，内容一致且 field 仍存在时跳过写入；
+        读取及写入均通过 pipeline 完成，避免逐个 field 请求 redis
+        """
+        if not field_value:
+            return []
+
+        fields = list(field_value.keys())
+        digests = {field: cls.get_value_digest(value) for field, value in field_value.items()}
+
+        client = cls().client
+        if force:
+            changed_fields = fields
+        else:
+            pipeline = client.pipeline(transaction=False)
+            pipeline.hmget(digest_key, *fields)
+            for field in fields:
+                pipeline.hexists(key, field)
+            old_digests, *exists = pipeline.execute()
+            changed_fields = []
+            for field, old_digest, is_exist in zip(fields, old_digests, exists):
+                if isinstance(old_digest, bytes):
+                    old_digest = old_digest.decode("utf-8")
+                if not is_exist or old_digest != digests[field]:
+                    changed_fields.append(field)
+
+        if changed_fields:
+            pipeline = client.pipeline(transaction=False)
+            pipeline.hmset(key, {field: field_value[field] for field in changed_fields})
+            pipeline.hmset(digest_key, {field: digests[field] for field in changed_fields})
+            pipeline.execute()
+
+        logger.info(
+            "hmset_changed_to_redis: key->[%s], total->[%s], changed fields->[%s]", key, len(fields), changed_fields
+        )
+        return changed_fields
+
     @classmethod
     def sadd(cls, key: str, value: list) -> int | None:
         if not value:
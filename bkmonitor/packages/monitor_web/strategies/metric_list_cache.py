@@ -9,6 +9,8 @@ specific language governing permissions and limitations under the License.
 """
 
 import copy
+import hashlib
+import json
 import logging
 import re
 import time
@@ -20,6 +22,7 @@ from typing import Any
 
 import requests
 from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Count, Max, Q
 from django.utils.translation import gettext as _
 from django.utils.translation import gettext_lazy as _lazy
@@ -39,7 +42,7 @@ from bkmonitor.models import (
     SnapshotHostIndex,
     StrategyModel,
 )
-from bkmonitor.models.metric_list_cache import MetricListCache
+from bkmonitor.models.metric_list_cache import MetricListCache, MetricListCacheSearchToken
 from bkmonitor.utils import get_metric_category
 from bkmonitor.utils.common_utils import count_md5
 from bkmonitor.utils.k8s_metric import get_built_in_k8s_metrics
@@ -191,7 +194,11 @@ UPTIMECHECK_MAP = {
     "ICMP": [],
 }
 
-METRIC_POOL_KEYS = ["id", "metric_md5", "bk_biz_id", "result_table_id", "metric_field", "related_id", "readable_name"]
+# 指标缓存刷新时每批处理的指标数量
+METRIC_REFRESH_CHUNK_SIZE = 5000
+# 表分组源数据指纹，指纹未变化的分组跳过刷新
+METRIC_TABLE_FINGERPRINT_CACHE_KEY = "metric_list_cache.table_fingerprint.{bk_tenant_id}.{manager}.{bk_biz_id}"
+METRIC_TABLE_FINGERPRINT_CACHE_TIMEOUT = 24 * 60 * 60
 
 
 class BaseMetricCacheManager:
@@ -262,128 +269,252 @@ class BaseMetricCacheManager:
             .annotate(use_frequency=Count("metric_id"))
         }
 
+    def get_table_group_key(self, table) -> str | None:
+        """
+        获取表所属的分组，同一分组下的指标 related_id 均等于分组标识
+        返回值不为空时按分组计算源数据指纹，指纹未变化的分组跳过指标生成与对比；默认不跳过
+        """
+        return None
+
+    def get_table_fingerprint_cache_key(self) -> str:
+        return METRIC_TABLE_FINGERPRINT_CACHE_KEY.format(
+            bk_tenant_id=self.bk_tenant_id, manager=self.__class__.__name__, bk_biz_id=self.bk_biz_id
+        )
+
+    def get_table_fingerprint(self, tables: list[dict]) -> str:
+        """
+        计算分组源数据指纹，指标使用频率会写入指标缓存，因此一并纳入指纹
+        """
+        content = json.dumps([self.metric_use_frequency, tables], sort_keys=True, default=str)
+        return hashlib.md5(content.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def get_metric_hash_index(metric_pool) -> tuple[dict[str, tuple[int, str, str]], list[int]]:
+        """
+        获取已有指标的紧凑索引 metric_id -> (id, metric_md5, related_id)，避免实例化全部指标缓存
+        :return: 索引及重复的指标缓存id
+        """
+        metric_hash_index = {}
+        duplicate_ids = []
+        for pk, bk_biz_id, result_table_id, metric_field, related_id, metric_md5 in metric_pool.values_list(
+            "id", "bk_biz_id", "result_table_id", "metric_field", "related_id", "metric_md5"
+        ).iterator(chunk_size=METRIC_REFRESH_CHUNK_SIZE):
+            metric_id = f"{bk_biz_id}.{result_table_id}.{metric_field}.{related_id}"
+            if metric_id in metric_hash_index:
+                duplicate_ids.append(pk)
+            else:
+                metric_hash_index[metric_id] = (pk, metric_md5, related_id)
+        return metric_hash_index, duplicate_ids
+
+    def prepare_metric(self, metric: dict) -> str | None:
+        """
+        补全指标字段，返回指标的唯一标识符，不需要缓存的指标返回None
+        """
+        # 处理result_table_id长度
+        if len(metric.get("result_table_id", "")) > 256:
+            metric["result_table_id"] = metric["result_table_id"][:256]
+
+        if metric.get("result_table_id", "") in ["bkunifylogbeat_task.base", "bkunifylogbeat_common.base"]:
+            return None
+
+        # 补全维度字段
+        dimensions = metric.get("dimensions", [])
+        for dimension in dimensions:
+            if "is_dimension" not in dimension:
+                dimension["is_dimension"] = True
+            if "type" not in dimension:
+                dimension["type"] = DimensionFieldType.String
+
+        # 更新metric使用频率
+        metric.update(
+            dict(
+                use_frequency=self.metric_use_frequency.get(
+                    f"{metric.get('data_source_label', '')}."
+                    f"{metric.get('result_table_id', '')}.{metric['metric_field']}",
+                    0,
+                )
+            )
+        )
+        # 生成指标的唯一标识符
+        return "{}.{}.{}.{}".format(
+            metric["bk_biz_id"],
+            metric.get("result_table_id", ""),
+            metric["metric_field"],
+            metric.get("related_id", ""),
+        )
+
+    def upsert_metrics(self, metrics: list[dict], metric_hash_index: dict) -> tuple[int, int]:
+        """
+        与索引中的md5对比，批量写入一批指标中新增和变更的部分
+        :return: 新增数量, 更新数量
+        """
+        to_be_create = []
+        to_be_update = []
+        for metric in metrics:
+            metric_id = metric.pop("_metric_id")
+            metric_info = metric_hash_index.pop(metric_id, None)
+
+            _metric = MetricListCache(bk_tenant_id=self.bk_tenant_id, **metric)
+            # readable_name 可能会因用户修改data_label而变更，因此跟随周期任务自动更新
+            metric["readable_name"] = _metric.readable_name = _metric.get_human_readable_name()
+            _metric.metric_md5 = count_md5(metric)
+
+            # 处理新增指标
+            if metric_info is None:
+                logger.debug("Going to add %s to cache creating list", metric_id)
+                to_be_create.append(_metric)
+                continue
+
+            # 处理更新逻辑
+            pk, metric_md5, _ = metric_info
+            if not metric_md5 or metric_md5 != _metric.metric_md5:
+                logger.debug("Going to add %s to cache updating list", metric_id)
+                _metric.id = pk
+                _metric.last_update = datetime.now()
+                to_be_update.append(_metric)
+
+        if to_be_create:
+            MetricListCache.objects.bulk_create(to_be_create, batch_size=50)
+
+        if to_be_update:
+            fields = [
+                field.name
+                for field in MetricListCache._meta.get_fields(include_parents=False)
+                if not field.auto_created
+            ]
+            MetricListCache.objects.bulk_update(to_be_update, fields, batch_size=500)
+
+        self.refresh_search_index(to_be_create, to_be_update)
+        return len(to_be_create), len(to_be_update)
+
+    def refresh_search_index(self, created: list[MetricListCache], updated: list[MetricListCache]):
+        """
+        同步新增和变更指标的搜索索引
+        """
+        if not MetricListCacheSearchToken.is_enabled() or not (created or updated):
+            return
+
+        metrics = [*updated, *(metric for metric in created if metric.pk)]
+
+        # MySQL 批量创建后不回填主键，按指标唯一标识查询
+        def get_key(*args):
+            return ".".join(str(arg) for arg in args)
+
+        pending_metrics = {
+            get_key(m.bk_biz_id, m.result_table_id, m.metric_field, m.related_id): m for m in created if not m.pk
+        }
+        if pending_metrics:
+            created_metrics = MetricListCache.objects.filter(
+                bk_tenant_id=self.bk_tenant_id,
+                bk_biz_id__in={metric.bk_biz_id for metric in pending_metrics.values()},
+                result_table_id__in={metric.result_table_id for metric in pending_metrics.values()},
+                metric_field__in={metric.metric_field for metric in pending_metrics.values()},
+            ).values_list("id", "bk_biz_id", "result_table_id", "metric_field", "related_id")
+            for pk, *metric_key in created_metrics:
+                metric = pending_metrics.pop(get_key(*metric_key), None)
+                if metric is not None:
+                    metric.pk = pk
+                    metrics.append(metric)
+
+        MetricListCacheSearchToken.refresh(metrics)
+
     def _run(self):
         """
         对比数据库已有数据， 实现指标缓存的增量更新
+        1. 已有指标只加载 metric_id -> md5 的紧凑索引
+        2. 按批生成指标，仅写入新增和md5变化的指标
+        3. 源数据指纹未变化的表分组跳过指标生成，其指标缓存保持不变
         """
         start_time = time.time()
         logger.info(f"[start] update metric {self.__class__.__name__}({self.bk_biz_id})")
 
-        # 集中整理后进行差量更新
-        to_be_create = []
-        to_be_update = []
-        to_be_delete = []
+        create_count = update_count = 0
         self.refresh_metric_use_frequency()
 
         metric_pool = self.get_metric_pool()
         if self.bk_biz_id is not None:
             metric_pool = metric_pool.filter(bk_biz_id=self.bk_biz_id)
-        metric_pool_values = metric_pool.only(*METRIC_POOL_KEYS)
-
-        # metric_hash_dict(当前数据库[缓存]中的指标)
-        metric_hash_dict = {}
-        for m in list(metric_pool_values):
-            metric_id = f"{m.bk_biz_id}.{m.result_table_id}.{m.metric_field}.{m.related_id}"
-            if metric_id in metric_hash_dict:
-                to_be_delete.append(m.pk)
-            else:
-                metric_hash_dict[metric_id] = m
+
+        # metric_hash_index(当前数据库[缓存]中的指标)
+        metric_hash_index, to_be_delete = self.get_metric_hash_index(metric_pool)
+
+        # 上次刷新的分组指纹，记录过期后进行一次全量刷新，兜底未纳入指纹的变更(如标签名称)
+        fingerprint_cache_key = self.get_table_fingerprint_cache_key()
+        fingerprint_record = cache.get(fingerprint_cache_key) or {"create_time": int(start_time), "fingerprints": {}}
+        fingerprints = {}
+
+        # 可按分组跳过的表先归集，其余表直接流式处理
+        grouped_tables: dict[str, list[dict]] = defaultdict(list)
+        skipped_group_keys: set[str] = set()
+        # 指标缓存被清空的分组即使指纹未变化也需要重新生成
+        cached_group_keys = {related_id for _, _, related_id in metric_hash_index.values()}
+
+        def iter_tables():
+            for table in self.get_tables():
+                group_key = self.get_table_group_key(table)
+                if group_key is None:
+                    yield table
+                else:
+                    grouped_tables[group_key].append(table)
+
+            for group_key, tables in grouped_tables.items():
+                fingerprint = self.get_table_fingerprint(tables)
+                fingerprints[group_key] = fingerprint
+                if group_key in cached_group_keys and fingerprint_record["fingerprints"].get(group_key) == fingerprint:
+                    skipped_group_keys.add(group_key)
+                    continue
+                yield from tables
 
         # 遍历非缓存数据[最新数据]
         processed_metric_ids: set[str] = set()
-        for table in self.get_tables():
+        pending_metrics = []
+        for table in iter_tables():
             for metric in self.get_metrics_by_table(table):
-                # 处理result_table_id长度
-                if len(metric.get("result_table_id", "")) > 256:
-                    metric["result_table_id"] = metric["result_table_id"][:256]
-
-                if metric.get("result_table_id", "") in ["bkunifylogbeat_task.base", "bkunifylogbeat_common.base"]:
-                    continue
-
-                # 补全维度字段
-                dimensions = metric.get("dimensions", [])
-                for dimension in dimensions:
-                    if "is_dimension" not in dimension:
-                        dimension["is_dimension"] = True
-                    if "type" not in dimension:
-                        dimension["type"] = DimensionFieldType.String
-
-                # 更新metric使用频率
-                metric.update(
-                    dict(
-                        use_frequency=self.metric_use_frequency.get(
-                            f"{metric.get('data_source_label', '')}."
-                            f"{metric.get('result_table_id', '')}.{metric['metric_field']}",
-                            0,
-                        )
-                    )
-                )
-                # 生成指标的唯一标识符
-                metric_id = "{}.{}.{}.{}".format(
-                    metric["bk_biz_id"],
-                    metric.get("result_table_id", ""),
-                    metric["metric_field"],
-                    metric.get("related_id", ""),
-                )
+                metric_id = self.prepare_metric(metric)
 
                 # 重复指标，不处理
-                if metric_id in processed_metric_ids:
+                if metric_id is None or metric_id in processed_metric_ids:
                     continue
                 processed_metric_ids.add(metric_id)
 
-                metric_instance = metric_hash_dict.pop(metric_id, None)
-                # 处理新增指标
-                if metric_instance is None:
-                    _metric = MetricListCache(bk_tenant_id=self.bk_tenant_id, **metric)
-                    metric["readable_name"] = _metric.get_human_readable_name()
-                    _metric.readable_name = metric["readable_name"]
-                    _metric.metric_md5 = count_md5(metric)
-
-                    logger.info("Going to add %s to cache creating list", metric_id)
-                    to_be_create.append(_metric)
-                    continue
-
-                # readable_name 可能会因用户修改data_label而变更，因此跟随周期任务自动更新
-                metric["readable_name"] = metric_instance.get_human_readable_name()
-
-                metric["metric_md5"] = count_md5(metric)
-                # 处理更新逻辑
-                if not metric_instance.metric_md5 or metric_instance.metric_md5 != metric["metric_md5"]:
-                    metric["last_update"] = datetime.now()
-                    logger.info(f"Going to adding {metric_id} to cache updating list")
-                    metric["id"] = metric_instance.id
-                    to_be_update.append(metric)
-                    metric_instance.metric_md5 = metric["metric_md5"]
-
-        # create
-        if to_be_create:
-            logger.info("Going to bulk create %s metric caches", len(to_be_create))
-            MetricListCache.objects.bulk_create(to_be_create, batch_size=50)
-
-        # update
-        if to_be_update:
-            logger.info("Going to bulk update %s metric caches", len(to_be_update))
-            for metrics in chunks(to_be_update, 500):
-                init_md5_metrics = []
-                for metric in metrics:
-                    _metric = MetricListCache(bk_tenant_id=self.bk_tenant_id, **metric)
-                    init_md5_metrics.append(_metric)
-                fields = [
-                    field.name
-                    for field in MetricListCache._meta.get_fields(include_parents=False)
-                    if not field.auto_created
-                ]
-                MetricListCache.objects.bulk_update(init_md5_metrics, fields, batch_size=500)
-
-        # clean (手动添加的自定义指标标记md5为0，不做删除处理）
-        to_be_delete.extend([m.id for m in list(metric_hash_dict.values()) if m.metric_md5 != "0"])
+                metric["_metric_id"] = metric_id
+                pending_metrics.append(metric)
+                if len(pending_metrics) >= METRIC_REFRESH_CHUNK_SIZE:
+                    created, updated = self.upsert_metrics(pending_metrics, metric_hash_index)
+                    create_count += created
+                    update_count += updated
+                    pending_metrics = []
+
+        if pending_metrics:
+            created, updated = self.upsert_metrics(pending_metrics, metric_hash_index)
+            create_count += created
+            update_count += updated
+
+        # clean (手动添加的自定义指标标记md5为0，不做删除处理；跳过的分组保留原有指标）
+        for pk, metric_md5, related_id in metric_hash_index.values():
+            if metric_md5 != "0" and related_id not in skipped_group_keys:
+                to_be_delete.append(pk)
         if to_be_delete:
-            logger.info("Going to delete metric caches %s", list(metric_hash_dict.keys()))
-            MetricListCache.objects.filter(id__in=to_be_delete).delete()
+            logger.info("Going to delete %s metric caches", len(to_be_delete))
+            for ids in chunks(to_be_delete, METRIC_REFRESH_CHUNK_SIZE):
+                MetricListCache.objects.filter(id__in=ids).delete()
+                if MetricListCacheSearchToken.is_enabled():
+                    MetricListCacheSearchToken.remove(ids)
+
+        # 存在异常时不记录指纹，下次重新生成
+        if fingerprints and not self.has_exception:
+            timeout = METRIC_TABLE_FINGERPRINT_CACHE_TIMEOUT - (int(start_time) - fingerprint_record["create_time"])
+            if timeout > 0:
+                cache.set(
+                    fingerprint_cache_key,
+                    {"create_time": fingerprint_record["create_time"], "fingerprints": fingerprints},
+                    timeout,
+                )
 
         logger.info(
             f"[end] update metric {self.__class__.__name__}({self.bk_biz_id}) "
-            f"create {len(to_be_create)} metric,update {len(to_be_update)} metric, delete {len(to_be_delete)} metric."
+            f"create {create_count} metric,update {update_count} metric, delete {len(to_be_delete)} metric, "
+            f"skip {len(skipped_group_keys)} table group."
             f"timestamp: {int(start_time)}, cost {time.time() - start_time}s"
         )
 
@@ -503,6 +634,10 @@ class CustomMetricCacheManager(BaseMetricCacheManager):
             self.process_apm_table(result)
             yield result
 
+    def get_table_group_key(self, table) -> str | None:
+        # 同一自定义时序分组(含分表)的指标 related_id 均为 time_series_group_id，APM 虚拟指标表为 0
+        return str(table["time_series_group_id"])
+
     @classmethod
     def process_apm_table(cls, table: dict):
         ApmMetricProcessor.process(table)
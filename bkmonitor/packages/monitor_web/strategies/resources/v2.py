@@ -40,6 +40,7 @@ from bkmonitor.models import (
     DetectModel,
     ItemModel,
     MetricListCache,
+    MetricListCacheSearchToken,
     QueryConfigModel,
     StrategyActionConfigRelation,
     StrategyHistoryModel,
@@ -1531,6 +1532,8 @@ class GetMetricListV2Resource(Resource):
         if filter_dict["query"]:
             # 尝试解析指标ID格式的query字符串
             exact_query = []
+            # 需要通过搜索索引匹配的文本，指标ID格式的查询使用其中的指标名部分
+            search_texts = list(filter_dict["query"])
             for query in filter_dict["query"]:
                 query = query.strip()
 
@@ -1545,8 +1548,10 @@ class GetMetricListV2Resource(Resource):
                         exact_query.append(
                             Q(result_table_id=f"{fields[0]}.{fields[1]}", metric_field__icontains=fields[2])
                         )
+                        search_texts.append(fields[2])
                     elif len(fields) == 2:
                         exact_query.append(Q(data_label=fields[0], metric_field__icontains=fields[1]))
+                        search_texts.append(fields[1])
 
                     continue
 
@@ -1559,10 +1564,12 @@ class GetMetricListV2Resource(Resource):
                             Q(result_table_id=fields[0], metric_field__icontains=fields[1]),
                         ]
                     )
+                    search_texts.append(fields[1])
                 elif len(fields) >= 3:
                     exact_query.append(
                         Q(result_table_id=".".join(fields[:2]), metric_field__icontains=".".join(fields[2:]))
                     )
+                    search_texts.append(".".join(fields[2:]))
 
             queries = []
             for query, field in product(
@@ -1573,8 +1580,29 @@ class GetMetricListV2Resource(Resource):
             queries.extend(exact_query)
             metrics = metrics.filter(reduce(lambda x, y: x | y, queries))
 
+            # 先通过搜索索引缩小候选指标范围，再对候选指标执行上述匹配
+            search_candidates = cls.get_search_candidates(search_texts)
+            if search_candidates is not None:
+                metrics = metrics.filter(search_candidates)
+
         return metrics
 
+    @classmethod
+    def get_search_candidates(cls, search_texts: list[str]) -> Q | None:
+        """
+        通过搜索索引获取候选指标过滤条件，任一文本无法使用索引时返回None
+        """
+        if not MetricListCacheSearchToken.is_enabled():
+            return None
+
+        candidates = []
+        for text in search_texts:
+            metric_ids = MetricListCacheSearchToken.search(text)
+            if metric_ids is None:
+                return None
+            candidates.append(Q(id__in=metric_ids))
+        return reduce(lambda x, y: x | y, candidates)
+
     @classmethod
     def page_filter(cls, metrics: QuerySet, params) -> tuple[QuerySet, int]:
         """
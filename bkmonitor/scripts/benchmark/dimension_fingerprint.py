@@ -0,0 +1,37 @@
+"""
+维度指纹性能对比: count_md5 vs dimension_fingerprint
+
+用法: python manage.py shell < scripts/benchmark/dimension_fingerprint.py
+"""
+
+import time
+
+from bkmonitor.utils.common_utils import count_md5, dimension_fingerprint
+
+RECORD_COUNT = 1000000
+
+records = [
+    {
+        "bk_target_ip": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+        "bk_target_cloud_id": i % 3,
+        "device_name": f"eth{i % 4}",
+        "bk_biz_id": 2,
+    }
+    for i in range(RECORD_COUNT)
+]
+
+
+def bench(name, func):
+    start = time.perf_counter()
+    for record in records:
+        func(record)
+    cost = time.perf_counter() - start
+    print(f"{name:<40} {cost:>8.2f}s {RECORD_COUNT / cost:>12.0f} records/s")
+
+
+for record in records[:10000]:
+    assert dimension_fingerprint(record) == count_md5(record)
+
+bench("count_md5", count_md5)
+bench("dimension_fingerprint(legacy=True)", dimension_fingerprint)
+bench("dimension_fingerprint(legacy=False)", lambda record: dimension_fingerprint(record, legacy=False))
@@ -0,0 +1,80 @@
+"""
+通知模板渲染性能对比: 每次渲染重新编译 vs 编译模板缓存
+
+用法: python manage.py shell < scripts/benchmark/notice_template.py
+"""
+
+import time
+
+from django.conf import settings
+
+from bkmonitor.utils.template import (
+    SAFE_TEMPLATE_ARROW,
+    SAFE_TEMPLATE_JSON,
+    SAFE_TEMPLATE_RE,
+    AlarmNoticeTemplate,
+    Jinja2Renderer,
+    escape_markdown,
+    jinja2_environment,
+)
+from constants.action import DEFAULT_TEMPLATE, DEFAULT_TITLE_TEMPLATE, NoticeWay
+
+NOTICE_COUNT = 10000
+
+# 每条通知按 CustomTemplateRenderer 的调用方式渲染内容模板、内置模板和标题模板
+templates = [
+    (NoticeWay.MAIL, DEFAULT_TEMPLATE),
+    (NoticeWay.MAIL, AlarmNoticeTemplate.get_template("notice/abnormal/converge/default_content.jinja")),
+    (NoticeWay.MAIL, DEFAULT_TITLE_TEMPLATE),
+    (NoticeWay.WX_BOT, DEFAULT_TEMPLATE),
+    (NoticeWay.WX_BOT, AlarmNoticeTemplate.get_template("notice/abnormal/converge/markdown_content.jinja")),
+    (NoticeWay.WX_BOT, AlarmNoticeTemplate.get_template("notice/abnormal/converge/default_title.jinja")),
+]
+
+contexts = [
+    {
+        "business": {"bk_biz_name": f"biz_{i % 100}"},
+        "alarm": {
+            "name": f"CPU使用率告警_{i}",
+            "display_type": "",
+            "collect_count": i % 10 + 1,
+            "detail_url": f"http://example.com/?alert_id={i}",
+            "level": i % 3 + 1,
+        },
+        "alert": {"alert_name": f"CPU使用率告警_{i}"},
+        "level": {"level_name": "致命"},
+        "level_name": "致命",
+        "notice_title": "蓝鲸监控",
+        "user_content": f"告警内容 *{i}*",
+        "content": {"level": "**级别:** 致命", "content": f"**内容:** avg(usage) >= 95.0, 当前值 {i}%"},
+    }
+    for i in range(NOTICE_COUNT)
+]
+
+
+def legacy_render(content, context):
+    if context.get("notice_way") in settings.MD_SUPPORTED_NOTICE_WAYS:
+        env = jinja2_environment(autoescape=True, escape_func=escape_markdown)
+    else:
+        env = jinja2_environment(autoescape=False)
+    return env.from_string(content).render(
+        {**context, "json": SAFE_TEMPLATE_JSON, "re": SAFE_TEMPLATE_RE, "arrow": SAFE_TEMPLATE_ARROW}
+    )
+
+
+def bench(name, func):
+    start = time.perf_counter()
+    for context in contexts:
+        for notice_way, template in templates:
+            func(template, {**context, "notice_way": notice_way})
+    cost = time.perf_counter() - start
+    print(f"{name:<40} {cost:>8.2f}s {NOTICE_COUNT / cost:>12.0f} notices/s")
+
+
+for context in contexts[:100]:
+    for notice_way, template in templates:
+        context = {**context, "notice_way": notice_way}
+        assert legacy_render(template, context) == Jinja2Renderer.render(template, context)
+
+bench("legacy(compile per render)", legacy_render)
+bench("Jinja2Renderer(compiled cache)", Jinja2Renderer.render)
@@ -0,0 +1,71 @@
+"""
+统一查询返回值解码性能对比: 逐单元格 arrow 解析 vs 按 series 解码
+
+用法: python manage.py shell < scripts/benchmark/unify_query_decoder.py
+"""
+
+import time
+
+import arrow
+
+from bkmonitor.data_source.unify_query.query import UnifyQuery
+
+SERIES_COUNT = 10000
+POINT_COUNT = 100
+START_TIME = 1700000000000
+
+params = {"query_list": [{"reference_name": "a"}]}
+end_time = START_TIME + (POINT_COUNT - 1) * 60000
+data = {
+    "series": [
+        {
+            "name": "_result0",
+            "group_keys": ["bk_target_ip", "bk_target_cloud_id"],
+            "group_values": [f"10.0.{i // 256 % 256}.{i % 256}", "0"],
+            "columns": ["_time", "_value"],
+            "types": ["time", "float"],
+            "values": [[START_TIME + j * 60000, float(i + j)] for j in range(POINT_COUNT)],
+        }
+        for i in range(SERIES_COUNT)
+    ]
+}
+
+
+def legacy_process_unify_query_data(params, data, end_time=None):
+    records = []
+    for row in data.get("series") or []:
+        dimensions = UnifyQuery.extract_unify_query_series_dimensions(row)
+        for value in row["values"]:
+            record = {**dimensions}
+            for column, column_type, v in zip(row["columns"], row["types"], value):
+                if column_type == "time":
+                    v = arrow.get(v).timestamp * 1000
+                if column == "_time":
+                    column = "_time_"
+                elif column in ["_result", "_value"]:
+                    column = "_result_"
+                record[column] = v
+
+            if "_result_" not in record:
+                record["_result_"] = record[params["query_list"][0]["reference_name"]]
+
+            if not params.get("instant") and end_time and record.get("_time_") == end_time:
+                continue
+            records.append(record)
+    return records
+
+
+def bench(name, func):
+    start = time.perf_counter()
+    func(params, data, end_time)
+    cost = time.perf_counter() - start
+    print(f"{name:<40} {cost:>8.2f}s {SERIES_COUNT * POINT_COUNT / cost:>12.0f} points/s")
+
+
+sample = {"series": data["series"][:100]}
+assert UnifyQuery.process_unify_query_data(params, sample, end_time) == legacy_process_unify_query_data(
+    params, sample, end_time
+)
+
+bench("legacy", legacy_process_unify_query_data)
+bench("process_unify_query_data", UnifyQuery.process_unify_query_data)
@@ -0,0 +1,36 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from bkmonitor.utils.template import Jinja2Renderer, get_compiled_template
+from constants.action import NoticeWay
+
+
+class TestCompiledTemplateCache:
+    """覆盖编译模板缓存在不同转义模式、不同上下文下的渲染结果。"""
+
+    def setup_method(self):
+        get_compiled_template.cache_clear()
+
+    def test_compiled_template_reused(self):
+        template = "{{ name }}-{{ json.dumps(value) }}"
+        assert Jinja2Renderer.render(template, {"name": "a", "value": 1}) == "a-1"
+        assert Jinja2Renderer.render(template, {"name": "b", "value": [2]}) == "b-[2]"
+
+        cache_info = get_compiled_template.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 1
+
+    def test_autoescape_mode_cached_separately(self):
+        template = "{{ content }}"
+        context = {"content": "a*b"}
+        assert Jinja2Renderer.render(template, context) == "a*b"
+        assert Jinja2Renderer.render(template, {**context, "notice_way": NoticeWay.WX_BOT}) == r"a\*b"
+        assert Jinja2Renderer.render(template, context) == "a*b"
+        assert get_compiled_template.cache_info().currsize == 2
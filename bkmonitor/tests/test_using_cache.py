@@ -0,0 +1,158 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import threading
+import time
+from unittest import mock
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+
+from bkmonitor.utils import cache as cache_module
+from bkmonitor.utils.cache import CacheTypeItem, UsingCache, refresh_flights
+
+
+@pytest.fixture
+def backend(settings):
+    settings.ROLE = "worker"
+    settings.ENVIRONMENT = "testing"
+    settings.CACHE_SINGLE_FLIGHT_ENABLED = True
+    settings.CACHE_SINGLE_FLIGHT_WAIT = 3
+    settings.CACHE_REFRESH_LOCK_TIMEOUT = 30
+    backend = LocMemCache("test-using-cache", {})
+    with mock.patch.object(cache_module, "cache", backend), mock.patch.object(cache_module, "mem_cache", backend):
+        yield backend
+    refresh_flights.clear()
+
+
+class Loader:
+    """
+    记录调用次数的回源函数
+    """
+
+    def __init__(self, delay=0.0, fail_times=0):
+        self.delay = delay
+        self.fail_times = fail_times
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, name):
+        with self.lock:
+            self.calls += 1
+            calls = self.calls
+        time.sleep(self.delay)
+        if calls <= self.fail_times:
+            raise ValueError("load failed")
+        return {"name": name, "calls": calls}
+
+
+def run_concurrently(func, count):
+    results, errors = [None] * count, [None] * count
+
+    def run(index):
+        try:
+            results[index] = func()
+        except Exception as e:  # noqa
+            errors[index] = e
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+        # 保证第一个线程成为回源请求
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+class TestUsingCache:
+    cache_type = CacheTypeItem(key="test", timeout=60, user_related=False, stale_timeout=60)
+
+    def test_concurrent_miss(self, backend):
+        loader = Loader(delay=0.3)
+        cached = UsingCache(self.cache_type)(loader)
+
+        results, errors = run_concurrently(lambda: cached("a"), 5)
+
+        # 同一进程内并发未命中只回源一次，其余请求直接拿到回源结果
+        assert loader.calls == 1
+        assert errors == [None] * 5
+        assert results == [{"name": "a", "calls": 1}] * 5
+        # 等待的请求拿到的是副本
+        assert len({id(result) for result in results}) == 5
+        assert not refresh_flights
+
+        # 后续请求命中缓存
+        assert cached("a") == {"name": "a", "calls": 1}
+        assert loader.calls == 1
+
+    def test_stale_hit(self, backend):
+        loader = Loader(delay=0.2)
+        using_cache = UsingCache(self.cache_type)
+        cached = using_cache(loader)
+        cache_key = using_cache._cache_key(loader, ("a",), {})
+        using_cache.set_value(cache_key, {"name": "a", "calls": 0}, 60)
+        # 新鲜标记过期
+        backend.delete(f"{cache_key}{UsingCache.fresh_key_suffix}")
+
+        # 不新鲜时直接返回旧值，只有一个请求在后台刷新
+        start_time = time.time()
+        assert cached("a") == {"name": "a", "calls": 0}
+        assert cached("a") == {"name": "a", "calls": 0}
+        assert time.time() - start_time < 0.2
+
+        deadline = time.time() + 3
+        while backend.get(f"{cache_key}{UsingCache.lock_key_suffix}") is not None and time.time() < deadline:
+            time.sleep(0.05)
+        assert loader.calls == 1
+        assert using_cache.get_entry(cache_key) == ({"name": "a", "calls": 1}, True)
+
+    def test_leader_failure(self, backend):
+        loader = Loader(delay=0.3, fail_times=1)
+        cached = UsingCache(self.cache_type)(loader)
+
+        results, errors = run_concurrently(lambda: cached("a"), 3)
+
+        # 回源请求失败时抛出异常，等待的请求自行回源
+        assert isinstance(errors[0], ValueError)
+        assert errors[1:] == [None, None]
+        assert all(result["name"] == "a" for result in results[1:])
+        assert loader.calls == 3
+        assert not refresh_flights
+        cache_key = UsingCache(self.cache_type)._cache_key(loader, ("a",), {})
+        assert backend.get(f"{cache_key}{UsingCache.lock_key_suffix}") is None
+
+    def test_wait_other_process(self, backend):
+        loader = Loader()
+        using_cache = UsingCache(self.cache_type)
+        cached = using_cache(loader)
+        cache_key = using_cache._cache_key(loader, ("a",), {})
+
+        # 其他进程持有回源锁，并在稍后回写缓存
+        backend.add(f"{cache_key}{UsingCache.lock_key_suffix}", 1, 30)
+        timer = threading.Timer(0.2, lambda: using_cache.set_value(cache_key, {"name": "a", "calls": 0}, 60))
+        timer.start()
+
+        assert cached("a") == {"name": "a", "calls": 0}
+        assert loader.calls == 0
+        timer.join()
+
+    def test_lock_expired(self, backend):
+        loader = Loader()
+        using_cache = UsingCache(self.cache_type)
+        cached = using_cache(loader)
+        cache_key = using_cache._cache_key(loader, ("a",), {})
+
+        # 持有回源锁的进程异常退出，锁过期后自行回源，无需等待到超时
+        backend.add(f"{cache_key}{UsingCache.lock_key_suffix}", 1, 0.3)
+        start_time = time.time()
+        assert cached("a") == {"name": "a", "calls": 1}
+        assert 0.3 <= time.time() - start_time < 2
+        assert loader.calls == 1
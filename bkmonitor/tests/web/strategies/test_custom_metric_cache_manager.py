@@ -0,0 +1,88 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from bkmonitor.models.metric_list_cache import MetricListCache
+from constants.common import DEFAULT_TENANT_ID
+from monitor_web.strategies.metric_list_cache import CustomMetricCacheManager
+
+
+def make_ts_group(time_series_group_id, field_names, last_modify_time="2025-01-01 00:00:00"):
+    """构造 metadata query_time_series_group 返回的时序分组结构"""
+    return {
+        "time_series_group_id": time_series_group_id,
+        "time_series_group_name": f"group_{time_series_group_id}",
+        "bk_data_id": 1500000 + time_series_group_id,
+        "bk_biz_id": 2,
+        "table_id": f"2_bkmonitor_time_series_{time_series_group_id}.__default__",
+        "label": "application_check",
+        "data_label": f"group_{time_series_group_id}",
+        "last_modify_time": last_modify_time,
+        "metric_info_list": [
+            {"field_name": field_name, "description": "", "unit": "", "tag_list": []} for field_name in field_names
+        ],
+    }
+
+
+class TestCustomMetricCacheManagerRefresh(TestCase):
+    """自定义指标缓存的增量刷新行为"""
+
+    def setUp(self):  # NOCC:invalid-name(设计如此:)
+        MetricListCache.objects.all().delete()
+        self.tables = [make_ts_group(1, ["a", "b"]), make_ts_group(2, ["c"])]
+
+        self.get_tables_patcher = mock.patch.object(
+            CustomMetricCacheManager, "get_tables", side_effect=lambda: [dict(table) for table in self.tables]
+        )
+        self.get_tables_patcher.start()
+        self.label_patcher = mock.patch.object(CustomMetricCacheManager, "get_label_name", side_effect=lambda x: x)
+        self.label_patcher.start()
+
+        self.manager = CustomMetricCacheManager(bk_tenant_id=DEFAULT_TENANT_ID, bk_biz_id=2)
+        cache.delete(self.manager.get_table_fingerprint_cache_key())
+
+    def tearDown(self):  # NOCC:invalid-name(设计如此:)
+        self.get_tables_patcher.stop()
+        self.label_patcher.stop()
+        cache.delete(self.manager.get_table_fingerprint_cache_key())
+        MetricListCache.objects.all().delete()
+
+    def get_cached_metrics(self):
+        return sorted(MetricListCache.objects.filter(bk_biz_id=2).values_list("related_id", "metric_field"))
+
+    def test_refresh(self):
+        self.manager.run()
+        self.assertEqual(self.get_cached_metrics(), [("1", "a"), ("1", "b"), ("2", "c")])
+
+        # 源数据未变化的分组跳过指标生成，已有指标缓存保留
+        with mock.patch.object(
+            CustomMetricCacheManager, "get_metrics_by_table", wraps=self.manager.get_metrics_by_table
+        ) as get_metrics_by_table:
+            self.manager.run()
+            get_metrics_by_table.assert_not_called()
+        self.assertEqual(self.get_cached_metrics(), [("1", "a"), ("1", "b"), ("2", "c")])
+
+        # 源数据变化的分组重新生成，删除不存在的指标
+        self.tables[0] = make_ts_group(1, ["a", "d"], last_modify_time="2025-01-02 00:00:00")
+        with mock.patch.object(
+            CustomMetricCacheManager, "get_metrics_by_table", wraps=self.manager.get_metrics_by_table
+        ) as get_metrics_by_table:
+            self.manager.run()
+            self.assertEqual(get_metrics_by_table.call_count, 1)
+        self.assertEqual(self.get_cached_metrics(), [("1", "a"), ("1", "d"), ("2", "c")])
+
+        # 分组被删除时，其指标缓存一并清理
+        self.tables.pop(1)
+        self.manager.run()
+        self.assertEqual(self.get_cached_metrics(), [("1", "a"), ("1", "d")])
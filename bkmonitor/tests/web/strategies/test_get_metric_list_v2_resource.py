@@ -8,8 +8,12 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
-from bkmonitor.models.metric_list_cache import MetricListCache
+import pytest
 from django.db.models.query import QuerySet
+
+from bkmonitor.models.metric_list_cache import MetricListCache, MetricListCacheSearchToken
+from constants.data_source import DataSourceLabel, DataTypeLabel
+from monitor_web.strategies.metric_list_cache import BaseMetricCacheManager
 from monitor_web.strategies.resources.v2 import GetMetricListV2Resource
 
 
@@ -64,3 +68,121 @@ class TestGetMetricListV2Resource:
         metrics = GetMetricListV2Resource.data_source_filter(MetricListCache.objects.all(), params)
 
         assert metrics.query.order_by == ("-use_frequency", "id")
+
+    def test_search_token(self):
+        assert MetricListCacheSearchToken.get_tokens("CPU_cpu") == ["cpu", "pu_", "u_c", "_cp"]
+        assert MetricListCacheSearchToken.get_tokens("cp") == []
+
+        metric = MetricListCache(data_label="system", metric_field="usage")
+        assert MetricListCacheSearchToken.get_metric_tokens(metric) == {"sys", "yst", "ste", "tem", "usa", "sag", "age"}
+
+    def test_filter_by_conditions_uses_search_index(self, settings):
+        settings.METRIC_SEARCH_INDEX_ENABLED = True
+        params = {"conditions": [{"key": "query", "value": "custom:group:cpu_usage"}]}
+
+        metrics = GetMetricListV2Resource.filter_by_conditions(MetricListCache.objects.all(), params)
+        assert MetricListCacheSearchToken._meta.db_table in str(metrics.query)
+
+        # 查询串过短无法使用索引时，回退为全表匹配
+        params = {"conditions": [{"key": "query", "value": "cp"}]}
+        metrics = GetMetricListV2Resource.filter_by_conditions(MetricListCache.objects.all(), params)
+        assert MetricListCacheSearchToken._meta.db_table not in str(metrics.query)
+
+        settings.METRIC_SEARCH_INDEX_ENABLED = False
+        params = {"conditions": [{"key": "query", "value": "cpu_usage"}]}
+        metrics = GetMetricListV2Resource.filter_by_conditions(MetricListCache.objects.all(), params)
+        assert MetricListCacheSearchToken._meta.db_table not in str(metrics.query)
+
+
+def build_metric(metric_field, result_table_id="system.cpu", data_label="", bk_biz_id=2):
+    return MetricListCache(
+        bk_tenant_id="system",
+        bk_biz_id=bk_biz_id,
+        result_table_id=result_table_id,
+        metric_field=metric_field,
+        metric_field_name=metric_field,
+        data_label=data_label,
+        collect_config_ids=[],
+        result_table_label="os",
+        data_source_label=DataSourceLabel.BK_MONITOR_COLLECTOR,
+        data_type_label=DataTypeLabel.TIME_SERIES,
+        data_target="host_target",
+        default_dimensions=[],
+        default_condition=[],
+    )
+
+
+def get_indexed_tokens(metric_id):
+    return set(MetricListCacheSearchToken.objects.filter(metric_id=metric_id).values_list("token", flat=True))
+
+
+@pytest.mark.django_db
+class TestMetricSearchIndex:
+    @pytest.fixture(autouse=True)
+    def enable_search_index(self, settings):
+        settings.METRIC_SEARCH_INDEX_ENABLED = True
+        yield
+        MetricListCache.objects.all().delete()
+        MetricListCacheSearchToken.objects.all().delete()
+
+    @staticmethod
+    def get_candidate_fields(search_texts):
+        candidates = GetMetricListV2Resource.get_search_candidates(search_texts)
+        return set(MetricListCache.objects.filter(candidates).values_list("metric_field", flat=True))
+
+    def test_get_search_candidates(self):
+        for metric_field in ["cpu_usage", "mem_usage", "disk_io", "sys_cpu_sys"]:
+            build_metric(metric_field).save()
+
+        assert self.get_candidate_fields(["usage"]) == {"cpu_usage", "mem_usage"}
+        assert self.get_candidate_fields(["cpu_usage"]) == {"cpu_usage"}
+        assert self.get_candidate_fields(["usage", "disk"]) == {"cpu_usage", "mem_usage", "disk_io"}
+        assert self.get_candidate_fields(["net_in"]) == set()
+        # 任一文本无法使用索引时不过滤
+        assert GetMetricListV2Resource.get_search_candidates(["usage", "io"]) is None
+
+        # 三元组全部命中但不包含查询串的指标会作为候选，由后续的精确匹配排除
+        assert self.get_candidate_fields(["cpu_sys_cpu"]) == {"sys_cpu_sys"}
+        params = {"conditions": [{"key": "query", "value": "cpu_sys_cpu"}]}
+        metrics = GetMetricListV2Resource.filter_by_conditions(MetricListCache.objects.all(), params)
+        assert not metrics.exists()
+
+        params = {"conditions": [{"key": "query", "value": "usage"}]}
+        metrics = GetMetricListV2Resource.filter_by_conditions(MetricListCache.objects.all(), params)
+        assert set(metrics.values_list("metric_field", flat=True)) == {"cpu_usage", "mem_usage"}
+
+    def test_save_refreshes_search_index(self, settings):
+        metric = build_metric("cpu_usage")
+        metric.save()
+        assert get_indexed_tokens(metric.pk) == MetricListCacheSearchToken.get_metric_tokens(metric)
+
+        # 变更后旧的三元组被移除
+        metric.metric_field = metric.metric_field_name = "load1"
+        metric.save()
+        assert get_indexed_tokens(metric.pk) == MetricListCacheSearchToken.get_metric_tokens(metric)
+        assert "usa" not in get_indexed_tokens(metric.pk)
+
+        settings.METRIC_SEARCH_INDEX_ENABLED = False
+        metric.metric_field = metric.metric_field_name = "cpu_usage"
+        metric.save()
+        assert "usa" not in get_indexed_tokens(metric.pk)
+
+    def test_refresh_search_index_backfills_pk(self):
+        updated = build_metric("cpu_usage")
+        updated.save()
+        updated.metric_field = updated.metric_field_name = "cpu_load"
+
+        created = [build_metric("mem_usage"), build_metric("mem_usage", bk_biz_id=3), build_metric("disk_io")]
+        # 模拟 MySQL 批量创建后未回填主键
+        MetricListCache.objects.bulk_create(
+            [build_metric(metric.metric_field, bk_biz_id=metric.bk_biz_id) for metric in created]
+        )
+        assert all(metric.pk is None for metric in created)
+
+        BaseMetricCacheManager(bk_tenant_id="system").refresh_search_index(created, [updated])
+
+        assert get_indexed_tokens(updated.pk) == MetricListCacheSearchToken.get_metric_tokens(updated)
+        for metric in created:
+            saved = MetricListCache.objects.get(bk_biz_id=metric.bk_biz_id, metric_field=metric.metric_field)
+            assert metric.pk == saved.pk
+            assert get_indexed_tokens(saved.pk) == MetricListCacheSearchToken.get_metric_tokens(metric)